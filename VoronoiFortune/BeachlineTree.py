@@ -1,4 +1,4 @@
-# TODO: Convert this to be usable for fortune's algorithm
+import math
 
 class Node:
     def __init__(self, is_leaf = False):
@@ -10,11 +10,13 @@ class Node:
 
         # for leaf (arc) nodes
         self.site = None # site = (x, y)
-        self.circle_event = None
+        self.event = None # Heap entry of the pending circle event of this arc
+        self.prev = None # Leaf of the arc to the left on the beachline
+        self.next = None # Leaf of the arc to the right on the beachline
 
         # for internal (breakpoint) nodes
         self.sites = None # (site, site)
-        self.edge = None # Pointer to the half-edge in the DCEL (not yet implemented)
+        self.edge = None # Id of the half-edge traced by this breakpoint, its face is sites[1]
 
     def __repr__(self):
         if self.is_leaf:
@@ -22,7 +24,38 @@ class Node:
         else:
             return f"BreakpointNode({self.sites})"
 
+def breakpoint_x(p, q, l):
+    """
+    x-coordinate of the breakpoint between the arc of p (on the left) and the
+    arc of q (on the right) when the sweep line is at y = l.
+    """
+    px, py = p
+    qx, qy = q
+    if py == qy:
+        return (px + qx) / 2.0
+    if py == l:
+        return px
+    if qy == l:
+        return qx
+    dp = 2.0 * (py - l)
+    dq = 2.0 * (qy - l)
+    a = 1.0 / dp - 1.0 / dq
+    b = -2.0 * (px / dp - qx / dq)
+    c = (px * px + py * py - l * l) / dp - (qx * qx + qy * qy - l * l) / dq
+    disc = math.sqrt(max(b * b - 4.0 * a * c, 0.0))
+    x1 = (-b - disc) / (2.0 * a)
+    x2 = (-b + disc) / (2.0 * a)
+    if x1 > x2:
+        x1, x2 = x2, x1
+    # The wider parabola (higher focus) is lower outside [x1, x2]
+    return x1 if py > qy else x2
+
 class BeachlineTree:
+    """
+    AVL tree over the beachline. Leaves are arcs in left-to-right order and
+    internal nodes are the breakpoints between neighbouring arcs, so every
+    internal node has exactly two children and rotations keep the order.
+    """
     def __init__(self):
         self.root = None
 
@@ -52,9 +85,9 @@ class BeachlineTree:
 
         Structure created:
                (p,q)
-              /     \
+              /     \\
             a0     (q,p)
-                   /    \
+                   /    \\
                   a1    a2
 
         Where:
@@ -87,35 +120,112 @@ class BeachlineTree:
         a1.parent = right_breakpoint
         a2.parent = right_breakpoint
 
+        right_breakpoint.height = 2
+        left_breakpoint.height = 3
+
+        # Keep the leaves linked in beachline order
+        a0.prev = arc_above.prev
+        a0.next = a1
+        a1.prev = a0
+        a1.next = a2
+        a2.prev = a1
+        a2.next = arc_above.next
+        if arc_above.prev is not None:
+            arc_above.prev.next = a0
+        if arc_above.next is not None:
+            arc_above.next.prev = a2
+
         # Replace the old arc in the tree
-        if arc_above.parent is None:
-            # If splitting the root
-            self.root = left_breakpoint
-            left_breakpoint.parent = None
-        else:
-            # If splitting a non-root arc
-            left_breakpoint.parent = arc_above.parent
-            if arc_above.parent.left == arc_above:
-                arc_above.parent.left = left_breakpoint
-            else:
-                arc_above.parent.right = left_breakpoint
+        self.replace(arc_above, left_breakpoint)
 
-        # Transfer any circle event from the old arc
-        # Important: The circle event should be invalidated as the arc is being split
-        if arc_above.circle_event:
-            a0.circle_event = None  # Circle event is no longer valid
-            a2.circle_event = None  # Circle event is no longer valid
+        # The copies start without a circle event, the caller cancels the one
+        # of the old arc.
+        self.rebalance(left_breakpoint.parent)
 
         return a1  # Return the middle arc for potential circle event checking
 
-    # TEST FAILED
+    def append_arc(self, arc, site):
+        """
+        Add an arc for site to the right of arc without splitting it. Used
+        while every site seen so far lies on the sweep line.
+        Returns (new arc, breakpoint node).
+        """
+        new_arc = self.create_arc_node(site)
+        breakpoint = Node(is_leaf=False)
+        breakpoint.sites = (arc.site, site)
+        breakpoint.height = 2
+
+        new_arc.prev = arc
+        new_arc.next = arc.next
+        if arc.next is not None:
+            arc.next.prev = new_arc
+        arc.next = new_arc
+
+        self.replace(arc, breakpoint)
+        breakpoint.left = arc
+        breakpoint.right = new_arc
+        arc.parent = breakpoint
+        new_arc.parent = breakpoint
+        self.rebalance(breakpoint.parent)
+        return new_arc, breakpoint
+
+    def remove_arc(self, arc):
+        """
+        Remove a vanishing arc. Its parent breakpoint disappears and the other
+        breakpoint that referenced the arc now separates arc.prev and arc.next.
+        Returns that merged breakpoint node.
+        """
+        left_bp = self.predecessor_breakpoint(arc)
+        right_bp = self.successor_breakpoint(arc)
+        parent = arc.parent
+        other = left_bp if parent is right_bp else right_bp
+
+        sibling = parent.left if parent.right is arc else parent.right
+        self.replace(parent, sibling)
+        other.sites = (arc.prev.site, arc.next.site)
+
+        arc.prev.next = arc.next
+        arc.next.prev = arc.prev
+        arc.parent = None
+
+        self.rebalance(sibling.parent)
+        return other
+
+    def predecessor_breakpoint(self, arc):
+        """Breakpoint between arc.prev and arc: lowest ancestor with arc on its right."""
+        node = arc
+        while node.parent is not None and node.parent.left is node:
+            node = node.parent
+        return node.parent
+
+    def successor_breakpoint(self, arc):
+        """Breakpoint between arc and arc.next: lowest ancestor with arc on its left."""
+        node = arc
+        while node.parent is not None and node.parent.right is node:
+            node = node.parent
+        return node.parent
+
+    def replace(self, old, new):
+        parent = old.parent
+        new.parent = parent
+        if parent is None:
+            self.root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+
     def find_arc_above(self, site) -> Node:
+        """Arc directly above site, with the sweep line at the site's y."""
+        l = site[1]
         current = self.root
         while not current.is_leaf:
-            current = current.left if site[0] < current.sites[0][0] else current.right
+            if site[0] < breakpoint_x(current.sites[0], current.sites[1], l):
+                current = current.left
+            else:
+                current = current.right
         return current
 
-    # TEST FAILED
     # Modified from:
     # GitHub: https://github.com/akaalharbi/voronoi-fortune/blob/main/python/fortune.py
     def vertical_intersection(self, parabola:Node, point):
@@ -127,4 +237,62 @@ class BeachlineTree:
         INPUT: pi = [xi, yi] """
         px, py = parabola.site  # unpack them
         x0, y0 = point
-        return ( (x0**2 - px**2)**2 + py**2 - y0**2) / (2*(py - y0))
\ No newline at end of file
+        return ((x0 - px)**2 + py**2 - y0**2) / (2*(py - y0))
+
+    # AVL balancing, leaves have height 1
+    def height(self, node):
+        return node.height if node is not None else 0
+
+    def update_height(self, node):
+        node.height = 1 + max(self.height(node.left), self.height(node.right))
+
+    def balance(self, node):
+        return self.height(node.left) - self.height(node.right)
+
+    def rotate_left(self, z):
+        y = z.right
+        self.replace(z, y)
+        z.right = y.left
+        z.right.parent = z
+        y.left = z
+        z.parent = y
+        self.update_height(z)
+        self.update_height(y)
+        return y
+
+    def rotate_right(self, z):
+        y = z.left
+        self.replace(z, y)
+        z.left = y.right
+        z.left.parent = z
+        y.right = z
+        z.parent = y
+        self.update_height(z)
+        self.update_height(y)
+        return y
+
+    def rebalance(self, node):
+        """Restore the AVL invariant from node up to the root."""
+        while node is not None:
+            self.update_height(node)
+            b = self.balance(node)
+            if b > 1:
+                if self.balance(node.left) < 0:
+                    self.rotate_left(node.left)
+                node = self.rotate_right(node)
+            elif b < -1:
+                if self.balance(node.right) > 0:
+                    self.rotate_right(node.right)
+                node = self.rotate_left(node)
+            node = node.parent
+
+    def leaves(self):
+        """Arcs from left to right."""
+        node = self.root
+        if node is None:
+            return
+        while not node.is_leaf:
+            node = node.left
+        while node is not None:
+            yield node
+            node = node.next
@@ -1,26 +1,392 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NONE = -1 # missing link
+DEAD = -2 # freed slot, kept in half_origin and vertex_edge
+
 class DCEL:
+    """
+    Doubly connected edge list stored in flat growable arrays (int32 links,
+    float64 coordinates), shared by the Fortune and the incremental engines.
+    Vertices, half-edges and faces are ids into the arrays; the engines work
+    on the ids directly, everything else can use the Vertex, HalfEdge and
+    Face views, which read and write the arrays through attributes.
+
+    Freed slots are reused by the next allocation; compact() renumbers the
+    live elements so the arrays hold no holes.
+    """
     def __init__(self):
-        self.vertices = []
-        self.halfedges = []
-        self.faces = []
-
-class HalfEdge:
-    def __init__(self, prev, next, twin, origin, face):
-        self.prev = prev # previous half of the same cell, HalfEdge
-        self.next = next # next half of the same cell, HalfEdge
-        self.twin = twin # opposite half of the same edge (different voronoi cell), HalfEdge
-        self.origin = origin # the vertex at the start of the half-edge, Vertex
-        self.face = face # the face the half-edge bounds, Face (voronoi cell)
-
-class Vertex:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.half_edges = None # half-edges that start at this vertex
-
-    def __set_half_edges(self, half_edges: HalfEdge):
-        self.half_edges = half_edges
-
-class Face:
-    def __init__(self, half_edge):
-        self.half_edge = half_edge # one of the half-edges bordering the face (voronoi cell)
\ No newline at end of file
+        self.box = None # (x_min, y_min, x_max, y_max) of the bounding box
+        self.clear()
+
+    def clear(self):
+        """Remove every element, the bounding box stays."""
+        # per half-edge
+        self.half_origin = array('i')
+        self.half_twin = array('i')
+        self.half_next = array('i')
+        self.half_prev = array('i')
+        self.half_face = array('i')
+        # per vertex
+        self.vertex_x = array('d')
+        self.vertex_y = array('d')
+        self.vertex_edge = array('i') # one half-edge that starts at the vertex
+        self.vertex_site = array('i') # face of one of the nearest sites
+        # per face
+        self.face_edge = array('i')
+        self.face_x = array('d') # site, nan for a face without one
+        self.face_y = array('d')
+        self.face_index = array('i') # id of the site in the input points
+        self.free_halves = []
+        self.free_vertices = []
+
+    # Allocation by id
+
+    def new_vertex(self, x, y):
+        if self.free_vertices:
+            v = self.free_vertices.pop()
+            self.vertex_x[v] = x
+            self.vertex_y[v] = y
+            self.vertex_edge[v] = NONE
+            self.vertex_site[v] = NONE
+            return v
+        self.vertex_x.append(x)
+        self.vertex_y.append(y)
+        self.vertex_edge.append(NONE)
+        self.vertex_site.append(NONE)
+        return len(self.vertex_x) - 1
+
+    def new_half_edge(self, origin=NONE, face=NONE):
+        if self.free_halves:
+            h = self.free_halves.pop()
+            self.half_origin[h] = origin
+            self.half_twin[h] = NONE
+            self.half_next[h] = NONE
+            self.half_prev[h] = NONE
+            self.half_face[h] = face
+            return h
+        self.half_origin.append(origin)
+        self.half_twin.append(NONE)
+        self.half_next.append(NONE)
+        self.half_prev.append(NONE)
+        self.half_face.append(face)
+        return len(self.half_origin) - 1
+
+    def new_edge(self, left_face, right_face):
+        """
+        Create a pair of twin half-edges between two faces and return the one
+        bounding left_face. Origins are filled in as the vertices are found.
+        """
+        h = self.new_half_edge(NONE, left_face)
+        t = self.new_half_edge(NONE, right_face)
+        self.half_twin[h] = t
+        self.half_twin[t] = h
+        if self.face_edge[left_face] == NONE:
+            self.face_edge[left_face] = h
+        if self.face_edge[right_face] == NONE:
+            self.face_edge[right_face] = t
+        return h
+
+    def new_face(self, site=None, index=NONE):
+        self.face_edge.append(NONE)
+        self.face_x.append(site[0] if site is not None else float("nan"))
+        self.face_y.append(site[1] if site is not None else float("nan"))
+        self.face_index.append(index)
+        return len(self.face_edge) - 1
+
+    def new_faces(self, xs, ys):
+        """
+        Faces for the sites (xs[i], ys[i]) with index i, all at once; xs and
+        ys are sequences of floats or numpy arrays. Returns the id of the
+        first one.
+        """
+        first = len(self.face_edge)
+        n = len(xs)
+        if np is not None and isinstance(xs, np.ndarray):
+            self.face_x.frombytes(np.ascontiguousarray(xs, dtype=np.float64).tobytes())
+            self.face_y.frombytes(np.ascontiguousarray(ys, dtype=np.float64).tobytes())
+            self.face_index.frombytes(np.arange(n, dtype=np.int32).tobytes())
+        else:
+            self.face_x.extend(xs)
+            self.face_y.extend(ys)
+            self.face_index.extend(range(n))
+        self.face_edge.extend(array('i', [NONE]) * n)
+        return first
+
+    def free_vertex(self, v):
+        self.vertex_edge[v] = DEAD
+        self.free_vertices.append(v)
+
+    def free_half_edge(self, h):
+        self.half_origin[h] = DEAD
+        self.free_halves.append(h)
+
+    def link(self, h, n):
+        self.half_next[h] = n
+        self.half_prev[n] = h
+
+    def site(self, f):
+        x = self.face_x[f]
+        return None if x != x else (x, self.face_y[f])
+
+    # Traversals
+
+    def face_boundary(self, f):
+        """Half-edges around face f, counter-clockwise."""
+        start = self.face_edge[f]
+        if start == NONE:
+            return
+        nxt = self.half_next
+        h = start
+        while True:
+            yield h
+            h = nxt[h]
+            if h == start or h == NONE:
+                break
+
+    def vertex_star(self, v):
+        """Half-edges that start at vertex v, rotating around it."""
+        start = self.vertex_edge[v]
+        if start < 0:
+            return
+        twin = self.half_twin
+        nxt = self.half_next
+        prev = self.half_prev
+        h = start
+        while True:
+            yield h
+            t = twin[h]
+            if t == NONE or nxt[t] == NONE:
+                break
+            h = nxt[t]
+            if h == start:
+                return
+        # Hit the boundary, the rest of the star lies the other way round
+        h = start
+        while prev[h] != NONE and twin[prev[h]] != NONE:
+            h = twin[prev[h]]
+            if h == start:
+                return
+            yield h
+
+    def edge_ids(self):
+        """One half-edge id per edge."""
+        origin = self.half_origin
+        twin = self.half_twin
+        return [h for h in range(len(origin)) if origin[h] != DEAD and (twin[h] == NONE or h < twin[h])]
+
+    def segments(self):
+        """
+        End points of every edge as four sequences x0, y0, x1, y1, vectorized
+        when numpy is available. An edge ends at the origin of its twin, or of
+        the next half-edge for edges without one. Edges with an end not known
+        yet (an unset origin, or no twin and no next) are left out.
+        """
+        ids = self.edge_ids()
+        if np is not None:
+            ids = np.asarray(ids, dtype=np.int64)
+            origin = np.frombuffer(self.half_origin, dtype=np.int32)
+            twin = np.frombuffer(self.half_twin, dtype=np.int32)
+            nxt = np.frombuffer(self.half_next, dtype=np.int32)
+            vx = np.frombuffer(self.vertex_x, dtype=np.float64)
+            vy = np.frombuffer(self.vertex_y, dtype=np.float64)
+            other = np.where(twin[ids] != NONE, twin[ids], nxt[ids])
+            start = origin[ids]
+            end = np.where(other != NONE, origin[other], NONE)
+            known = (start >= 0) & (end >= 0)
+            start = start[known]
+            end = end[known]
+            return vx[start], vy[start], vx[end], vy[end]
+        origin = self.half_origin
+        twin = self.half_twin
+        nxt = self.half_next
+        x0 = []
+        y0 = []
+        x1 = []
+        y1 = []
+        for h in ids:
+            a = origin[h]
+            other = twin[h] if twin[h] != NONE else nxt[h]
+            b = origin[other] if other != NONE else NONE
+            if a < 0 or b < 0:
+                continue
+            x0.append(self.vertex_x[a])
+            y0.append(self.vertex_y[a])
+            x1.append(self.vertex_x[b])
+            y1.append(self.vertex_y[b])
+        return x0, y0, x1, y1
+
+    def compact(self):
+        """Drop freed slots and renumber the live vertices and half-edges."""
+        if not self.free_halves and not self.free_vertices:
+            return
+        halves = [h for h in range(len(self.half_origin)) if self.half_origin[h] != DEAD]
+        vertices = [v for v in range(len(self.vertex_x)) if self.vertex_edge[v] != DEAD]
+        hmap = remap_table(halves, len(self.half_origin))
+        vmap = remap_table(vertices, len(self.vertex_x))
+        self.half_origin = take(self.half_origin, halves, vmap)
+        self.half_twin = take(self.half_twin, halves, hmap)
+        self.half_next = take(self.half_next, halves, hmap)
+        self.half_prev = take(self.half_prev, halves, hmap)
+        self.half_face = take(self.half_face, halves)
+        self.vertex_x = take(self.vertex_x, vertices)
+        self.vertex_y = take(self.vertex_y, vertices)
+        self.vertex_edge = take(self.vertex_edge, vertices, hmap)
+        self.vertex_site = take(self.vertex_site, vertices)
+        self.face_edge = take(self.face_edge, range(len(self.face_edge)), hmap)
+        self.free_halves = []
+        self.free_vertices = []
+
+    # Views
+
+    @property
+    def vertices(self):
+        return Elements(self, Vertex, self.vertex_edge)
+
+    @property
+    def halfedges(self):
+        return Elements(self, HalfEdge, self.half_origin)
+
+    half_edges = halfedges
+
+    @property
+    def faces(self):
+        return Elements(self, Face, None)
+
+    def add_vertex(self, x, y):
+        return Vertex(self, self.new_vertex(x, y))
+
+    def add_edge(self, left_face, right_face):
+        return HalfEdge(self, self.new_edge(left_face.id, right_face.id))
+
+    def add_face(self, site=None, index=NONE):
+        return Face(self, self.new_face(site, index))
+
+    def edges(self):
+        """One half-edge per edge."""
+        return [HalfEdge(self, h) for h in self.edge_ids()]
+
+def remap_table(ids, n):
+    table = array('i', [NONE]) * n
+    for new, old in enumerate(ids):
+        table[old] = new
+    return table
+
+def take(buf, ids, table=None):
+    # buf[ids] as a new array, ids mapped through table (negative ids kept)
+    if np is not None and len(buf) > 0:
+        values = np.frombuffer(buf, dtype=np.float64 if buf.typecode == 'd' else np.int32)
+        values = values[np.asarray(ids, dtype=np.int64)]
+        if table is not None:
+            mapping = np.frombuffer(table, dtype=np.int32)
+            values = np.where(values >= 0, mapping[np.maximum(values, 0)], values).astype(np.int32)
+        out = array(buf.typecode)
+        out.frombytes(values.tobytes())
+        return out
+    if table is None:
+        return array(buf.typecode, [buf[i] for i in ids])
+    return array(buf.typecode, [table[buf[i]] if buf[i] >= 0 else buf[i] for i in ids])
+
+class Elements:
+    """Live vertices, half-edges or faces of a DCEL as views."""
+    def __init__(self, dcel, cls, marks):
+        self.dcel = dcel
+        self.cls = cls
+        self.marks = marks # DEAD marks freed slots, None when nothing is freed
+
+    def __len__(self):
+        if self.marks is None:
+            return len(self.dcel.face_edge)
+        free = self.dcel.free_vertices if self.cls is Vertex else self.dcel.free_halves
+        return len(self.marks) - len(free)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.size()))]
+        if i < 0:
+            i += self.size()
+        if not 0 <= i < self.size():
+            raise IndexError(i)
+        return self.cls(self.dcel, i)
+
+    def __iter__(self):
+        marks = self.marks
+        for i in range(self.size()):
+            if marks is None or marks[i] != DEAD:
+                yield self.cls(self.dcel, i)
+
+    def size(self):
+        return len(self.dcel.face_edge) if self.marks is None else len(self.marks)
+
+class View:
+    __slots__ = ("dcel", "id")
+
+    def __init__(self, dcel, id):
+        self.dcel = dcel
+        self.id = id
+
+    def __eq__(self, other):
+        return type(other) is type(self) and other.id == self.id and other.dcel is self.dcel
+
+    def __hash__(self):
+        return hash((type(self), self.id))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.id})"
+
+def link_property(name, cls):
+    # attribute that reads and writes an id array as views, None for NONE
+    def get(self):
+        i = getattr(self.dcel, name)[self.id]
+        return None if i < 0 else cls()(self.dcel, i)
+    def set(self, value):
+        getattr(self.dcel, name)[self.id] = NONE if value is None else value.id
+    return property(get, set)
+
+def value_property(name):
+    def get(self):
+        return getattr(self.dcel, name)[self.id]
+    def set(self, value):
+        getattr(self.dcel, name)[self.id] = value
+    return property(get, set)
+
+class HalfEdge(View):
+    __slots__ = ()
+    prev = link_property("half_prev", lambda: HalfEdge) # previous half of the same cell
+    next = link_property("half_next", lambda: HalfEdge) # next half of the same cell
+    twin = link_property("half_twin", lambda: HalfEdge) # opposite half of the same edge (different voronoi cell)
+    origin = link_property("half_origin", lambda: Vertex) # the vertex at the start of the half-edge
+    face = link_property("half_face", lambda: Face) # the face the half-edge bounds (voronoi cell)
+    incident_face = face
+
+class Vertex(View):
+    __slots__ = ()
+    x = value_property("vertex_x")
+    y = value_property("vertex_y")
+    half_edges = link_property("vertex_edge", lambda: HalfEdge) # a half-edge that starts at this vertex
+
+    @property
+    def site(self):
+        f = self.dcel.vertex_site[self.id]
+        return None if f < 0 else self.dcel.site(f)
+
+    def star(self):
+        return [HalfEdge(self.dcel, h) for h in self.dcel.vertex_star(self.id)]
+
+class Face(View):
+    __slots__ = ()
+    half_edge = link_property("face_edge", lambda: HalfEdge) # one of the half-edges bordering the face (voronoi cell)
+    outer_component = half_edge
+    index = value_property("face_index") # id of the site in the input points
+
+    @property
+    def site(self):
+        """The site (x, y) of the voronoi cell."""
+        return self.dcel.site(self.id)
+
+    def boundary(self):
+        return [HalfEdge(self.dcel, h) for h in self.dcel.face_boundary(self.id)]
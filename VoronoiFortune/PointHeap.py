@@ -1,13 +1,76 @@
 import heapq
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SITE = 0
+CIRCLE = 1
+
 class PointHeap:
+    """
+    Event queue of the sweep. Sites never arrive after the start, so they are
+    sorted once by (-y, x) and consumed with a cursor; only circle events go
+    through a heap.
+
+    pop() returns (key, seq, kind, payload) events, key being -y:
+    - site events: payload is the site (x, y), seq its rank in sweep order
+    - circle events: payload as given to push(), seq a running counter
+    On equal keys sites come before circle events.
+
+    push() returns the entry of the circle event, a [key, seq, kind, payload]
+    list; cancel(entry) clears its payload in place and pop() skips it. Once
+    cancelled entries outnumber live ones the heap is rebuilt without them,
+    so it stays within twice the number of live circle events (at most one
+    per arc of the beachline).
+    """
     def __init__(self, points):
-        self.points = [(y,x) for x,y in points]
-        heapq.heapify(self.points)
+        if np is not None and len(points) > 0:
+            arr = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+            order = np.lexsort((arr[:, 0], -arr[:, 1]))
+            self.xs = arr[order, 0].tolist()
+            self.ys = arr[order, 1].tolist()
+        else:
+            xs = [p[0] for p in points]
+            ys = [p[1] for p in points]
+            order = sorted(range(len(xs)), key=xs.__getitem__)
+            order.sort(key=ys.__getitem__, reverse=True)
+            self.xs = [xs[i] for i in order]
+            self.ys = [ys[i] for i in order]
+        self.cursor = 0
+        self.circles = []
+        self.cancelled = 0 # entries in circles with payload None
+        self.seq = len(self.xs)
+
+    def __len__(self):
+        return len(self.xs) - self.cursor + len(self.circles) - self.cancelled
 
     def pop(self):
-        popped = heapq.heappop(self.points)
-        return (popped[1], popped[0])
+        circles = self.circles
+        if self.cancelled:
+            while circles and circles[0][3] is None:
+                heapq.heappop(circles)
+                self.cancelled -= 1
+        i = self.cursor
+        if i < len(self.ys) and (not circles or -self.ys[i] <= circles[0][0]):
+            self.cursor = i + 1
+            y = self.ys[i]
+            return (-y, i, SITE, (self.xs[i], y))
+        return heapq.heappop(circles)
+
+    def push(self, key, payload):
+        # lists compare in C like tuples; seq is unique, so the comparison
+        # never reaches kind or payload
+        self.seq += 1
+        entry = [key, self.seq, CIRCLE, payload]
+        heapq.heappush(self.circles, entry)
+        return entry
 
-    def push(self, point):
-        heapq.heappush(self.points, (point[1], point[0]))
\ No newline at end of file
+    def cancel(self, entry):
+        entry[3] = None
+        self.cancelled += 1
+        if 2 * self.cancelled > len(self.circles):
+            self.circles = [e for e in self.circles if e[3] is not None]
+            heapq.heapify(self.circles)
+            self.cancelled = 0
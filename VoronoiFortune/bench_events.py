@@ -0,0 +1,57 @@
+"""
+Micro-benchmark for the event queue of VoronoiDiagram.
+
+Compares the per-event cost of (key, seq, kind, payload) tuples in one
+heap with PointHeap, which streams presorted sites and heaps only circle
+events. Run from the repository root:
+
+    python -m VoronoiFortune.bench_events [n]
+"""
+import heapq, random, sys, time
+
+from VoronoiFortune.voronoi import VoronoiDiagram, SITE, CIRCLE
+from VoronoiFortune.PointHeap import PointHeap
+
+def run_tuples(points, circles):
+    sites = sorted(points, key=lambda p: (-p[1], p[0]))
+    events = [(-p[1], seq, SITE, p) for seq, p in enumerate(sites)]
+    seq = len(events)
+    for c in circles:
+        seq += 1
+        heapq.heappush(events, (-c[1], seq, CIRCLE, c))
+    while events:
+        heapq.heappop(events)
+
+def run_stream(points, circles):
+    events = PointHeap(points)
+    for c in circles:
+        events.push(-c[1], c)
+    while events:
+        events.pop()
+
+def per_event(fn, points, circles, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(points, circles)
+        best = min(best, time.perf_counter() - start)
+    return best / (len(points) + len(circles)) * 1e9
+
+def main(n=100000):
+    random.seed(1)
+    points = [(random.uniform(0, 700), random.uniform(0, 600)) for _ in range(n)]
+    circles = [(random.uniform(0, 700), random.uniform(0, 600)) for _ in range(2 * n)]
+
+    print(f"heap only, {n} sites + {2 * n} circle events")
+    print(f"  tuples:         {per_event(run_tuples, points, circles):8.1f} ns/event")
+    print(f"  PointHeap:      {per_event(run_stream, points, circles):8.1f} ns/event")
+
+    start = time.perf_counter()
+    diagram = VoronoiDiagram(points)
+    diagram.compute_diagram()
+    elapsed = time.perf_counter() - start
+    events = n + sum(1 for e in diagram.D.vertex_edge if e >= 0)
+    print(f"compute_diagram: {elapsed:.2f} s, {events / elapsed:,.0f} events/s")
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -1,126 +1,208 @@
-import heapq
+import math
 from VoronoiFortune.BeachlineTree import BeachlineTree
+from VoronoiFortune.DCEL import DCEL, NONE
+from VoronoiFortune.PointHeap import PointHeap, SITE, CIRCLE
+
+# Events are (key, seq, kind, payload) sequences so heapq compares them in C:
+# tuples for sites, lists for circle events so they can be cancelled in place.
+# - key is -y, the sweep line moves down so the highest event comes first
+# - seq breaks ties: sites get their rank in (-y, x) order, so sites on one
+#   horizontal line come left to right, circle events a running counter
+# - payload is the site (x, y) for a site event and (arc, center) for a circle
+#   event. arc.event holds the heap entry of its pending circle event, which
+#   PointHeap.cancel clears in place; cancelled entries are never popped.
+# Sites come from a presorted array in PointHeap, only circle events are heaped.
 
-class Event:
-    def __init__(self, point, event_type):
-        self.point = point # Tuple (x, y)
-        self.event_type = event_type  # 0 for site event, 1 for circle event
-
-    # Invert comparison to ensure the correct order in the max heap
-    def __lt__(self, other):
-        return self.point[1] > other.point[1]
-
-    def __eq__(self, other):
-        return self.point == other.point
-
-    def __gt__(self, other):
-        return self.point[1] < other.point[1]
-
-    def __repr__(self):
-        type_str = 'site' if self.event_type == 0 else 'circle'
-        return f"Event({self.point}, {type_str})"
-
-'''
-Pseudocode for Fortune's algorithm
-
-VoronoiDiagram(P: set of points):
-Q = new PriorityQueue(P) # Site events
-T = new BalancedBST() # Sweep status
-D = new DCEL() # Voronoi diagram
-while Q is not empty:
-    event = Q.pop()
-    if event is a site event:
-        handle_site_event(event)
-    else:
-        a = arc on b that will disappear
-        handle_circle_event(event)
-treating the remaining internal nodes of T as unbounded edges_true of D (Vor(P))
-return D
-
-HandleSiteEvent(p: Point):
-    # Step 1: Check if T is empty
-    if T is empty:
-        # Create a new arc for the first site and insert into T
-        a1 = new arc for p
-        insert_into_T(a1, T)
-    else:
-        # Step 2: Search for the arc a directly above p in T
-        a = search_for_arc_above(p, T)
-
-        # Step 3: Remove existing circle event if it exists
-        if a has a circle event in Q:
-            remove it from Q
-
-        # Step 4: Split the arc a into three arcs
-        a0, a1, a2 = split(a)
-
-        # Step 5: Create new arc a1 for the site p
-        a1 = new arc for p
-
-        # Step 6: Update T
-        # Replace arc a with new arcs a0, a1, and a2 in T
-        replace_in_T(a, a0, a1, a2, T)
-
-    # Step 7: Add edges_true to the DCEL (D)
-    add_edge(q, p)  # edge from q to p
-    add_edge(p, q)  # edge from p to q (if needed)
-
-    # Step 8: Check for new circle events
-    check_for_circle_events(., a0, a1)  # check for circle event involving a0, a1
-    check_for_circle_events(a1, a2, .)  # check for circle event involving a1, a2
-'''
-'''
-- Edges
-- edges = [ [(p_k, p_l), [start, end] , boolean], ...]
--- (pj_k, p{j+1}_l) the two sites that are seperated by the edge.
--- end can be None untill it is discovered by a circle event.
--- boolean indicates it's a complete edge. This feature is for drawing.
-- edges_true = [(start, end), ...] we may add the sites that they seperate.
-'''
 class VoronoiDiagram:
+    """
+    Fortune's sweep over the sites, building the diagram in a DCEL.
+
+    - The sweep line moves down (decreasing y); arcs are ordered left to right.
+    - compute_diagram pops events from PointHeap until it is empty. A site
+      event splits the arc above the site, a circle event removes its arc and
+      adds a vertex; both then schedule the circle events of the neighbouring
+      arcs and cancel the ones that no longer hold.
+    - Every Voronoi edge is a pair of twin half-edges in the DCEL. A breakpoint
+      between arc p (left) and arc q (right) traces the half-edge whose face is
+      q, in the direction it moves, and its twin bounds p.
+    - When a breakpoint appears at a vertex its half-edge gets that origin,
+      when it disappears the twin gets it. Edges that never reach a vertex are
+      bounded by a box around the sites and vertices after the sweep.
+    """
     def __init__(self, points):
         self.points = points # List of site points
-        self.events = [Event(point, 0) for point in points]  if points else [] # Site events
-        heapq.heapify(self.events)
+        self.events = PointHeap(points) # Site events by cursor, circle events in a heap
         self.beachline = BeachlineTree()
-        self.edges = []
+        self.D = DCEL()
+        self.faces = {} # site -> face id in D
+        self.last_site = None
+        self.sweep = None # y of the sweep line
 
     def compute_diagram(self):
         while self.events:
-            event = heapq.heappop(self.events)
+            event = self.events.pop()
             self.handle_event(event)
-        # TODO: treat the remaining internal nodes of T as unbounded edges_true of D (Vor(P))
+        # breakpoints left on the beachline trace unbounded edges
+        self.bound_edges()
         return self.D
 
-    def handle_event(self, event: Event):
-        if event and event.event_type == 0:
-            self.handle_site_event(event)
-        elif event and event.event_type == 1:
-            self.handle_circle_event(event)
+    def handle_event(self, event):
+        key, _, kind, payload = event
+        if kind == SITE:
+            self.handle_site_event(payload)
+        else:
+            self.handle_circle_event(-key, payload)
 
-    def handle_site_event(self, event: Event):
-        # TODO: Implement the logic to handle site events
-        # Find the arc directly above the site event
-        arc_above = self.beachline.find_arc_above(event.point)
+    def handle_site_event(self, site):
+        if site == self.last_site:
+            return # duplicate site
+        self.last_site = site
+        self.sweep = site[1]
 
-        # Remove existing circle event if it exists
-        if arc_above.circle_event:
-            self.events.remove(arc_above.circle_event)
-            arc_above.circle_event = None
+        face = self.D.new_face(site)
+        self.faces[site] = face
 
-        # Split the arc above into three arcs (a0, a1, a2) a1 is the new arc for the site event, a0 and a2 are the left and right copies of the original arc
-        self.beachline.split_arc(arc_above, event.point)
+        if self.beachline.root is None:
+            self.beachline.insert(site)
+            return
 
-        # Find the y-coordinate where the vertical line from the site event intersects the beachline (arc above) (this if for adding the edges to the DCEL)
-        y_position = self.beachline.vertical_intersection(arc_above, event.point)
+        # Find the arc directly above the site event
+        arc_above = self.beachline.find_arc_above(site)
 
-        # TODO: Add the edges to the DCEL (event.point[0], y_position) and another edge if possible (when the new site intersects with a breakpoint)
+        if arc_above.site[1] == site[1]:
+            # Every site so far lies on the sweep line, the arcs sit side by side
+            _, breakpoint = self.beachline.append_arc(arc_above, site)
+            breakpoint.edge = self.D.new_edge(face, self.faces[arc_above.site])
+            return
 
-        # Check for new circle events
-        self.beachline.check_circle_events(arc_above, event.point[1]) # Check for circle events involving the arc above and the new arc at the site event's y-coordinate (current sweep line position)
+        # Cancel the circle event of the arc above, if any
+        self.cancel_circle_event(arc_above)
 
+        # Split the arc above into three arcs (a0, a1, a2) a1 is the new arc for the site event, a0 and a2 are the left and right copies of the original arc
+        a1 = self.beachline.split_arc(arc_above, site)
+        a0 = a1.prev
+        a2 = a1.next
 
+        # Both new breakpoints trace the same edge, in opposite directions
+        edge = self.D.new_edge(face, self.faces[arc_above.site])
+        self.beachline.predecessor_breakpoint(a1).edge = edge
+        self.beachline.successor_breakpoint(a1).edge = self.D.half_twin[edge]
 
-    def handle_circle_event(self, event):
-        # TODO: Implement the logic to handle circle events
-        pass
\ No newline at end of file
+        # Check for new circle events
+        self.check_circle_event(a0)
+        self.check_circle_event(a2)
+
+    def handle_circle_event(self, y, payload):
+        arc, center = payload
+        arc.event = None
+        self.sweep = y
+        left = arc.prev
+        right = arc.next
+
+        # Breakpoints (left, arc) and (arc, right) meet at the vertex
+        e1 = self.beachline.predecessor_breakpoint(arc).edge # face: arc
+        e2 = self.beachline.successor_breakpoint(arc).edge # face: right
+        merged = self.beachline.remove_arc(arc)
+
+        D = self.D
+        v = D.new_vertex(center[0], center[1])
+        e3 = D.new_edge(self.faces[right.site], self.faces[left.site])
+        merged.edge = e3
+        D.vertex_edge[v] = e3
+
+        twin = D.half_twin
+        origin = D.half_origin
+        origin[twin[e1]] = v
+        origin[twin[e2]] = v
+        origin[e3] = v
+        D.link(e1, twin[e2])
+        D.link(e2, e3)
+        D.link(twin[e3], twin[e1])
+
+        self.check_circle_event(left)
+        self.check_circle_event(right)
+
+    def check_circle_event(self, arc):
+        self.cancel_circle_event(arc)
+
+        a = arc.prev
+        c = arc.next
+        if a is None or c is None:
+            return
+        ax, ay = a.site
+        bx, by = arc.site
+        cx, cy = c.site
+
+        # The breakpoints only converge when a, b, c turn clockwise
+        if (bx - ax)*(cy - ay) - (cx - ax)*(by - ay) >= 0:
+            return
+
+        d = 2.0 * (ax*(by - cy) + bx*(cy - ay) + cx*(ay - by))
+        if d == 0:
+            return
+        ox = ((ax*ax + ay*ay)*(by - cy) + (bx*bx + by*by)*(cy - ay) + (cx*cx + cy*cy)*(ay - by)) / d
+        oy = ((ax*ax + ay*ay)*(cx - bx) + (bx*bx + by*by)*(ax - cx) + (cx*cx + cy*cy)*(bx - ax)) / d
+        r = math.hypot(ax - ox, ay - oy)
+
+        arc.event = self.events.push(r - oy, (arc, (ox, oy)))
+
+    def cancel_circle_event(self, arc):
+        # The pending circle event of the arc, if any
+        if arc.event is not None:
+            self.events.cancel(arc.event)
+            arc.event = None
+
+    def bounding_box(self):
+        D = self.D
+        xs = D.face_x + D.vertex_x
+        ys = D.face_y + D.vertex_y
+        x0 = min(xs)
+        x1 = max(xs)
+        y0 = min(ys)
+        y1 = max(ys)
+        dx = (x1 - x0 + 1) / 5.0
+        dy = (y1 - y0 + 1) / 5.0
+        return x0 - dx, y0 - dy, x1 + dx, y1 + dy
+
+    def bound_edges(self):
+        """Give every half-edge without an origin one on the bounding box."""
+        D = self.D
+        if len(D.face_edge) == 0:
+            return
+        box = self.bounding_box()
+        origin = D.half_origin
+        twin = D.half_twin
+        face = D.half_face
+        vx = D.vertex_x
+        vy = D.vertex_y
+        for h in D.edge_ids():
+            t = twin[h]
+            if origin[h] != NONE and origin[t] != NONE:
+                continue
+            # direction of h: its face is on the left
+            (qx, qy) = D.site(face[h])
+            (px, py) = D.site(face[t])
+            ux = qy - py
+            uy = -(qx - px)
+            if origin[h] == NONE and origin[t] == NONE:
+                mx = (px + qx) / 2.0
+                my = (py + qy) / 2.0
+                origin[h] = self.ray_to_box(box, mx, my, -ux, -uy)
+                origin[t] = self.ray_to_box(box, mx, my, ux, uy)
+            elif origin[h] == NONE:
+                origin[h] = self.ray_to_box(box, vx[origin[t]], vy[origin[t]], -ux, -uy)
+            else:
+                origin[t] = self.ray_to_box(box, vx[origin[h]], vy[origin[h]], ux, uy)
+
+    def ray_to_box(self, box, x, y, dx, dy):
+        x0, y0, x1, y1 = box
+        t = math.inf
+        if dx > 0: t = min(t, (x1 - x) / dx)
+        elif dx < 0: t = min(t, (x0 - x) / dx)
+        if dy > 0: t = min(t, (y1 - y) / dy)
+        elif dy < 0: t = min(t, (y0 - y) / dy)
+        return self.D.new_vertex(x + t*dx, y + t*dy)
+
+    def get_output(self):
+        x0, y0, x1, y1 = self.D.segments()
+        return [(round(a), round(b), round(c), round(d)) for a, b, c, d in zip(x0, y0, x1, y1)]
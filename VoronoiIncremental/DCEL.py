@@ -1,23 +1,20 @@
-class DCEL:
-    def __init__(self):
-        self.vertices = []
-        self.half_edges = []
-        self.faces = []
+import importlib.util, os, sys
 
-class Vertex:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-
-class HalfEdge:
-    def __init__(self, origin=None):
-        self.origin = origin
-        self.next = None
-        self.prev = None
-        self.twin = None
-        self.incident_face = None
-
-class Face:
-    def __init__(self, outer_component=None):
-        self.outer_component = outer_component
+__all__ = ["DCEL", "Vertex", "HalfEdge", "Face", "NONE", "DEAD"]
 
+# The array-backed DCEL is shared with VoronoiFortune, next to this directory.
+# From the repository root it is a plain import; run from inside
+# VoronoiIncremental (main, bench_order) the same file is loaded directly
+# under the name VoronoiFortune.DCEL, without changing sys.path.
+try:
+    from VoronoiFortune.DCEL import DCEL, Vertex, HalfEdge, Face, NONE, DEAD
+except ImportError:
+    NAME = "VoronoiFortune.DCEL"
+    if NAME not in sys.modules:
+        path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "VoronoiFortune", "DCEL.py")
+        spec = importlib.util.spec_from_file_location(NAME, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[NAME] = module
+        spec.loader.exec_module(module)
+    shared = sys.modules[NAME]
+    DCEL, Vertex, HalfEdge, Face, NONE, DEAD = shared.DCEL, shared.Vertex, shared.HalfEdge, shared.Face, shared.NONE, shared.DEAD
@@ -0,0 +1,177 @@
+# Bowyer-Watson Delaunay triangulation. Every new site removes the cavity of
+# triangles whose circumcircle contains it and fans the cavity boundary to the
+# site. The cavity is found by BFS over triangle adjacency from the triangle
+# that contains the site, so an insertion only touches the triangles it
+# changes.
+#
+# Triangles live in flat lists: triangle t has vertices tv[3t:3t+3] in CCW
+# order and tn[3t+k] is the neighbour across the edge opposite tv[3t+k]
+# (-1 outside the super-triangle). Removed triangles are reused.
+
+import random
+
+SUPER_SCALE = 1000.0
+
+def orient(ax, ay, bx, by, cx, cy):
+    return (bx - ax)*(cy - ay) - (by - ay)*(cx - ax)
+
+def in_circle(ax, ay, bx, by, cx, cy, px, py):
+    # > 0 when p is strictly inside the circumcircle of the CCW triangle abc
+    adx = ax - px
+    ady = ay - py
+    bdx = bx - px
+    bdy = by - py
+    cdx = cx - px
+    cdy = cy - py
+    ad = adx*adx + ady*ady
+    bd = bdx*bdx + bdy*bdy
+    cd = cdx*cdx + cdy*cdy
+    return adx*(bdy*cd - bd*cdy) - ady*(bdx*cd - bd*cdx) + ad*(bdx*cdy - bdy*cdx)
+
+class Triangulation:
+    def __init__(self, x0, y0, x1, y1):
+        # (x0, y0, x1, y1): area the sites fall in. Vertices 0, 1, 2 are the
+        # corners of a super-triangle far around it.
+        cx = (x0 + x1) / 2.0
+        cy = (y0 + y1) / 2.0
+        r = max(x1 - x0, y1 - y0, 1.0) * SUPER_SCALE
+        self.xs = [cx - 2*r, cx + 2*r, cx]
+        self.ys = [cy - r, cy - r, cy + 2*r]
+        self.ids = [-1, -1, -1] # id of every vertex in the input points
+        self.tv = [0, 1, 2]
+        self.tn = [-1, -1, -1]
+        self.alive = [True]
+        self.free = []
+        self.last = 0
+        self.walk = random.Random(0) # first edge tried by locate
+
+    def insert(self, x, y, index=-1):
+        # Returns the vertex of the site, an existing one for a duplicate
+        xs = self.xs
+        ys = self.ys
+        tv = self.tv
+        tn = self.tn
+        t = self.locate(x, y)
+        for k in range(3):
+            v = tv[3*t + k]
+            if xs[v] == x and ys[v] == y:
+                return v
+        p = len(xs)
+        xs.append(x)
+        ys.append(y)
+        self.ids.append(index)
+
+        # Cavity by BFS, boundary edges (a, b, triangle outside) in CCW order
+        # as seen from the cavity
+        cavity = [t]
+        self.alive[t] = False
+        boundary = []
+        i = 0
+        while i < len(cavity):
+            c = cavity[i]
+            i += 1
+            for k in range(3):
+                u = tn[3*c + k]
+                a = tv[3*c + (k + 1) % 3]
+                b = tv[3*c + (k + 2) % 3]
+                if u >= 0 and self.alive[u]:
+                    u0 = tv[3*u]
+                    u1 = tv[3*u + 1]
+                    u2 = tv[3*u + 2]
+                    if in_circle(xs[u0], ys[u0], xs[u1], ys[u1], xs[u2], ys[u2], x, y) > 0:
+                        self.alive[u] = False
+                        cavity.append(u)
+                        continue
+                    boundary.append((a, b, u))
+                elif u < 0:
+                    boundary.append((a, b, u))
+                # a dead neighbour is part of the cavity, the edge is interior
+        self.free.extend(cavity)
+
+        # Fan (a, b, p) for every boundary edge
+        starts = {}
+        ends = {}
+        created = []
+        for a, b, u in boundary:
+            n = self.new_triangle(a, b, p)
+            tn[3*n + 2] = u
+            if u >= 0:
+                for k in range(3):
+                    if tv[3*u + k] not in (a, b):
+                        tn[3*u + k] = n
+                        break
+            starts[a] = n
+            ends[b] = n
+            created.append((n, a, b))
+        for n, a, b in created:
+            tn[3*n] = starts[b] # across (b, p)
+            tn[3*n + 1] = ends[a] # across (p, a)
+        self.last = created[0][0]
+        return p
+
+    def new_triangle(self, a, b, c):
+        if self.free:
+            t = self.free.pop()
+            self.tv[3*t] = a
+            self.tv[3*t + 1] = b
+            self.tv[3*t + 2] = c
+            self.alive[t] = True
+        else:
+            t = len(self.alive)
+            self.tv.extend((a, b, c))
+            self.tn.extend((-1, -1, -1))
+            self.alive.append(True)
+        return t
+
+    def locate(self, x, y):
+        # Remembering stochastic walk from the last triangle created: the
+        # edges are tried from a random one and never back across the edge
+        # just crossed. The plain visibility walk can cycle on cocircular
+        # sites (lattices) next to the super-triangle, this one cannot.
+        xs = self.xs
+        ys = self.ys
+        tv = self.tv
+        tn = self.tn
+        t = self.last
+        came = -1
+        rand = self.walk.randrange
+        while True:
+            first = rand(3)
+            for j in range(3):
+                k = (first + j) % 3
+                u = tn[3*t + k]
+                if u == came:
+                    continue
+                a = tv[3*t + (k + 1) % 3]
+                b = tv[3*t + (k + 2) % 3]
+                if orient(xs[a], ys[a], xs[b], ys[b], x, y) < 0:
+                    came = t
+                    t = u
+                    break
+            else:
+                return t
+
+    def triangles(self):
+        for t in range(len(self.alive)):
+            if self.alive[t]:
+                yield t
+
+    def circumcenter(self, t):
+        a = self.tv[3*t]
+        b = self.tv[3*t + 1]
+        c = self.tv[3*t + 2]
+        # Relative to a site, not to a super-triangle corner: from one of
+        # those both differences are huge and d and the numerators cancel
+        # (collinear sites lose about 1e-3 of their bisectors)
+        if a < 3:
+            a, b, c = (b, c, a) if b >= 3 else (c, a, b)
+        ax = self.xs[a]
+        ay = self.ys[a]
+        bx = self.xs[b] - ax
+        by = self.ys[b] - ay
+        cx = self.xs[c] - ax
+        cy = self.ys[c] - ay
+        d = 2.0 * (bx*cy - by*cx)
+        b2 = bx*bx + by*by
+        c2 = cx*cx + cy*cy
+        return ax + (cy*b2 - by*c2) / d, ay + (bx*c2 - cx*b2) / d
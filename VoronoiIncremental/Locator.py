@@ -0,0 +1,43 @@
+import math
+
+# Jump-and-walk point location. A uniform grid remembers the last face (id) inserted
+# in every cell; a query jumps to a face in (or near) its own cell and the walk
+# in locate_region only has to cover the last few cells. With about one site
+# per cell the expected walk is O(1).
+class Locator:
+    def __init__(self, x0, y0, x1, y1, n):
+        # (x0, y0, x1, y1): area the sites fall in, n: expected number of sites
+        self.x0 = x0
+        self.y0 = y0
+        w = max(x1 - x0, 1e-9)
+        h = max(y1 - y0, 1e-9)
+        self.cs = max(math.sqrt(w * h / max(n, 1)), max(w, h) / max(n, 1))
+        self.nx = int(w / self.cs) + 1
+        self.ny = int(h / self.cs) + 1
+        self.cells = [None] * (self.nx * self.ny)
+        self.last = None
+        self.steps = 0 # faces crossed by the walks, for benchmarks
+
+    def cell_of(self, point):
+        cx = int((point[0] - self.x0) / self.cs) if point[0] > self.x0 else 0
+        cy = int((point[1] - self.y0) / self.cs) if point[1] > self.y0 else 0
+        if cx >= self.nx: cx = self.nx - 1
+        if cy >= self.ny: cy = self.ny - 1
+        return cx, cy
+
+    def add(self, face, site):
+        cx, cy = self.cell_of(site)
+        self.cells[cx * self.ny + cy] = face
+        self.last = face
+
+    def start(self, point):
+        # face of a site close to point, searching at most two rings of cells
+        cx, cy = self.cell_of(point)
+        for k in range(3):
+            for i in range(max(cx - k, 0), min(cx + k, self.nx - 1) + 1):
+                for j in range(max(cy - k, 0), min(cy + k, self.ny - 1) + 1):
+                    if max(abs(i - cx), abs(j - cy)) != k: continue
+                    face = self.cells[i * self.ny + j]
+                    if face is not None:
+                        return face
+        return self.last
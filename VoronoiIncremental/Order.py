@@ -0,0 +1,82 @@
+import math, random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Insertion order for build_voronoi: biased randomized insertion order (BRIO)
+# with a Hilbert curve sort inside every round. A site lands in the last round
+# with probability 1/2, in the one before with 1/4 and so on, so the rounds
+# grow geometrically and the randomness keeps the expected cost of the
+# incremental algorithm. Inside a round consecutive sites are close, so the
+# point location walks are short and the faces touched are still in cache.
+
+HILBERT_BITS = 16
+
+def brio_order(points, seed=None):
+    # Permutation of range(len(points)): order[k] is the id of the k-th site
+    # to insert
+    n = len(points)
+    if n == 0:
+        return []
+    rounds = max(int(math.ceil(math.log2(n))), 1)
+    if np is not None:
+        coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        u = 1.0 - np.random.default_rng(seed).random(n) # in (0, 1]
+        level = np.minimum(np.floor(-np.log2(u)).astype(np.int64), rounds - 1)
+        key = hilbert_keys(coords[:, 0], coords[:, 1])
+        return np.lexsort((key, -level)).tolist()
+    rng = random.Random(seed)
+    level = [min(int(-math.log2(1.0 - rng.random())), rounds - 1) for _ in range(n)]
+    key = hilbert_keys([p[0] for p in points], [p[1] for p in points])
+    return sorted(range(n), key=lambda i: (-level[i], key[i]))
+
+def hilbert_keys(xs, ys):
+    # Position of every site along a Hilbert curve over the bounding box
+    if np is not None:
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        x = quantize(xs, float(xs.min()), float(xs.max()))
+        y = quantize(ys, float(ys.min()), float(ys.max()))
+        d = np.zeros(len(xs), dtype=np.int64)
+        side = 1 << HILBERT_BITS
+        s = side >> 1
+        while s > 0:
+            rx = (x & s) > 0
+            ry = (y & s) > 0
+            d += s * s * ((3 * rx) ^ ry)
+            # rotate the quadrant so the curve continues in the same shape
+            flip = rx & ~ry
+            x = np.where(flip, side - 1 - x, x)
+            y = np.where(flip, side - 1 - y, y)
+            swap = ~ry
+            x, y = np.where(swap, y, x), np.where(swap, x, y)
+            s >>= 1
+        return d
+    x0, x1 = min(xs), max(xs)
+    y0, y1 = min(ys), max(ys)
+    return [hilbert_key(quantize(x, x0, x1), quantize(y, y0, y1)) for x, y in zip(xs, ys)]
+
+def hilbert_key(x, y):
+    side = 1 << HILBERT_BITS
+    d = 0
+    s = side >> 1
+    while s > 0:
+        rx = 1 if x & s else 0
+        ry = 1 if y & s else 0
+        d += s * s * ((3 * rx) ^ ry)
+        if ry == 0:
+            if rx == 1:
+                x = side - 1 - x
+                y = side - 1 - y
+            x, y = y, x
+        s >>= 1
+    return d
+
+def quantize(v, lo, hi):
+    # map [lo, hi] to integer cells 0 .. 2^HILBERT_BITS - 1
+    scale = ((1 << HILBERT_BITS) - 1) / (hi - lo) if hi > lo else 0.0
+    if np is not None and isinstance(v, np.ndarray):
+        return ((v - lo) * scale).astype(np.int64)
+    return int((v - lo) * scale)
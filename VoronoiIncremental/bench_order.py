@@ -0,0 +1,60 @@
+import gc, io, contextlib, random, sys, time
+
+from DCEL import DCEL
+from Locator import Locator
+from Order import brio_order
+from voronoi import ENGINES, create_bounding_box, build_voronoi
+
+# Effect of the insertion order on build_voronoi: walk length of the point
+# location (faces crossed per site) and wall time, for the caller order, the
+# sites sorted by x and BRIO with Hilbert rounds, for every engine. The
+# walk is only counted for the split engine. The garbage collector is
+# off while timing (as in timeit), its passes over the growing DCEL would
+# hide the difference.
+#
+#     python bench_order.py [n]
+
+def uniform(n):
+    return [(random.uniform(0, 700), random.uniform(0, 600)) for _ in range(n)]
+
+def clustered(n):
+    centers = [(random.uniform(0, 700), random.uniform(0, 600)) for _ in range(20)]
+    points = []
+    for _ in range(n):
+        cx, cy = random.choice(centers)
+        points.append((random.gauss(cx, 10), random.gauss(cy, 10)))
+    return points
+
+def run(points, order, engine):
+    dcel = DCEL()
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_bounding_box(dcel, points)
+    locator = Locator(min(p[0] for p in points), min(p[1] for p in points),
+                      max(p[0] for p in points), max(p[1] for p in points), len(points))
+    gc.disable()
+    start = time.perf_counter()
+    build_voronoi(dcel, points, locator, order, engine)
+    elapsed = time.perf_counter() - start
+    gc.enable()
+    return locator.steps / len(points), elapsed
+
+def main(n=10000):
+    random.seed(1)
+    for name, make in (("uniform", uniform), ("clustered", clustered)):
+        points = make(n)
+        print(f"{name}, {n} sites")
+        orders = [
+            ("input", None),
+            ("sorted by x", sorted(range(n), key=lambda i: points[i])),
+        ]
+        start = time.perf_counter()
+        orders.append(("BRIO + Hilbert", brio_order(points, seed=1)))
+        print(f"  brio_order: {time.perf_counter() - start:.3f} s")
+        for engine in ENGINES:
+            for label, order in orders:
+                steps, elapsed = run(points, order, engine)
+                walk = f"walk {steps:7.2f} faces/site" if engine == "split" else " " * 26
+                print(f"  {engine:8s} {label:15s} {walk}  {elapsed:7.2f} s")
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
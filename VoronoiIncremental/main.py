@@ -13,4 +13,11 @@ if __name__ == '__main__':
     print("\nHalf-edges of the bounding box:")
     for edge in dcel.half_edges:
         if edge.origin:
-            print(f"Half-edge starting at ({edge.origin.x}, {edge.origin.y})")
\ No newline at end of file
+            print(f"Half-edge starting at ({edge.origin.x}, {edge.origin.y})")
+
+    build_voronoi(dcel, points)
+
+    print("\nVoronoi regions:")
+    for face in dcel.faces:
+        corners = [(round(edge.origin.x, 2), round(edge.origin.y, 2)) for edge in face.boundary()]
+        print(f"Site {face.site}: {corners}")
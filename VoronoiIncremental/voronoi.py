@@ -1,4 +1,8 @@
+import math
+
 from DCEL import *
+from Locator import Locator
+from Delaunay import Triangulation
 
 def create_bounding_box(dcel, points, margin=10):
     x_min = min(point[0] for point in points) - margin
@@ -7,76 +11,516 @@ def create_bounding_box(dcel, points, margin=10):
     y_max = max(point[1] for point in points) + margin
 
     # Create vertices for the bounding box corners
-    v1 = Vertex(x_min, y_min)  # Bottom-left
-    v2 = Vertex(x_max, y_min)  # Bottom-right
-    v3 = Vertex(x_max, y_max)  # Top-right
-    v4 = Vertex(x_min, y_max)  # Top-left
+    v1 = dcel.new_vertex(x_min, y_min)  # Bottom-left
+    v2 = dcel.new_vertex(x_max, y_min)  # Bottom-right
+    v3 = dcel.new_vertex(x_max, y_max)  # Top-right
+    v4 = dcel.new_vertex(x_min, y_max)  # Top-left
+
+    bounding_face = dcel.new_face()
 
-    # Create half-edges that connect the vertices
-    e1 = HalfEdge(origin=v1)
-    e2 = HalfEdge(origin=v2)
-    e3 = HalfEdge(origin=v3)
-    e4 = HalfEdge(origin=v4)
+    # Create half-edges that connect the vertices, linked to the face
+    e1 = dcel.new_half_edge(v1, bounding_face)
+    e2 = dcel.new_half_edge(v2, bounding_face)
+    e3 = dcel.new_half_edge(v3, bounding_face)
+    e4 = dcel.new_half_edge(v4, bounding_face)
 
     # Link the half-edges to form a closed loop
-    e1.next = e2
-    e2.next = e3
-    e3.next = e4
-    e4.next = e1
-    e1.prev = e4
-    e2.prev = e1
-    e3.prev = e2
-    e4.prev = e3
-
-    bounding_face = Face(outer_component=e1)
-
-    # Link the edges to face
-    e1.incident_face = bounding_face
-    e2.incident_face = bounding_face
-    e3.incident_face = bounding_face
-    e4.incident_face = bounding_face
-
-    dcel.faces.append(bounding_face)
-    dcel.half_edges.extend([e1, e2, e3, e4])
-    dcel.vertices.extend([v1, v2, v3, v4])
+    dcel.link(e1, e2)
+    dcel.link(e2, e3)
+    dcel.link(e3, e4)
+    dcel.link(e4, e1)
+    for v, e in ((v1, e1), (v2, e2), (v3, e3), (v4, e4)):
+        dcel.vertex_edge[v] = e
+
+    dcel.face_edge[bounding_face] = e1
+    dcel.box = (x_min, y_min, x_max, y_max)
 
     print(f"Bounding box created with vertices at ({x_min}, {y_min}), ({x_max}, {y_min}), ({x_max}, {y_max}), ({x_min}, {y_max})")
 
-def build_voronoi(dcel, points):
-    for point in points:
-        region = locate_region(dcel, point)  
-        split_region(dcel, region, point)  
+# The diagram is kept clipped to the bounding box: every face is the convex
+# cell of one site, faces are traced counter-clockwise and half-edges on the
+# box have no twin. Vertices remember the face of one of their nearest sites,
+# so whether a new site removes a vertex is decided once for all faces around
+# it. Everything below works on the ids of the array-backed DCEL.
+
+ENGINES = ("split", "delaunay")
+
+# Points closer than MERGE times the size of the box are one vertex, in both
+# engines: a new bisector through an existing vertex (lattice, cocircular
+# sites) reuses it instead of creating a zero-length edge
+MERGE = 1e-9
 
-def locate_region(dcel, point):
-    current_face = dcel.faces[0]
+def build_voronoi(dcel, points, locator=None, order=None, engine="split"):
+    # order: optional insertion order of the ids of points (see Order.brio_order),
+    # the index of a face is always the id of its site in points
+    # engine: "split" carves every new cell out of the diagram (split_region),
+    # "delaunay" builds a Delaunay triangulation and reads off its dual
+    if engine not in ENGINES:
+        raise ValueError(f"unknown engine {engine!r}, expected one of {ENGINES}")
+    if len(points) == 0:
+        return
+    if engine == "delaunay":
+        delaunay_voronoi(dcel, points, order)
+        return
+    if locator is None:
+        locator = Locator(min(p[0] for p in points), min(p[1] for p in points),
+                          max(p[0] for p in points), max(p[1] for p in points), len(points))
+    if order is None:
+        order = range(len(points))
+    for i in order:
+        insert_site(dcel, locator, points[i], i)
+    dcel.compact()
 
+def insert_site(dcel, locator, point, index=NONE):
+    # Add one site to a diagram built by build_voronoi, returns its face
+    region = locate_region(dcel, point, locator)
+    face = split_region(dcel, region, point)
+    if dcel.face_index[face] == NONE:
+        dcel.face_index[face] = index
+    locator.add(face, point)
+    return face
+
+def locate_region(dcel, point, locator=None):
+    # Greedy walk towards the nearest site. If the site of current_face is not
+    # the nearest, the segment from it to point leaves the cell through an
+    # edge whose other site is closer, so the walk always ends in the region
+    # that contains point.
+    current_face = 0 if locator is None or locator.last is None else locator.start(point)
+    fx = dcel.face_x
+    fy = dcel.face_y
+    if fx[current_face] != fx[current_face]:
+        return current_face # no site yet
+    twin = dcel.half_twin
+    hface = dcel.half_face
+    px, py = point
+    best = (fx[current_face] - px)**2 + (fy[current_face] - py)**2
     while True:
-        inside = True 
-        edge = current_face.outer_component
-        start_edge = edge
+        closer = NONE
+        for edge in dcel.face_boundary(current_face):
+            if twin[edge] != NONE:
+                neighbour = hface[twin[edge]]
+                d = (fx[neighbour] - px)**2 + (fy[neighbour] - py)**2
+                if d < best:
+                    best = d
+                    closer = neighbour
+        if closer == NONE:
+            return current_face
+        current_face = closer
+        if locator is not None:
+            locator.steps += 1
+
+def split_region(dcel, region, point):
+    # Carve the cell of point out of region and the faces around it.
+    # Returns the new face, or region itself for a duplicate site.
+    x_min, y_min, x_max, y_max = dcel.box
+    if not (x_min <= point[0] <= x_max and y_min <= point[1] <= y_max):
+        raise ValueError(f"site {point} is outside the bounding box")
+    px, py = point
+    fx = dcel.face_x
+    fy = dcel.face_y
+    if fx[region] != fx[region]:
+        # First site, its cell is the whole box
+        fx[region] = px
+        fy[region] = py
+        for edge in dcel.face_boundary(region):
+            dcel.vertex_site[dcel.half_origin[edge]] = region
+        return region
+    if fx[region] == px and fy[region] == py:
+        return region
+
+    nxt = dcel.half_next
+    prev = dcel.half_prev
+    twin = dcel.half_twin
+    origin = dcel.half_origin
+    hface = dcel.half_face
+    vx = dcel.vertex_x
+    vy = dcel.vertex_y
+    vsite = dcel.vertex_site
+
+    eps = MERGE * max(x_max - x_min, y_max - y_min)
+
+    def side(v):
+        # 1 when v is closer to the new site than to its own sites, 0 when it
+        # is within eps of their bisector, -1 otherwise. The difference of the
+        # squared distances is 2 |s - p| times the distance to the bisector.
+        x = vx[v]
+        y = vy[v]
+        s = vsite[v]
+        sx = fx[s]
+        sy = fy[s]
+        d = (sx - x)**2 + (sy - y)**2 - (px - x)**2 - (py - y)**2
+        tol = 2.0 * eps * math.hypot(sx - px, sy - py)
+        return 1 if d > tol else (0 if d >= -tol else -1)
+
+    def inside(v):
+        return side(v) > 0
+
+    # Step 1: walk around the new cell counter-clockwise. In every face it
+    # overlaps, the boundary enters the new cell on edge ea and leaves it on
+    # edge eb; the next face is on the other side of ea (or further along
+    # the box when ea lies on it). An end of ea or eb on the bisector is
+    # itself the crossing, the edge is not split.
+    exit_edge = NONE
+    for edge in dcel.face_boundary(region):
+        if inside(origin[edge]) and not inside(origin[nxt[edge]]):
+            exit_edge = edge
+            break
+    if exit_edge == NONE:
+        return region # numerically on top of the site of region
+
+    walk = [] # (face, eb, ea, split eb, split ea)
+    face = region
+    eb = exit_edge
+    while True:
+        ea = prev[eb]
+        while inside(origin[ea]):
+            ea = prev[ea]
+        walk.append((face, eb, ea, twin[eb] == NONE and side(origin[nxt[eb]]) < 0, side(origin[ea]) < 0))
+        if twin[ea] != NONE:
+            eb = twin[ea]
+        else:
+            eb = next_box_edge(dcel, ea)
+            while inside(origin[nxt[eb]]):
+                eb = next_box_edge(dcel, eb)
+        face = hface[eb]
+        if eb == exit_edge:
+            break
+        if len(walk) > len(dcel.face_edge):
+            raise RuntimeError(f"walk around site {point} did not close")
+
+    # Step 2: split the crossed edges. Splitting an interior ea also splits
+    # the eb of the next face, which is its twin; box edges are split on
+    # their own. Afterwards the edge before the crossing A (ea, or the one
+    # before it when ea was not split) ends and eb.next starts at the edge
+    # of the new cell.
+    new_face = dcel.new_face(point)
+    for face, eb, ea, split_b, split_a in walk:
+        if split_b:
+            split_edge(dcel, eb, crossing(dcel, eb, face, point, new_face))
+        if split_a:
+            split_edge(dcel, ea, crossing(dcel, ea, face, point, new_face))
+    walk = [(face, eb, ea if split_a else prev[ea], ea) for face, eb, ea, _, split_a in walk]
+
+    # Step 3: box edges that now belong to the new cell, found before any
+    # face is relinked since next_box_edge rotates around vertices. Old
+    # crossings on the box inside the new cell are dropped, the edge before
+    # one simply runs on to the next corner or crossing. Everything else on
+    # the inside chains of the faces is freed once the faces are relinked.
+    box_chains = []
+    kept = set()
+    for i, (face, eb, ea, entry) in enumerate(walk):
+        chain = []
+        if twin[entry] == NONE:
+            end = walk[(i + 1) % len(walk)][1]
+            edge = nxt[ea]
+            chain.append(edge)
+            while edge != end:
+                edge = next_box_edge(dcel, edge)
+                if is_corner(dcel, origin[edge]):
+                    chain.append(edge)
+        box_chains.append(chain)
+        kept.update(chain)
+    dropped_edges = []
+    dropped_vertices = set()
+    for face, eb, ea, _ in walk:
+        edge = nxt[ea]
         while True:
-            if not is_point_left_of_edge(point, edge):
-                # If the point is not inside, move to the adjacent face
-                inside = False
-                current_face = edge.twin.incident_face 
+            if edge not in kept:
+                dropped_edges.append(edge)
+            if edge != eb:
+                edge = nxt[edge]
+                dropped_vertices.add(origin[edge])
+            else:
                 break
-            edge = edge.next
-            if edge == start_edge:
-                break 
-        if inside:
-            return current_face
+    for edge in kept:
+        dropped_vertices.discard(origin[edge])
 
-def is_point_left_of_edge(point, edge):
-    origin = edge.origin
-    destination = edge.next.origin
+    # Step 4: close every face with a new edge A -> B and give the twins
+    # B -> A to the new face
+    twins = []
+    for face, eb, ea, _ in walk:
+        a = origin[nxt[ea]]
+        b = origin[nxt[eb]]
+        n = dcel.new_half_edge(a, face)
+        m = dcel.new_half_edge(b, new_face)
+        twin[n] = m
+        twin[m] = n
+        dcel.link(n, nxt[eb])
+        dcel.link(ea, n)
+        dcel.face_edge[face] = n
+        dcel.vertex_edge[a] = n
+        dcel.vertex_edge[b] = m
+        twins.append(m)
+    for i, m in enumerate(twins):
+        following = twins[(i + 1) % len(twins)]
+        chain = box_chains[i]
+        if chain:
+            dcel.link(m, chain[0])
+            for edge, after in zip(chain, chain[1:]):
+                dcel.link(edge, after)
+            dcel.link(chain[-1], following)
+            for edge in chain:
+                hface[edge] = new_face
+                vsite[origin[edge]] = new_face
+                dcel.vertex_edge[origin[edge]] = edge
+        else:
+            dcel.link(m, following)
+        vsite[origin[m]] = new_face
+    dcel.face_edge[new_face] = twins[0]
 
-    edge_vector = (destination.x - origin.x, destination.y - origin.y)
-    point_vector = (point[0] - origin.x, point[1] - origin.y)
-    cross_product = edge_vector[0] * point_vector[1] - edge_vector[1] * point_vector[0]
-    return cross_product > 0  
+    for edge in dropped_edges:
+        dcel.free_half_edge(edge)
+    for v in dropped_vertices:
+        dcel.free_vertex(v)
+    return new_face
 
-def split_region(dcel, region, point):
-    #TODO: Create new edges and faces to update the DCEL for the new point
-    pass
+def is_corner(dcel, v):
+    x_min, y_min, x_max, y_max = dcel.box
+    x = dcel.vertex_x[v]
+    y = dcel.vertex_y[v]
+    return (x == x_min or x == x_max) and (y == y_min or y == y_max)
+
+def next_box_edge(dcel, edge):
+    # Box half-edge that follows edge (also on the box) counter-clockwise
+    twin = dcel.half_twin
+    following = dcel.half_next[edge]
+    while twin[following] != NONE:
+        following = dcel.half_next[twin[following]]
+    return following
+
+def crossing(dcel, edge, face, point, new_face):
+    # Vertex where edge crosses the bisector of the site of face and point
+    o = dcel.half_origin[edge]
+    d = dcel.half_origin[dcel.half_next[edge]]
+    ox = dcel.vertex_x[o]
+    oy = dcel.vertex_y[o]
+    dx = dcel.vertex_x[d]
+    dy = dcel.vertex_y[d]
+    sx = dcel.face_x[face]
+    sy = dcel.face_y[face]
+    px, py = point
+    fo = (px - ox)**2 + (py - oy)**2 - (sx - ox)**2 - (sy - oy)**2
+    fd = (px - dx)**2 + (py - dy)**2 - (sx - dx)**2 - (sy - dy)**2
+    t = fo / (fo - fd) if fo != fd else 0.5
+    t = min(max(t, 0.0), 1.0)
+    v = dcel.new_vertex(ox + t*(dx - ox), oy + t*(dy - oy))
+    dcel.vertex_site[v] = new_face
+    return v
+
+def split_edge(dcel, edge, v):
+    # edge O->D becomes O->v followed by v->D, its twin D->O becomes D->v
+    # followed by v->O
+    nxt = dcel.half_next
+    twin = dcel.half_twin
+    after = dcel.new_half_edge(v, dcel.half_face[edge])
+    dcel.link(after, nxt[edge])
+    dcel.link(edge, after)
+    dcel.vertex_edge[v] = after
+    other = twin[edge]
+    if other != NONE:
+        other_after = dcel.new_half_edge(v, dcel.half_face[other])
+        dcel.link(other_after, nxt[other])
+        dcel.link(other, other_after)
+        twin[edge] = other_after
+        twin[other_after] = edge
+        twin[other] = after
+        twin[after] = other
+
+def delaunay_voronoi(dcel, points, order=None):
+    x_min, y_min, x_max, y_max = dcel.box
+    tri = Triangulation(x_min, y_min, x_max, y_max)
+    if order is None:
+        order = range(len(points))
+    for i in order:
+        x, y = points[i][0], points[i][1]
+        if not (x_min <= x <= x_max and y_min <= y <= y_max):
+            raise ValueError(f"site {(x, y)} is outside the bounding box")
+        tri.insert(x, y, i)
+    read_dual(dcel, tri)
+
+def read_dual(dcel, tri):
+    # Replace the contents of dcel by the Voronoi diagram dual to tri, clipped
+    # to dcel.box. Every Delaunay edge between two sites is a Voronoi edge
+    # between the circumcenters of its two triangles; triangles on the
+    # super-triangle have their circumcenter far outside the box, so clipping
+    # turns those edges into the unbounded ones.
+    xs = tri.xs
+    ys = tri.ys
+    tv = tri.tv
+    tn = tri.tn
+    box = dcel.box
+    dcel.clear()
+    faces = [NONE] * len(xs)
+    for v in range(3, len(xs)):
+        faces[v] = dcel.new_face((xs[v], ys[v]), tri.ids[v])
+
+    centers = {} # triangle -> circumcenter
+    def center(t):
+        if t not in centers:
+            centers[t] = tri.circumcenter(t)
+        return centers[t]
+
+    # Cocircular sites give triangles whose circumcenters only differ by
+    # rounding; neighbours closer than eps share one Voronoi vertex
+    eps = MERGE * max(box[2] - box[0], box[3] - box[1])
+    group = {}
+    def find(t):
+        while group.get(t, t) != t:
+            t = group[t]
+        return t
+    for t in tri.triangles():
+        for k in range(3):
+            u = tn[3*t + k]
+            if u > t:
+                (tx, ty), (ux, uy) = center(t), center(u)
+                if abs(tx - ux) <= eps and abs(ty - uy) <= eps:
+                    group[find(u)] = find(t)
+
+    shared = {} # group -> vertex
+    def center_vertex(t):
+        t = find(t)
+        v = shared.get(t)
+        if v is None:
+            x, y = center(t)
+            v = dcel.new_vertex(x, y)
+            dcel.vertex_site[v] = faces[max(tv[3*t], tv[3*t + 1], tv[3*t + 2])]
+            shared[t] = v
+        return v
+
+    edges = [] # (half-edge, destination)
+    on_box = [] # (position along the box, vertex, half-edge arriving there)
+    for t in tri.triangles():
+        for k in range(3):
+            u = tn[3*t + k]
+            if u < t:
+                continue # every edge once, -1 only borders the super-triangle
+            a = tv[3*t + (k + 1) % 3]
+            b = tv[3*t + (k + 2) % 3]
+            if a < 3 or b < 3:
+                continue
+            if find(u) == find(t):
+                continue # four or more cocircular sites
+            ux, uy = center(find(u))
+            tx, ty = center(find(t))
+            clipped = clip(box, ux, uy, tx - ux, ty - uy)
+            if clipped is None:
+                continue
+            t0, side0, t1, side1 = clipped
+            # c_u lies right of a -> b and c_t left of it, so a is on the left
+            # of c_u -> c_t
+            start = center_vertex(u) if side0 < 0 else box_vertex(dcel, box, ux, uy, tx - ux, ty - uy, t0, side0)
+            end = center_vertex(t) if side1 < 0 else box_vertex(dcel, box, ux, uy, tx - ux, ty - uy, t1, side1)
+            if side0 >= 0: dcel.vertex_site[start] = faces[a]
+            if side1 >= 0: dcel.vertex_site[end] = faces[a]
+            h = dcel.new_half_edge(start, faces[a])
+            m = dcel.new_half_edge(end, faces[b])
+            dcel.half_twin[h] = m
+            dcel.half_twin[m] = h
+            edges.append((h, end))
+            edges.append((m, start))
+            if side1 >= 0:
+                on_box.append((perimeter(dcel, end, side1), end, h))
+            if side0 >= 0:
+                on_box.append((perimeter(dcel, start, side0), start, m))
+
+    # A circumcenter exactly on the box (lattice sites) is a crossing of its
+    # own: the edge out of the box is clipped away, so the cell of the box
+    # piece after it has an edge arriving there and none leaving
+    hface = dcel.half_face
+    origin = dcel.half_origin
+    crossed = {v for _, v, _ in on_box}
+    leaving = {(hface[e], origin[e]) for e, _ in edges}
+    for e, after in edges[:]:
+        if after not in crossed and (hface[e], after) not in leaving:
+            on_box.append((perimeter(dcel, after, box_side(box, dcel.vertex_x[after], dcel.vertex_y[after])), after, e))
+
+    # The box, counter-clockwise from the bottom-left corner. The half-edge
+    # arriving at a crossing has the cell of the box piece after it on its left.
+    x_min, y_min, x_max, y_max = box
+    width = x_max - x_min
+    height = y_max - y_min
+    corners = ((0.0, x_min, y_min), (width, x_max, y_min), (width + height, x_max, y_max), (2*width + height, x_min, y_max))
+    around = 2*width + 2*height
+    crossings = list(on_box)
+    for position, x, y in corners:
+        # an edge that ends on a corner ends at the corner itself
+        hit = False
+        for q, v, _ in crossings:
+            if min(abs(q - position), around - abs(q - position)) <= eps:
+                dcel.vertex_x[v] = x
+                dcel.vertex_y[v] = y
+                hit = True
+        if not hit:
+            on_box.append((position, dcel.new_vertex(x, y), NONE))
+    on_box.sort(key=lambda item: item[0])
+    owner = 0
+    for _, _, arriving in on_box:
+        if arriving != NONE:
+            owner = hface[arriving]
+    for i, (_, v, arriving) in enumerate(on_box):
+        if arriving != NONE:
+            owner = hface[arriving]
+        else:
+            dcel.vertex_site[v] = owner
+        after = on_box[(i + 1) % len(on_box)][1]
+        edges.append((dcel.new_half_edge(v, owner), after))
+
+    starts = {}
+    for e, _ in edges:
+        starts[(hface[e], origin[e])] = e
+        dcel.face_edge[hface[e]] = e
+        dcel.vertex_edge[origin[e]] = e
+    for e, after in edges:
+        dcel.link(e, starts[(hface[e], after)])
+
+def clip(box, x, y, dx, dy):
+    # Liang-Barsky: part t0 <= t <= t1 of (x, y) + t*(dx, dy), 0 <= t <= 1,
+    # inside the box, with the box side (0 bottom, 1 right, 2 top, 3 left)
+    # that cuts each end or -1
+    x_min, y_min, x_max, y_max = box
+    t0 = 0.0
+    t1 = 1.0
+    side0 = side1 = -1
+    for side, (p, q) in enumerate(((-dy, y - y_min), (dx, x_max - x), (dy, y_max - y), (-dx, x - x_min))):
+        if p == 0:
+            if q < 0:
+                return None
+        elif p < 0:
+            r = q / p
+            if r > t0:
+                t0 = r
+                side0 = side
+        else:
+            r = q / p
+            if r < t1:
+                t1 = r
+                side1 = side
+    if t0 >= t1:
+        return None
+    return t0, side0, t1, side1
+
+def box_vertex(dcel, box, x, y, dx, dy, t, side):
+    x_min, y_min, x_max, y_max = box
+    px = min(max(x + t*dx, x_min), x_max)
+    py = min(max(y + t*dy, y_min), y_max)
+    if side == 0: py = y_min
+    elif side == 1: px = x_max
+    elif side == 2: py = y_max
+    else: px = x_min
+    return dcel.new_vertex(px, py)
 
+def box_side(box, x, y):
+    # side of the box (0 bottom, 1 right, 2 top, 3 left) nearest to (x, y)
+    x_min, y_min, x_max, y_max = box
+    gaps = (y - y_min, x_max - x, y_max - y, x - x_min)
+    return gaps.index(min(gaps))
 
+def perimeter(dcel, v, side):
+    # distance from the bottom-left corner, counter-clockwise along the box
+    x_min, y_min, x_max, y_max = dcel.box
+    w = x_max - x_min
+    h = y_max - y_min
+    if side == 0: return dcel.vertex_x[v] - x_min
+    if side == 1: return w + dcel.vertex_y[v] - y_min
+    if side == 2: return w + h + x_max - dcel.vertex_x[v]
+    return 2*w + h + y_max - dcel.vertex_y[v]
@@ -0,0 +1,45 @@
+import os, sys
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+
+from Voronoi import Voronoi
+
+# Banyak diagram yang saling lepas sekaligus. Setiap Voronoi memiliki sendiri
+# beachline, event queue, DCEL dan posisi sweep (curx); tidak ada state global
+# atau class yang berubah selama sweep, jadi diagram yang berbeda aman
+# dihitung di thread yang berbeda. Satu Voronoi tetap hanya boleh diproses
+# oleh satu thread.
+#
+# Dengan GIL, thread tidak mempercepat sweep yang murni Python, maka default-nya
+# thread pool hanya pada build free-threaded (python3.13t dan setelahnya) dan
+# process pool di tempat lain; hasil dari process pool di-pickle balik.
+
+def free_threaded():
+    # True bila interpreter berjalan tanpa GIL
+    gil = getattr(sys, "_is_gil_enabled", None)
+    return gil is not None and not gil()
+
+def compute(coords, beachline="avl", result=None):
+    # satu diagram sampai selesai; result(v) bila diberikan, selain itu v
+    v = Voronoi(coords, beachline)
+    v.process()
+    return v if result is None else result(v)
+
+def compute_many(point_sets, workers=None, beachline="avl", pool=None, result=None):
+    # list hasil compute, urut sesuai point_sets.
+    # pool: "thread", "process", atau None untuk memilih sendiri (lihat atas).
+    # Untuk process pool, result harus fungsi level modul (bisa di-pickle);
+    # result=Voronoi.get_output misalnya mengirim balik hanya segment.
+    if pool is None:
+        pool = "thread" if free_threaded() else "process"
+    if pool not in ("thread", "process"):
+        raise ValueError(f"unknown pool {pool!r}, expected 'thread' or 'process'")
+    point_sets = list(point_sets)
+    if workers is None:
+        workers = min(len(point_sets), os.cpu_count() or 1) or 1
+    job = partial(compute, beachline=beachline, result=result)
+    if workers == 1:
+        return [job(coords) for coords in point_sets]
+    executor = ThreadPoolExecutor if pool == "thread" else ProcessPoolExecutor
+    with executor(max_workers=workers) as ex:
+        return list(ex.map(job, point_sets))
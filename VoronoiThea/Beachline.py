@@ -0,0 +1,104 @@
+from abc import ABC, abstractmethod
+from Components import Point
+import math
+
+# Interface beachline yang dipakai Voronoi. Urutan arc dari bawah ke atas
+# disimpan di arc itu sendiri (aprev/anext, diatur oleh Voronoi); beachline
+# hanya mengindeks urutan itu supaya arc di atas site baru cepat ditemukan.
+# Implementasi: AVLTree (AVLTree.py) dan BlockedArray (BlockedArray.py).
+# Arc.node adalah handle milik implementasi (Node di AVL, blok di BlockedArray).
+#
+#   locate(p)                arc yang parabolanya di atas site p (sweep di x p)
+#   insert_first(arc)        arc pertama
+#   insert_after(arc, new)   new tepat setelah arc (sudah di-link oleh Voronoi)
+#   split(arc, mid, right)   arc dipotong oleh mid, right adalah sisa arc di atas
+#   remove(arc)              arc hilang di circle event
+#   neighbours(arc)          (arc sebelumnya, arc berikutnya)
+#
+# locate, insert_first, insert_after dan remove abstract: implementasi yang
+# belum lengkap sudah gagal saat dibuat, bukan di tengah sweep.
+class Beachline(ABC):
+    def __init__(self, sites):
+        # koordinat site, di-index dengan nomor site (lihat SiteArray)
+        self.xs = sites.xs
+        self.ys = sites.ys
+
+    @abstractmethod
+    def locate(self, p):
+        pass
+
+    @abstractmethod
+    def insert_first(self, arc):
+        pass
+
+    @abstractmethod
+    def insert_after(self, arc, new):
+        pass
+
+    def split(self, arc, mid, right):
+        self.insert_after(arc, mid)
+        self.insert_after(mid, right)
+
+    @abstractmethod
+    def remove(self, arc):
+        pass
+
+    def neighbours(self, arc):
+        return arc.aprev, arc.anext
+
+    def below(self, arc, p, X):
+        # True bila site p di bawah batas atas arc. Site tepat di breakpoint
+        # masuk ke arc di atasnya, di AVLTree dan BlockedArray
+        if arc.anext is None:
+            return True
+        px = self.xs[p]
+        py = self.ys[p]
+        if self.xs[arc.p] == px and self.ys[arc.p] != py:
+            return False
+        return py < self.next_breakpoint(arc, X)
+
+    def next_breakpoint(self, arc, X):
+        # y breakpoint antara arc dan arc.anext, di-cache di arc untuk sweep X.
+        # Breakpoint hanya bergantung pada site kedua arc dan X, jadi cache
+        # berlaku selama X dan site anext sama; begitu sweep maju atau anext
+        # berganti, dihitung ulang. Dalam satu event pencarian di beachline dan
+        # Voronoi.intersect meminta breakpoint yang sama berulang kali.
+        q = arc.anext.p
+        if arc.bx == X and arc.bq == q:
+            return arc.by
+        y = self.breakpoint_y(arc.p, q, X)
+        arc.bx = X
+        arc.bq = q
+        arc.by = y
+        return y
+
+    def intersection(self, i0, i1, X):
+        # dapatkan intersection dari dua parabola dengan focus site i0 dan i1
+        py = self.breakpoint_y(i0, i1, X)
+        px0 = self.xs[i0]; py0 = self.ys[i0]
+        if (px0 == X):
+            px0 = self.xs[i1]; py0 = self.ys[i1]
+        px = 1.0 * (px0**2 + (py0-py)**2 - X**2) / (2*px0-2*X)
+        return Point(px, py)
+
+    def breakpoint_y(self, i0, i1, X):
+        # hanya koordinat y dari intersection, tanpa alokasi Point; cukup
+        # untuk semua pencarian di beachline
+        x0 = self.xs[i0]; y0 = self.ys[i0]
+        x1 = self.xs[i1]; y1 = self.ys[i1]
+        if (x0 == x1):
+            return (y0 + y1) / 2.0
+        elif (x1 == X):
+            return y1
+        elif (x0 == X):
+            return y0
+        else:
+            # rumus kuadrat
+            z0 = 2.0 * (x0 - X)
+            z1 = 2.0 * (x1 - X)
+
+            a = 1.0/z0 - 1.0/z1
+            b = -2.0 * (y0/z0 - y1/z1)
+            c = 1.0 * (y0**2 + x0**2 - X**2) / z0 - 1.0 * (y1**2 + x1**2 - X**2) / z1
+
+            return 1.0 * (-b-math.sqrt(b*b - 4*a*c)) / (2*a)
@@ -0,0 +1,100 @@
+from Beachline import Beachline
+
+BLOCK = 64 # arc per blok setelah split, satu blok paling banyak 2*BLOCK
+
+class Block:
+    __slots__ = ("arcs", "index")
+
+    def __init__(self, arcs, index):
+        self.arcs = arcs # list arc, urut dari bawah ke atas
+        self.index = index # posisi blok di BlockedArray.blocks
+
+# Beachline sebagai sorted array yang dipotong jadi blok-blok kecil: list
+# Python biasa, jadi pencarian biner dan insert/remove di dalam blok
+# berjalan di C tanpa alokasi node atau rotasi. arc.node menunjuk ke blok
+# tempat arc berada; posisinya di blok dicari dengan list.index (identitas,
+# paling banyak 2*BLOCK). Blok dipecah dua bila penuh dan dibuang bila kosong;
+# block.index menyimpan posisinya di self.blocks, jadi keduanya cukup insert
+# atau del di posisi itu (tanpa blocks.index/remove), lalu blok di belakangnya
+# dinomori ulang.
+class BlockedArray(Beachline):
+    def __init__(self, sites):
+        super().__init__(sites)
+        self.blocks = []
+
+    def locate(self, p):
+        # arc pertama (dari bawah) dengan below True (lihat Beachline): cari
+        # biner blok lewat arc terakhirnya, lalu cari biner di dalam blok
+        blocks = self.blocks
+        if not blocks:
+            return None
+        X = self.xs[p]
+        lo, hi = 0, len(blocks) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.below(blocks[mid].arcs[-1], p, X):
+                hi = mid
+            else:
+                lo = mid + 1
+        arcs = blocks[lo].arcs
+        lo, hi = 0, len(arcs) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.below(arcs[mid], p, X):
+                hi = mid
+            else:
+                lo = mid + 1
+        return arcs[lo]
+
+    def insert_first(self, arc):
+        block = Block([arc], len(self.blocks))
+        self.blocks.append(block)
+        arc.node = block
+
+    def insert_after(self, arc, new):
+        block = arc.node
+        arcs = block.arcs
+        arcs.insert(arcs.index(arc) + 1, new)
+        new.node = block
+        if len(arcs) > 2*BLOCK:
+            self.split_block(block)
+
+    def split(self, arc, mid, right):
+        # kedua arc baru masuk ke blok arc sekaligus
+        block = arc.node
+        arcs = block.arcs
+        i = arcs.index(arc) + 1
+        arcs[i:i] = (mid, right)
+        mid.node = right.node = block
+        if len(arcs) > 2*BLOCK:
+            self.split_block(block)
+
+    def split_block(self, block):
+        # separuh atas jadi blok baru tepat setelah blok ini
+        arcs = block.arcs
+        i = block.index + 1
+        upper = Block(arcs[BLOCK:], i)
+        del arcs[BLOCK:]
+        for a in upper.arcs:
+            a.node = upper
+        self.blocks.insert(i, upper)
+        self.renumber(i + 1)
+
+    def renumber(self, start):
+        # block.index untuk blok mulai dari posisi start
+        blocks = self.blocks
+        for i in range(start, len(blocks)):
+            blocks[i].index = i
+
+    def remove(self, arc):
+        block = arc.node
+        if block is None:
+            return
+        block.arcs.remove(arc)
+        arc.node = None
+        if not block.arcs:
+            del self.blocks[block.index]
+            self.renumber(block.index)
+
+    def __len__(self):
+        return sum(len(b.arcs) for b in self.blocks)
@@ -1,70 +1,66 @@
+# Semua record memakai __slots__: tanpa __dict__ per instance, satu Arc,
+# Node, Event atau Segment per site/vertex jadi jauh lebih kecil.
+
 class Point:
-    x = 0.0
-    y = 0.0
+    __slots__ = ("x", "y")
 
     def __init__(self, x, y):
         self.x = x
         self.y = y
 
 class Node:
-   p = None
-   arc = None  
-   def __init__(self,p):
-        self.n = None # Node
+    __slots__ = ("parent", "p", "arc", "left", "right", "height")
+
+    def __init__(self,p):
+        self.parent = None # Node
         self.p = p
         self.arc = None
         self.left = None
         self.right = None
-        self.height = 1 
+        self.height = 1
 
 class Event:
-    x = 0.0       # Koordinat maksimum dari lingkaran
-    p = None      # Pusat lingkaran
-    pprev = None  # Titik sebelumnya dari lingkaran
-    pnext = None  # Titik berikutnya dari lingkaran
-    a = None      # Busur tengah dari lingkaran
-    valid = True
-    
+    __slots__ = ("x", "p", "pprev", "pnext", "a", "valid", "index")
+
     def __init__(self, x, p, a):
-        self.x = x
-        self.p = p
-        self.a = a
+        self.x = x        # Koordinat maksimum dari lingkaran
+        self.p = p        # Pusat lingkaran
+        self.pprev = None # Titik sebelumnya dari lingkaran
+        self.pnext = None # Titik berikutnya dari lingkaran
+        self.a = a        # Busur tengah dari lingkaran
         self.valid = True
+        self.index = -1   # posisi di EventQueue, -1 bila tidak di queue
 
 class Arc:
-    number = None
-    p = None
-    aprev = None
-    anext = None
-    left = None
-    right = None
-    height = 1
-    node = None
-    e = None
-    s0 = None
-    s1 = None
-    
+    __slots__ = ("number", "p", "aprev", "anext", "node", "e", "s0", "s1", "bx", "bq", "by")
+
     def __init__(self, p, a=None, b=None):
+        self.number = None
         self.p = p
         self.aprev = a
         self.anext = b
+        self.node = None
         self.e = None
         self.s0 = None
         self.s1 = None
+        # cache breakpoint dengan anext (lihat AVLTree.next_breakpoint):
+        # posisi sweep, site anext, dan y-nya
+        self.bx = None
+        self.bq = -1
+        self.by = 0.0
 
 class Segment:
-    start = None
-    end = None
-    done = False
-    sites = None  
-    
+    __slots__ = ("start", "end", "done", "sites", "empty", "edge")
+
     def __init__(self, p):
         self.start = p
         self.end = None
         self.done = False
-        self.sites = []  # Inisialisasi list 
+        self.sites = ()    # tuple index site
+        self.empty = False # True bila lingkaran sites sudah pasti kosong (dari circle event)
+        self.edge = -1     # id half-edge di DCEL yang ditelusuri breakpoint segment ini
 
     def finish(self, p):
         if self.done: return
         self.end = p
-        self.done = True      
\ No newline at end of file
+        self.done = True
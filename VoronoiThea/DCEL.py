@@ -0,0 +1,20 @@
+import importlib.util, os, sys
+
+__all__ = ["DCEL", "Vertex", "HalfEdge", "Face", "NONE", "DEAD"]
+
+# DCEL berbasis array dipakai bersama dengan VoronoiFortune (di sebelah
+# direktori ini). Dari root repository modul itu diimport biasa; dijalankan
+# dari dalam VoronoiThea (Demo, bench_*, Batch) file yang sama dimuat
+# langsung dengan nama VoronoiFortune.DCEL, tanpa mengubah sys.path.
+try:
+    from VoronoiFortune.DCEL import DCEL, Vertex, HalfEdge, Face, NONE, DEAD
+except ImportError:
+    NAME = "VoronoiFortune.DCEL"
+    if NAME not in sys.modules:
+        path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "VoronoiFortune", "DCEL.py")
+        spec = importlib.util.spec_from_file_location(NAME, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[NAME] = module
+        spec.loader.exec_module(module)
+    shared = sys.modules[NAME]
+    DCEL, Vertex, HalfEdge, Face, NONE, DEAD = shared.DCEL, shared.Vertex, shared.HalfEdge, shared.Face, shared.NONE, shared.DEAD
@@ -1,5 +1,94 @@
+import sys
 import tkinter as tk
+from itertools import chain
 from Voronoi import Voronoi
+from Trace import FileTrace
+from ViewIndex import ViewIndex
+
+# Most points in one polyline item; longer chains are split into several items
+MAX_LINE_POINTS = 4096
+
+# Points (and labels) created by one Tcl script in display_points
+POINT_BATCH = 10000
+
+# Level of detail of redraw: edges shorter than MIN_EDGE_PIXELS are left
+# out, at most MAX_LINES edges and MAX_POINTS points are drawn (the longest
+# edges and an even sample of the points), labels only when all visible
+# points are drawn and there are at most MAX_LABELS of them
+MIN_EDGE_PIXELS = 1.0
+MAX_LINES = 20000
+MAX_POINTS = 5000
+MAX_LABELS = 300
+
+# Part of the viewport size drawn beyond each side, so a short pan needs no redraw
+VIEW_MARGIN = 0.5
+
+# Cell of the site index, in world units
+SITE_CELL = 8.0
+
+# Milliseconds without wheel or pan events before the level of detail,
+# marker sizes and labels are redrawn
+REDRAW_DELAY = 150
+
+def chain_segments(lines, limit=MAX_LINE_POINTS):
+    # Join segments (x0, y0, x1, y1) into polylines and return them as flat
+    # coordinate lists of at most limit points. Segments meet at shared
+    # endpoints, so a walk over the edge graph covers a connected part in one
+    # line; at a dead end the walk goes back over edges already drawn, which
+    # costs points but no visible change.
+    index = {}  # endpoint -> vertex id
+    coords = [] # per vertex id, (x, y)
+    adj = []    # per vertex id, ids of its segments not walked yet
+    other = []  # per segment id, xor of both vertex ids
+    for x0, y0, x1, y1 in lines:
+        a = (x0, y0)
+        u = index.get(a)
+        if u is None:
+            u = index[a] = len(coords)
+            coords.append(a)
+            adj.append([len(other)])
+        else:
+            adj[u].append(len(other))
+        b = (x1, y1)
+        w = index.get(b)
+        if w is None:
+            w = index[b] = len(coords)
+            coords.append(b)
+            adj.append([len(other)])
+        else:
+            adj[w].append(len(other))
+        other.append(u ^ w)
+
+    used = bytearray(len(other))
+    res = []
+    for start in range(len(coords)):
+        if not adj[start]:
+            continue
+        path = [coords[start]]
+        stack = [start]
+        last = 1 # length of path after the last new segment
+        while stack:
+            v = stack[-1]
+            nbrs = adj[v]
+            while nbrs:
+                k = nbrs.pop()
+                if not used[k]:
+                    used[k] = 1
+                    w = other[k] ^ v
+                    path.append(coords[w])
+                    stack.append(w)
+                    last = len(path)
+                    break
+            else:
+                # dead end, walk back
+                stack.pop()
+                if stack:
+                    path.append(coords[stack[-1]])
+        del path[last:]
+        # split long walks, consecutive pieces share one point
+        for i in range(0, len(path) - 1, limit - 1):
+            res.append(list(chain.from_iterable(path[i:i + limit])))
+    return res
 
 class MainWindow:
     # Initial radius of drawn points on canvas
@@ -8,6 +97,9 @@ class MainWindow:
     # flag to lock the canvas when drawn
     LOCK_FLAG = False
 
+    # Time slice of one sweep step, the window handles its events in between
+    STEP_SECONDS = 0.03
+
     def __init__(self, master, points=None, reopen_main_menu=None):
         self.master = master
         self.master.title("Voronoi")
@@ -35,16 +127,37 @@ class MainWindow:
         self.btnExit = tk.Button(self.frmButton, text='Exit', width=20, command=self.onClickClose)
         self.btnExit.pack(side=tk.LEFT)
 
+        self.lblStatus = tk.Label(self.frmButton, width=24, anchor=tk.W)
+        self.lblStatus.pack(side=tk.LEFT)
+
         self.verbose = True
         self.label = True
         self.haveLines = False
 
         self.points = points  # store the points
 
-        # Initialize zoom and pan variables
+        # The model, in world coordinates: the canvas shows world * scale +
+        # translate, and only the part inside the viewport (see redraw)
+        self.sites = []  # every point, in the order drawn
+        self.lines = []  # edges (x0, y0, x1, y1) of the computed diagram
+        self.circles = []  # largest empty circles, (center, radius)
+        self.siteIndex = ViewIndex(SITE_CELL)
+        self.lineIndex = None  # built once the sweep is done
+        self.drawn = None  # world rectangle covered by the last redraw
+        self.redrawJob = None  # pending after() callback of scheduleRedraw
+
+        # Running sweep: the Voronoi, its process_iter generator and the
+        # pending after() callback
+        self.vp = None
+        self.sweep = None
+        self.job = None
+
+        # Initialize zoom and pan variables: canvas = world * scale + translate
         self.scale = 1.0  # Current scale
         self.translate_x = 0  # Current translation x
         self.translate_y = 0  # Current translation y
+        self.pan_x = 0  # Mouse position of the last pan event
+        self.pan_y = 0
 
         # Bind mouse events for zooming and panning
         self.w.bind('<MouseWheel>', self.zoom)  # For Windows and Linux
@@ -61,9 +174,84 @@ class MainWindow:
 
     def display_points(self, points):
         for x, y in points:
-            self.draw_point(x, y)
+            x = float(x)
+            y = float(y)
+            self.sites.append((x, y))
+            self.siteIndex.add_point(x, y)
+        self.redraw()
+
+    def script_points(self, script, points, labels):
+        # Tcl commands for ovals (and labels) of world points, appended to
+        # script; one tk.eval runs them instead of a round trip per item
+        canvas = self.w._w
+        s = self.scale
+        tx = self.translate_x
+        ty = self.translate_y
+        r = self.INITIAL_RADIUS / s
+        font = "{Ariel " + str(max(int(7 / s), 1)) + "}"
+        for x, y in points:
+            cx = x * s + tx
+            cy = y * s + ty
+            script.append(f"{canvas} create oval {cx - r:.2f} {cy - r:.2f} {cx + r:.2f} {cy + r:.2f} -fill black -tags {{point no_scale}}")
+            if labels:
+                script.append(f"{canvas} create text {cx:.2f} {cy:.2f} -anchor s -font {font} -text {{   {int(x)} {int(y)}}} -tags {{label no_scale}}")
+
+    def viewport(self, margin=0.0):
+        # World rectangle shown by the canvas, grown by margin times its size
+        w = self.w
+        width = w.winfo_width()
+        height = w.winfo_height()
+        if width <= 1 or height <= 1:  # not mapped yet
+            width = int(w['width'])
+            height = int(w['height'])
+        x0 = (w.canvasx(0) - self.translate_x) / self.scale
+        y0 = (w.canvasy(0) - self.translate_y) / self.scale
+        x1 = x0 + width / self.scale
+        y1 = y0 + height / self.scale
+        dx = (x1 - x0) * margin
+        dy = (y1 - y0) * margin
+        return (x0 - dx, y0 - dy, x1 + dx, y1 + dy)
+
+    def redraw(self):
+        # Replace the drawn edges, points, labels and circles with the ones
+        # that intersect the viewport (plus VIEW_MARGIN), at the level of
+        # detail of the current scale
+        w = self.w
+        w.delete('line', 'point', 'label', 'circle')
+        view = self.viewport(VIEW_MARGIN)
+        self.drawn = view
+        canvas = w._w
+        s = self.scale
+        tx = self.translate_x
+        ty = self.translate_y
+        script = []
+
+        if self.lineIndex is not None:
+            # the visible edges as a few polylines, as in drawLinesOnCanvas
+            ids, _ = self.lineIndex.query(*view, min_size=MIN_EDGE_PIXELS / s, limit=MAX_LINES)
+            lines = self.lines
+            for coords in chain_segments([lines[i] for i in ids]):
+                points = " ".join(f"{x * s + tx:.2f} {y * s + ty:.2f}" for x, y in zip(coords[0::2], coords[1::2]))
+                script.append(f"{canvas} create line {points} -fill blue -tags line")
+
+        ids, complete = self.siteIndex.query(*view, limit=MAX_POINTS)
+        labels = self.label and complete and len(ids) <= MAX_LABELS
+        sites = self.sites
+        self.script_points(script, [sites[i] for i in ids], labels)
+
+        for center, radius in self.circles:
+            cx = center.x * s + tx
+            cy = center.y * s + ty
+            r = radius * s
+            script.append(f"{canvas} create oval {cx - r:.2f} {cy - r:.2f} {cx + r:.2f} {cy + r:.2f} -outline red -width 2 -tags circle")
+
+        for i in range(0, len(script), POINT_BATCH):
+            w.tk.eval("\n".join(script[i:i + POINT_BATCH]))
 
     def draw_point(self, x, y):
+        # x, y on the canvas; the model keeps world coordinates
+        self.sites.append(((x - self.translate_x) / self.scale, (y - self.translate_y) / self.scale))
+        self.siteIndex.add_point(*self.sites[-1])
         # Adjust the radius inversely proportional to the scale
         adjusted_radius = self.INITIAL_RADIUS / self.scale
         self.w.create_oval(
@@ -71,46 +259,91 @@ class MainWindow:
             x + adjusted_radius, y + adjusted_radius,
             fill="black", tag=("point", "no_scale")
         )
-        t = "   " + str(int(x)) + " " + str(int(y))
+        t = "   " + str(int(self.sites[-1][0])) + " " + str(int(self.sites[-1][1]))
         if self.label:
             self.w.create_text(
                 x, y, anchor="s",
-                font=("Ariel", int(7 / self.scale)),
+                font=("Ariel", max(int(7 / self.scale), 1)),
                 text=t, tag=("label", "no_scale")
             )
 
     def onClickCalculate(self):
         if not self.LOCK_FLAG:
             self.LOCK_FLAG = True
-            pObj = self.w.find_withtag("point")
-            points = []
-            for p in pObj:
-                coord = self.w.coords(p)
-                x = (coord[0] + coord[2]) / 2  # Calculate the center x-coordinate
-                y = (coord[1] + coord[3]) / 2  # Calculate the center y-coordinate
-                points.append((x, y))
-
-            vp = Voronoi(points)
-            vp.verbose = self.verbose
-            vp.process()
-            lines = vp.get_output()
-            self.drawLinesOnCanvas(lines)
+            vp = Voronoi(self.sites)
+            if self.verbose:
+                vp.set_trace(FileTrace(sys.stdout, vp.sites))
+
+            # Run the sweep in time slices from after() callbacks, so the
+            # window stays responsive; finished edges are drawn as they come
+            self.vp = vp
+            self.sweep = vp.process_iter(seconds=self.STEP_SECONDS)
             self.haveLines = True
+            self.job = self.master.after(1, self.onSweepStep)
 
-            # Get the largest empty circles
-            largest_circles = vp.get_largest_empty_circles()
-            self.drawCirclesOnCanvas(largest_circles)
+    def onSweepStep(self):
+        try:
+            x, segments = next(self.sweep)
+        except StopIteration:
+            self.onSweepDone()
+            return
+        lines = [(s.start.x, s.start.y, s.end.x, s.end.y) for s in segments]
+        self.lines.extend(lines)
+        self.drawLinesOnCanvas(lines)
+        self.showProgress(x)
+        self.job = self.master.after(1, self.onSweepStep)
+
+    def onSweepDone(self):
+        vp = self.vp
+        self.cancelSweep()
+        self.w.delete('sweep')
+        self.lblStatus['text'] = str(len(vp.output)) + " edges"
+
+        # Get the largest empty circles
+        self.circles = vp.largest_empty_circles()
+
+        # From now on only the visible edges are on the canvas
+        self.lineIndex = self.build_line_index(self.lines)
+        self.redraw()
+
+    def build_line_index(self, lines):
+        # Cells of level 0 as large as the median edge of a sample; the
+        # extent of the diagram is no guide, the edges closed at the bounding
+        # box reach far out
+        step = max(len(lines) // 1000, 1)
+        sizes = sorted(max(abs(x1 - x0), abs(y1 - y0)) for x0, y0, x1, y1 in lines[::step])
+        cell = sizes[len(sizes) // 2] if sizes else 1.0
+        index = ViewIndex(cell if cell > 0 else 1.0)
+        for x0, y0, x1, y1 in lines:
+            index.add_segment(x0, y0, x1, y1)
+        return index
+
+    def showProgress(self, x):
+        # The sweep line moves from the leftmost to the rightmost site
+        if x is None:
+            return
+        sites = self.vp.sites
+        width = sites.x1 - sites.x0
+        done = min(max((x - sites.x0) / width, 0.0), 1.0) if width > 0 else 1.0
+        self.lblStatus['text'] = "Sweep " + str(int(100 * done)) + "%"
+        x = x * self.scale + self.translate_x
+        if not self.w.find_withtag('sweep'):
+            self.w.create_line(x, -10000, x, 10000, fill='gray', dash=(4, 4), tag="sweep")
+        else:
+            self.w.coords('sweep', x, -10000, x, 10000)
 
-    def drawCirclesOnCanvas(self, circles):
-        for circle in circles:
-            center, radius = circle
-            x0 = center.x - radius
-            y0 = center.y - radius
-            x1 = center.x + radius
-            y1 = center.y + radius
-            self.w.create_oval(x0, y0, x1, y1, outline='red', width=2, tag="circle")
+    def cancelSweep(self):
+        if self.job is not None:
+            self.master.after_cancel(self.job)
+        self.vp = None
+        self.sweep = None
+        self.job = None
 
     def onClickClose(self):
+        self.cancelSweep()
+        if self.redrawJob is not None:
+            self.master.after_cancel(self.redrawJob)
+            self.redrawJob = None
         self.master.destroy()
         if self.reopen_main_menu:
             self.reopen_main_menu()
@@ -125,6 +358,12 @@ class MainWindow:
 
     def onClickClear(self):
         self.LOCK_FLAG = False
+        self.cancelSweep()
+        self.w.delete('sweep')
+        self.lblStatus['text'] = ""
+        self.lines = []
+        self.circles = []
+        self.lineIndex = None
         if self.haveLines:
             self.w.delete('line')
             self.w.delete('circle')
@@ -132,6 +371,8 @@ class MainWindow:
         else:
             self.w.delete(tk.ALL)
             self.points = None
+            self.sites = []
+            self.siteIndex = ViewIndex(SITE_CELL)
 
     def onDoubleClick(self, event):
         if not self.LOCK_FLAG:
@@ -140,8 +381,15 @@ class MainWindow:
             self.draw_point(x, y)
 
     def drawLinesOnCanvas(self, lines):
-        for l in lines:
-            self.w.create_line(l[0], l[1], l[2], l[3], fill='blue', tag="line")
+        # Edges sharing endpoints go into a few polyline items, so later
+        # find_withtag and scale calls see a handful of items, not one per edge
+        s = self.scale
+        tx = self.translate_x
+        ty = self.translate_y
+        for coords in chain_segments(lines):
+            coords[0::2] = [x * s + tx for x in coords[0::2]]
+            coords[1::2] = [y * s + ty for y in coords[1::2]]
+            self.w.create_line(coords, fill='blue', tag="line")
 
     def zoom(self, event):
         # Respond to mouse wheel event
@@ -159,45 +407,47 @@ class MainWindow:
         x = self.w.canvasx(event.x)
         y = self.w.canvasy(event.y)
 
-        # Scale the canvas
+        # Scale the view around the mouse position: one scale call for all
+        # drawn items now, the level of detail, marker sizes and labels once
+        # the wheel stops
         self.scale *= scale_factor
-
-        # Scale all items except those tagged with 'no_scale'
-        for item in self.w.find_all():
-            if "no_scale" not in self.w.gettags(item):
-                self.w.scale(item, x, y, scale_factor, scale_factor)
-
-        # Adjust point sizes and label fonts
-        self.update_point_sizes()
-        self.update_label_sizes()
-
-        # Update scroll region
-        self.w.configure(scrollregion=self.w.bbox("all"))
-
-    def update_point_sizes(self):
-        # Adjust the size of the points based on the current scale
-        for point in self.w.find_withtag("point"):
-            x0, y0, x1, y1 = self.w.coords(point)
-            x = (x0 + x1) / 2
-            y = (y0 + y1) / 2
-            adjusted_radius = self.INITIAL_RADIUS / self.scale
-            self.w.coords(
-                point,
-                x - adjusted_radius, y - adjusted_radius,
-                x + adjusted_radius, y + adjusted_radius
-            )
-
-    def update_label_sizes(self):
-        # Adjust the font size of labels based on the current scale
-        new_font_size = max(int(7 / self.scale), 1)
-        for label in self.w.find_withtag("label"):
-            self.w.itemconfig(label, font=("Ariel", new_font_size))
+        self.translate_x = x + (self.translate_x - x) * scale_factor
+        self.translate_y = y + (self.translate_y - y) * scale_factor
+        self.w.scale('all', x, y, scale_factor, scale_factor)
+        self.scheduleRedraw()
 
     def pan_start(self, event):
-        self.w.scan_mark(event.x, event.y)
+        self.pan_x = event.x
+        self.pan_y = event.y
 
     def pan_move(self, event):
-        self.w.scan_dragto(event.x, event.y, gain=1)
+        # Panning is part of the same transform as zooming
+        dx = event.x - self.pan_x
+        dy = event.y - self.pan_y
+        self.pan_x = event.x
+        self.pan_y = event.y
+        self.translate_x += dx
+        self.translate_y += dy
+        self.w.move('all', dx, dy)
+        # Redraw once the viewport leaves the drawn area
+        if self.drawn is not None:
+            x0, y0, x1, y1 = self.viewport()
+            d = self.drawn
+            if x0 < d[0] or y0 < d[1] or x1 > d[2] or y1 > d[3]:
+                self.scheduleRedraw()
+
+    def scheduleRedraw(self):
+        # Redraw REDRAW_DELAY ms after the last call
+        if self.redrawJob is not None:
+            self.master.after_cancel(self.redrawJob)
+        self.redrawJob = self.master.after(REDRAW_DELAY, self.onRedraw)
+
+    def onRedraw(self):
+        self.redrawJob = None
+        # Edges of a running sweep are only drawn once, as they arrive;
+        # onSweepDone redraws
+        if self.sweep is None:
+            self.redraw()
 
 def main():
     root = tk.Tk()
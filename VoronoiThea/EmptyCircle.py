@@ -0,0 +1,235 @@
+import heapq, math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from Components import Point
+
+# Largest empty circle dengan pusat dibatasi convex hull site (atau polygon).
+# Kandidat pusat:
+#   - vertex Voronoi di dalam region (dicatat sweep bersama radiusnya)
+#   - titik potong edge Voronoi dengan batas region
+#   - vertex polygon (hanya untuk polygon dari user)
+# Semua kandidat dialirkan ke heap berukuran k, tidak ada list semua lingkaran.
+
+def cross(ax, ay, bx, by, cx, cy):
+    return (bx - ax)*(cy - ay) - (by - ay)*(cx - ax)
+
+def convex_hull(sites):
+    # monotone chain memakai urutan lexicographic dari SiteArray, return CCW
+    xs = sites.xs
+    ys = sites.ys
+    dup = sites.duplicate
+    if np is not None and sites.coords is not None and len(xs) > 64:
+        keep = hull_candidates(sites.coords)
+        order = [i for i in sites.order if keep[i] and not dup[i]]
+    else:
+        order = [i for i in sites.order if not dup[i]]
+    if len(order) < 3:
+        return [(xs[i], ys[i]) for i in order]
+
+    def chain(seq):
+        h = []
+        for i in seq:
+            while len(h) >= 2 and cross(xs[h[-2]], ys[h[-2]], xs[h[-1]], ys[h[-1]], xs[i], ys[i]) <= 0:
+                h.pop()
+            h.append(i)
+        return h
+
+    lower = chain(order)
+    upper = chain(reversed(order))
+    return [(xs[i], ys[i]) for i in lower[:-1] + upper[:-1]]
+
+def hull_candidates(coords):
+    # Akl-Toussaint: buang site yang pasti di dalam octagon titik ekstrem
+    X = coords[:, 0]
+    Y = coords[:, 1]
+    # titik ekstrem dengan arah 0, 45, 90, ..., 315 derajat (urutan CCW)
+    idx = [X.argmax(), (X + Y).argmax(), Y.argmax(), (Y - X).argmax(),
+           X.argmin(), (X + Y).argmin(), Y.argmin(), (X - Y).argmax()]
+    poly = []
+    for i in idx:
+        p = (float(X[i]), float(Y[i]))
+        if len(poly) == 0 or poly[-1] != p: poly.append(p)
+    if len(poly) > 1 and poly[0] == poly[-1]: poly.pop()
+    if len(poly) < 3:
+        return [True] * len(X)
+    inside = np.ones(len(X), dtype=bool)
+    for k in range(len(poly)):
+        ax, ay = poly[k-1]
+        bx, by = poly[k]
+        inside &= (bx - ax)*(Y - ay) - (by - ay)*(X - ax) > 0
+    return (~inside).tolist()
+
+def normalize_polygon(polygon):
+    # list (x, y) float, tanpa vertex penutup, orientasi CCW
+    poly = [(float(p[0]), float(p[1])) for p in polygon]
+    if len(poly) > 1 and poly[0] == poly[-1]:
+        poly.pop()
+    if len(poly) < 3:
+        raise ValueError("bounding polygon butuh minimal 3 vertex")
+    area = 0.0
+    for k in range(len(poly)):
+        x0, y0 = poly[k-1]
+        x1, y1 = poly[k]
+        area = area + (x0*y1 - x1*y0)
+    if area < 0:
+        poly.reverse()
+    return poly
+
+def is_convex(poly):
+    n = len(poly)
+    for k in range(n):
+        ax, ay = poly[k-2]
+        bx, by = poly[k-1]
+        cx, cy = poly[k]
+        if cross(ax, ay, bx, by, cx, cy) < 0:
+            return False
+    return True
+
+def inside_convex(poly, x, y):
+    # binary search wedge dari vertex 0, O(log n), batas dihitung di dalam
+    n = len(poly)
+    x0, y0 = poly[0]
+    if cross(x0, y0, poly[1][0], poly[1][1], x, y) < 0: return False
+    if cross(x0, y0, poly[n-1][0], poly[n-1][1], x, y) > 0: return False
+    lo = 1
+    hi = n - 1
+    while hi - lo > 1:
+        mid = (lo + hi) >> 1
+        if cross(x0, y0, poly[mid][0], poly[mid][1], x, y) >= 0: lo = mid
+        else: hi = mid
+    return cross(poly[lo][0], poly[lo][1], poly[lo+1][0], poly[lo+1][1], x, y) >= 0
+
+def inside_polygon(poly, x, y):
+    # ray casting (even-odd) untuk polygon sembarang
+    inside = False
+    n = len(poly)
+    for k in range(n):
+        ax, ay = poly[k-1]
+        bx, by = poly[k]
+        if (ay > y) != (by > y):
+            if x < ax + (y - ay) * (bx - ax) / (by - ay):
+                inside = not inside
+    return inside
+
+class TopK:
+    # heap berukuran k berisi (radius, seq, x, y), radius terkecil di atas
+    def __init__(self, k):
+        self.k = k
+        self.heap = []
+        self.seq = 0
+
+    def wants(self, r):
+        return len(self.heap) < self.k or r > self.heap[0][0]
+
+    def push(self, r, x, y):
+        heap = self.heap
+        if len(heap) >= self.k and r <= heap[0][0]: return
+        for e in heap:
+            if e[2] == x and e[3] == y: return # vertex yang sama dari event lain
+        self.seq = self.seq + 1
+        if len(heap) < self.k:
+            heapq.heappush(heap, (r, -self.seq, x, y))
+        else:
+            heapq.heapreplace(heap, (r, -self.seq, x, y))
+
+    def result(self):
+        return [(Point(x, y), r) for r, _, x, y in sorted(self.heap, reverse=True)]
+
+def largest_empty_circles(vor, k=1, polygon=None):
+    # vor: Voronoi yang sudah di-process
+    if k <= 0: return []
+    grid = vor.site_grid()
+    top = TopK(k)
+
+    if polygon is None:
+        poly = convex_hull(vor.sites)
+        if len(poly) < 3:
+            collinear_circles(vor.sites, top)
+            return top.result()
+        inside = inside_convex
+    else:
+        poly = normalize_polygon(polygon)
+        inside = inside_convex if is_convex(poly) else inside_polygon
+        # vertex polygon juga kandidat pusat
+        for x, y in poly:
+            _, r = grid.nearest(x, y)
+            top.push(r, x, y)
+
+    # vertex Voronoi dari radius terbesar, cukup sampai heap tidak menerima lagi
+    vx = vor.vx
+    vy = vor.vy
+    vr = vor.vr
+    for j in descending(vr):
+        if not top.wants(vr[j]): break
+        if inside(poly, vx[j], vy[j]):
+            top.push(vr[j], vx[j], vy[j])
+
+    # titik potong edge Voronoi dengan setiap edge batas region
+    for j in range(len(poly)):
+        ax, ay = poly[j-1]
+        bx, by = poly[j]
+        walk_edge(grid, ax, ay, bx, by, top)
+
+    return top.result()
+
+def descending(values):
+    # index values dari yang terbesar, lazy untuk versi tanpa numpy
+    if np is not None:
+        for j in np.argsort(-np.asarray(values, dtype=np.float64), kind="stable").tolist():
+            yield j
+        return
+    heap = [(-v, j) for j, v in enumerate(values)]
+    heapq.heapify(heap)
+    while heap:
+        yield heapq.heappop(heap)[1]
+
+def walk_edge(grid, ax, ay, bx, by, top):
+    # Jalan sepanjang edge A->B melewati cell Voronoi. Cell convex, jadi bila
+    # titik q(t) dan q(t1) punya site terdekat yang sama, seluruh [t, t1] ada
+    # di cell itu. Setiap pindah cell adalah titik potong edge Voronoi.
+    dx = bx - ax
+    dy = by - ay
+    s, _ = grid.nearest(ax, ay)
+    if s is None: return
+    xs = grid.xs
+    ys = grid.ys
+    t = 0.0
+    w, _ = grid.nearest(bx, by)
+    t1 = 1.0
+    guard = 4 * len(grid.cell_sites) + 8
+    while w != s and guard > 0:
+        guard = guard - 1
+        # parameter di mana q(t) berjarak sama ke s dan w
+        den = 2.0 * (dx*(xs[w] - xs[s]) + dy*(ys[w] - ys[s]))
+        if den <= 0: break
+        tw = ((ax - xs[w])**2 + (ay - ys[w])**2 - (ax - xs[s])**2 - (ay - ys[s])**2) / den
+        if tw < t: tw = t
+        if tw > t1: tw = t1
+        qx = ax + tw*dx
+        qy = ay + tw*dy
+        ds = math.hypot(qx - xs[s], qy - ys[s])
+        n, dn = grid.nearest(qx, qy)
+        if n == s or n == w or dn >= ds:
+            # titik potong edge Voronoi (s, w)
+            top.push(ds, qx, qy)
+            s = w
+            t = tw
+            w, _ = grid.nearest(bx, by)
+            t1 = 1.0
+        else:
+            # ada site lain yang lebih dekat sebelum t1
+            w = n
+            t1 = tw
+
+def collinear_circles(sites, top):
+    # semua site segaris: pusat ada di tengah dua site berurutan
+    xs = sites.xs
+    ys = sites.ys
+    order = [i for i in sites.order if not sites.duplicate[i]]
+    for a, b in zip(order, order[1:]):
+        r = math.hypot(xs[b] - xs[a], ys[b] - ys[a]) / 2.0
+        top.push(r, (xs[a] + xs[b]) / 2.0, (ys[a] + ys[b]) / 2.0)
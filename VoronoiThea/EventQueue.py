@@ -0,0 +1,111 @@
+# Priority queue circle event yang addressable.
+# Setiap entry heap adalah [x, seq, event]; seq naik terus sehingga x yang
+# sama diputus secara deterministik (urutan dijadwalkan), dan event tidak
+# pernah dibandingkan langsung. event.index menyimpan posisi entry di heap
+# sehingga delete dan update bisa dilakukan dalam O(log n).
+class EventQueue:
+    def __init__(self):
+        self.heap = []
+        self.seq = 0
+
+        # counters
+        self.peak = 0     # ukuran heap maksimum
+        self.pops = 0     # jumlah event yang di-pop
+        self.stale = 0    # event invalid yang ter-pop (harusnya 0)
+        self.removed = 0  # event yang dihapus sebelum di-pop
+
+    def __len__(self):
+        return len(self.heap)
+
+    def peek(self):
+        if len(self.heap) == 0: return None
+        return self.heap[0][2]
+
+    def push(self, e):
+        self.seq = self.seq + 1
+        e.index = len(self.heap)
+        self.heap.append([e.x, self.seq, e])
+        self.sift_up(e.index)
+        if len(self.heap) > self.peak: self.peak = len(self.heap)
+
+    def pop(self):
+        heap = self.heap
+        entry = heap[0]
+        last = heap.pop()
+        if len(heap) > 0:
+            heap[0] = last
+            last[2].index = 0
+            self.sift_down(0)
+        e = entry[2]
+        e.index = -1
+        self.pops = self.pops + 1
+        if not e.valid: self.stale = self.stale + 1
+        return e
+
+    def remove(self, e):
+        # hapus event dari heap, O(log n)
+        i = e.index
+        if i < 0: return
+        heap = self.heap
+        last = heap.pop()
+        if i < len(heap):
+            heap[i] = last
+            last[2].index = i
+            self.sift_down(i)
+            self.sift_up(last[2].index)
+        e.index = -1
+        self.removed = self.removed + 1
+
+    def update(self, e, x):
+        # ganti key event yang masih di heap, atau push bila belum ada
+        if e.index < 0:
+            e.x = x
+            self.push(e)
+            return
+        self.seq = self.seq + 1
+        entry = self.heap[e.index]
+        e.x = x
+        entry[0] = x
+        entry[1] = self.seq
+        self.sift_down(e.index)
+        self.sift_up(e.index)
+
+    def stale_ratio(self):
+        if self.pops == 0: return 0.0
+        return self.stale / self.pops
+
+    def stats(self):
+        return {"peak": self.peak, "pops": self.pops, "stale": self.stale,
+                "removed": self.removed, "stale_ratio": self.stale_ratio()}
+
+    def sift_up(self, i):
+        heap = self.heap
+        entry = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            pentry = heap[parent]
+            if entry < pentry:
+                heap[i] = pentry
+                pentry[2].index = i
+                i = parent
+            else: break
+        heap[i] = entry
+        entry[2].index = i
+
+    def sift_down(self, i):
+        heap = self.heap
+        n = len(heap)
+        entry = heap[i]
+        while True:
+            child = 2*i + 1
+            if child >= n: break
+            if child + 1 < n and heap[child+1] < heap[child]:
+                child = child + 1
+            centry = heap[child]
+            if centry < entry:
+                heap[i] = centry
+                centry[2].index = i
+                i = child
+            else: break
+        heap[i] = entry
+        entry[2].index = i
@@ -0,0 +1,158 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Uniform grid di atas site, dibangun sekali per diagram.
+# Site disimpan per cell dalam format CSR: site di cell c adalah
+# cell_sites[cell_start[c]:cell_start[c+1]].
+# Query mencari cell dalam ring yang makin melebar dari pusat, dan berhenti
+# begitu ring berikutnya pasti lebih jauh dari radius yang dicari.
+class SiteGrid:
+    def __init__(self, sites, skip=None):
+        # sites: SiteArray; skip: list flag site yang tidak diindex (mis. duplikat)
+        self.xs = sites.xs
+        self.ys = sites.ys
+        n = len(self.xs)
+        if np is not None:
+            ids = np.arange(n) if skip is None else np.flatnonzero(~np.asarray(skip, dtype=bool))
+        else:
+            ids = [i for i in range(n) if skip is None or not skip[i]]
+        m = len(ids)
+
+        if m > 0 and np is not None:
+            px = np.asarray(self.xs)[ids]
+            py = np.asarray(self.ys)[ids]
+            self.gx0 = float(px.min())
+            self.gy0 = float(py.min())
+            gx1 = float(px.max())
+            gy1 = float(py.max())
+        elif m > 0:
+            self.gx0 = min(self.xs[i] for i in ids)
+            self.gy0 = min(self.ys[i] for i in ids)
+            gx1 = max(self.xs[i] for i in ids)
+            gy1 = max(self.ys[i] for i in ids)
+        else:
+            self.gx0 = self.gy0 = gx1 = gy1 = 0.0
+        w = gx1 - self.gx0
+        h = gy1 - self.gy0
+
+        # sekitar satu-dua site per cell
+        area = w * h
+        self.cs = max(w, h, 1.0) / max(m, 1)
+        if area > 0:
+            # jaga agar jumlah cell tetap O(m) untuk data yang sangat pipih
+            self.cs = max(self.cs, math.sqrt(area / max(m, 1)) * 1.5)
+        self.nx = int(w / self.cs) + 1
+        self.ny = int(h / self.cs) + 1
+
+        if np is not None and m > 0:
+            self.build_numpy(ids, px, py)
+        else:
+            self.build_list(list(ids))
+
+    def build_numpy(self, ids, px, py):
+        cx = np.minimum(((px - self.gx0) / self.cs).astype(np.int64), self.nx - 1)
+        cy = np.minimum(((py - self.gy0) / self.cs).astype(np.int64), self.ny - 1)
+        cid = cx * self.ny + cy
+        order = np.argsort(cid, kind="stable")
+        counts = np.bincount(cid, minlength=self.nx * self.ny)
+        start = np.zeros(self.nx * self.ny + 1, dtype=np.int64)
+        np.cumsum(counts, out=start[1:])
+        self.cell_start = start.tolist()
+        self.cell_sites = ids[order].tolist()
+
+    def build_list(self, ids):
+        ncell = self.nx * self.ny
+        cells = [0] * len(ids)
+        counts = [0] * (ncell + 1)
+        for k, i in enumerate(ids):
+            c = self.cell_of(self.xs[i], self.ys[i])
+            cells[k] = c
+            counts[c + 1] = counts[c + 1] + 1
+        for c in range(ncell):
+            counts[c + 1] = counts[c + 1] + counts[c]
+        self.cell_start = counts
+        fill = counts[:-1]
+        self.cell_sites = [0] * len(ids)
+        for k, i in enumerate(ids):
+            c = cells[k]
+            self.cell_sites[fill[c]] = i
+            fill[c] = fill[c] + 1
+
+    def cell_xy(self, x, y):
+        # cell (di-clamp ke grid) yang memuat titik (x, y)
+        cx = int((x - self.gx0) / self.cs) if x > self.gx0 else 0
+        cy = int((y - self.gy0) / self.cs) if y > self.gy0 else 0
+        if cx >= self.nx: cx = self.nx - 1
+        if cy >= self.ny: cy = self.ny - 1
+        return cx, cy
+
+    def cell_of(self, x, y):
+        cx, cy = self.cell_xy(x, y)
+        return cx * self.ny + cy
+
+    def ring(self, cx, cy, k):
+        # index cell pada ring ke-k (jarak Chebyshev k) dari cell (cx, cy)
+        x0 = max(cx - k, 0)
+        x1 = min(cx + k, self.nx - 1)
+        y0 = max(cy - k, 0)
+        y1 = min(cy + k, self.ny - 1)
+        ny = self.ny
+        for i in range(x0, x1 + 1):
+            if i == cx - k or i == cx + k:
+                for j in range(y0, y1 + 1):
+                    yield i * ny + j
+            else:
+                if cy - k >= 0: yield i * ny + cy - k
+                if cy + k < ny: yield i * ny + cy + k
+
+    def max_ring(self, cx, cy):
+        return max(cx, self.nx - 1 - cx, cy, self.ny - 1 - cy)
+
+    def is_empty(self, x, y, r, exclude=()):
+        # True bila tidak ada site (selain exclude) dengan jarak < r dari (x, y)
+        xs = self.xs
+        ys = self.ys
+        start = self.cell_start
+        sites = self.cell_sites
+        cx, cy = self.cell_xy(x, y)
+        last = self.max_ring(cx, cy)
+        k = 0
+        while k <= last:
+            # semua cell di ring k berjarak minimal (k-1)*cs
+            if (k - 1) * self.cs >= r: break
+            for c in self.ring(cx, cy, k):
+                for t in range(start[c], start[c + 1]):
+                    p = sites[t]
+                    if p in exclude: continue
+                    if math.hypot(x - xs[p], y - ys[p]) < r:
+                        return False
+            k = k + 1
+        return True
+
+    def nearest(self, x, y, exclude=()):
+        # site terdekat dari (x, y), return (index, jarak) atau (None, inf)
+        xs = self.xs
+        ys = self.ys
+        start = self.cell_start
+        sites = self.cell_sites
+        cx, cy = self.cell_xy(x, y)
+        last = self.max_ring(cx, cy)
+        best = None
+        bestd = math.inf
+        k = 0
+        while k <= last:
+            if (k - 1) * self.cs >= bestd: break
+            for c in self.ring(cx, cy, k):
+                for t in range(start[c], start[c + 1]):
+                    p = sites[t]
+                    if p in exclude: continue
+                    d = math.hypot(x - xs[p], y - ys[p])
+                    if d < bestd:
+                        best = p
+                        bestd = d
+            k = k + 1
+        return best, bestd
@@ -0,0 +1,94 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Site disimpan sebagai array (N,2) float64, bukan satu Point per site.
+# Sweep hanya memakai index site ke dalam array ini.
+class SiteArray:
+    def __init__(self, coords):
+        if np is not None:
+            self.init_numpy(coords)
+        else:
+            self.init_list(coords)
+
+    def init_numpy(self, coords):
+        if isinstance(coords, (bytes, bytearray, memoryview)):
+            arr = np.frombuffer(coords, dtype=np.float64)
+        else:
+            arr = np.asarray(coords, dtype=np.float64)
+        arr = np.ascontiguousarray(arr.reshape(-1, 2))
+        self.coords = arr
+        self.n = len(arr)
+
+        xs = arr[:, 0]
+        ys = arr[:, 1]
+
+        # bounding box dalam satu pass vectorized
+        if self.n > 0:
+            self.set_bounds(xs.min(), ys.min(), xs.max(), ys.max())
+        else:
+            self.set_bounds(None, None, None, None)
+
+        # urutan lexicographic (x, lalu y)
+        order = np.lexsort((ys, xs))
+
+        # tandai duplikat: sama dengan site sebelumnya dalam urutan sweep
+        dup = np.zeros(self.n, dtype=bool)
+        if self.n > 1:
+            sx = xs[order]
+            sy = ys[order]
+            dup[order[1:]] = (sx[1:] == sx[:-1]) & (sy[1:] == sy[:-1])
+
+        # list python float untuk akses skalar cepat di dalam sweep
+        self.xs = xs.tolist()
+        self.ys = ys.tolist()
+        self.order = order.tolist()
+        self.duplicate = dup.tolist()
+
+    def init_list(self, coords):
+        if isinstance(coords, (bytes, bytearray, memoryview)):
+            flat = memoryview(coords).cast('B').cast('d')
+            coords = [(flat[k], flat[k+1]) for k in range(0, len(flat), 2)]
+        self.coords = None
+        self.xs = [float(c[0]) for c in coords]
+        self.ys = [float(c[1]) for c in coords]
+        self.n = len(self.xs)
+
+        if self.n > 0:
+            self.set_bounds(min(self.xs), min(self.ys), max(self.xs), max(self.ys))
+        else:
+            self.set_bounds(None, None, None, None)
+
+        # dua sort stabil: y dulu, lalu x (tanpa alokasi key list per site)
+        order = sorted(range(self.n), key=self.ys.__getitem__)
+        order.sort(key=self.xs.__getitem__)
+        self.order = order
+
+        xs = self.xs
+        ys = self.ys
+        dup = [False] * self.n
+        for k in range(1, self.n):
+            a = order[k-1]
+            b = order[k]
+            if xs[a] == xs[b] and ys[a] == ys[b]:
+                dup[b] = True
+        self.duplicate = dup
+
+    def set_bounds(self, xmin, ymin, xmax, ymax):
+        # nilai awal sama dengan bounding box default pada Voronoi
+        self.x0 = -50.0
+        self.x1 = -50.0
+        self.y0 = 550.0
+        self.y1 = 550.0
+        if xmin is None: return
+        self.x0 = min(self.x0, float(xmin))
+        self.y0 = min(self.y0, float(ymin))
+        self.x1 = max(self.x1, float(xmax))
+        self.y1 = max(self.y1, float(ymax))
+
+    def __len__(self):
+        return self.n
+
+    def point(self, i):
+        return (self.xs[i], self.ys[i])
@@ -0,0 +1,138 @@
+import time
+
+# Counter dan timer per fase untuk Voronoi, opt-in lewat Voronoi.set_stats.
+# Stats.install membungkus method di instance Voronoi, AVLTree dan
+# EventQueue yang bersangkutan; tanpa stats tidak ada hook sama sekali, jadi
+# sweep biasa tidak membayar apa-apa (class-nya sendiri tidak diubah).
+
+COUNTERS = (
+    "site_events",           # site event yang diproses (tanpa duplikat)
+    "circle_scheduled",      # circle event di-push atau key-nya di-update
+    "circle_invalidated",    # circle event lama dibatalkan (remove atau update)
+    "circle_fired",          # circle event valid yang diproses
+    "circle_stale",          # event invalid yang ter-pop
+    "avl_rotations",         # left_rotate + right_rotate
+    "avl_depth",             # arc terbanyak yang dicek dalam satu locate di beachline
+    "intersection_calls",    # AVLTree.breakpoint_y (juga lewat intersection)
+    "circle_calls",          # Voronoi.circle
+)
+
+TIMERS = ("sweep", "finish_edges", "compute_circles", "get_output") # detik
+
+HELP = {
+    "site_events": "Site events processed",
+    "circle_scheduled": "Circle events pushed or rescheduled",
+    "circle_invalidated": "Circle events cancelled before they fired",
+    "circle_fired": "Valid circle events processed",
+    "circle_stale": "Invalid circle events popped from the queue",
+    "avl_rotations": "AVL rotations in the beachline tree",
+    "avl_depth": "Longest search path of a beachline locate",
+    "intersection_calls": "Breakpoint computations (AVLTree.breakpoint_y)",
+    "circle_calls": "Calls to Voronoi.circle",
+    "queue_peak": "Largest size of the circle event queue",
+}
+
+class Stats:
+    def __init__(self):
+        self.counts = dict.fromkeys(COUNTERS, 0)
+        self.seconds = dict.fromkeys(TIMERS, 0.0)
+        self.queue = None
+        self.depth = 0
+
+    def install(self, vor):
+        counts = self.counts
+        seconds = self.seconds
+        self.queue = vor.event
+
+        def count(obj, name, key):
+            fn = getattr(obj, name)
+            def wrapper(*args):
+                counts[key] += 1
+                return fn(*args)
+            setattr(obj, name, wrapper)
+
+        def timed(obj, name, key):
+            fn = getattr(obj, name)
+            def wrapper(*args):
+                start = time.perf_counter()
+                try:
+                    return fn(*args)
+                finally:
+                    seconds[key] += time.perf_counter() - start
+            setattr(obj, name, wrapper)
+
+        bt = vor.bt
+        if hasattr(bt, "left_rotate"): # hanya AVLTree yang berotasi
+            count(bt, "left_rotate", "avl_rotations")
+            count(bt, "right_rotate", "avl_rotations")
+        count(bt, "breakpoint_y", "intersection_calls")
+        # kedalaman: jumlah arc yang dicek (below) dalam satu locate
+        below = bt.below
+        def visited(*args):
+            self.depth += 1
+            return below(*args)
+        bt.below = visited
+        locate = bt.locate
+        def located(p):
+            self.depth = 0
+            try:
+                return locate(p)
+            finally:
+                if self.depth > counts["avl_depth"]: counts["avl_depth"] = self.depth
+        bt.locate = located
+
+        count(vor, "process_point", "site_events")
+        count(vor, "handle_valid_event", "circle_fired")
+        count(vor, "circle", "circle_calls")
+        timed(vor, "finish_edges", "finish_edges")
+        timed(vor, "compute_circles", "compute_circles")
+        timed(vor, "get_output", "get_output")
+        # sweep = advance, yang dipakai process dan process_iter (tanpa
+        # finish_edges)
+        timed(vor, "advance", "sweep")
+
+        queue = vor.event
+        count(queue, "push", "circle_scheduled")
+        count(queue, "remove", "circle_invalidated")
+        update = queue.update
+        def rescheduled(e, x):
+            counts["circle_invalidated"] += 1
+            if e.index >= 0: counts["circle_scheduled"] += 1 # selain itu lewat push
+            update(e, x)
+        queue.update = rescheduled
+        pop = queue.pop
+        def popped():
+            e = pop()
+            if not e.valid: counts["circle_stale"] += 1
+            return e
+        queue.pop = popped
+
+    def as_dict(self):
+        res = dict(self.counts)
+        res["queue_peak"] = self.queue.peak if self.queue is not None else 0
+        for key, value in self.seconds.items():
+            res[key + "_seconds"] = value
+        return res
+
+    def prometheus(self, prefix="voronoi", labels=None):
+        # format teks Prometheus: counter *_total, gauge untuk kedalaman dan
+        # peak queue, durasi fase sebagai satu metric dengan label phase
+        base = ",".join(f'{k}="{v}"' for k, v in sorted((labels or {}).items()))
+        def tags(extra=""):
+            inner = ",".join(t for t in (base, extra) if t)
+            return "{" + inner + "}" if inner else ""
+        values = self.as_dict()
+        lines = []
+        for key in COUNTERS + ("queue_peak",):
+            gauge = key in ("avl_depth", "queue_peak")
+            name = f"{prefix}_{key}" if gauge else f"{prefix}_{key}_total"
+            lines.append(f"# HELP {name} {HELP[key]}")
+            lines.append(f"# TYPE {name} {'gauge' if gauge else 'counter'}")
+            lines.append(f"{name}{tags()} {values[key]}")
+        name = f"{prefix}_phase_seconds"
+        lines.append(f"# HELP {name} Wall time spent in each phase")
+        lines.append(f"# TYPE {name} gauge")
+        for key in TIMERS:
+            phase = 'phase="' + key + '"'
+            lines.append(f"{name}{tags(phase)} {self.seconds[key]:.9f}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,96 @@
+import sys
+from collections import deque
+
+# Jenis event yang dicatat selama sweep.
+# Setiap record adalah (kind, x, data), x adalah posisi sweep line dan data
+# sebuah tuple berisi nomor arc / index site (tidak ada string di dalam loop).
+SITE = 0                # data: (site,)
+DUPLICATE = 1           # data: (site,)
+CIRCLE_ADDED = 2        # data: (nomor arc, site, site prev, site next, x event)
+CIRCLE_INVALIDATED = 3  # data: (nomor arc, site, site prev, site next)
+ARC_REMOVED = 4         # data: (nomor arc, site, site prev, site next)
+CIRCLE_STALE = 5        # data: (nomor arc, site, site prev, site next)
+FINISH = 6              # data: snapshot beachline, tuple nomor arc
+
+NAMES = {
+    SITE: "site",
+    DUPLICATE: "duplicate",
+    CIRCLE_ADDED: "circle-added",
+    CIRCLE_INVALIDATED: "circle-invalidated",
+    ARC_REMOVED: "arc-removed",
+    CIRCLE_STALE: "circle-stale",
+    FINISH: "finish",
+}
+
+# Sink default, tidak mencatat apa-apa. Voronoi mengecek enabled sebelum
+# membuat data record, jadi tracing yang mati tidak ada biayanya.
+class NullTrace:
+    enabled = False
+
+    def record(self, kind, x, data):
+        pass
+
+    def close(self):
+        pass
+
+# Simpan n record terakhir di memory
+class RingBufferTrace(NullTrace):
+    enabled = True
+
+    def __init__(self, size=4096):
+        self.buffer = deque(maxlen=size)
+
+    def record(self, kind, x, data):
+        self.buffer.append((kind, x, data))
+
+    def events(self):
+        return list(self.buffer)
+
+# Panggil fungsi untuk setiap record: fn(kind, x, data)
+class CallbackTrace(NullTrace):
+    enabled = True
+
+    def __init__(self, fn):
+        self.fn = fn
+
+    def record(self, kind, x, data):
+        self.fn(kind, x, data)
+
+# Tulis record sebagai teks ke file (path atau file object, mis. sys.stdout).
+# Koordinat site diambil dari sites bila diberikan, formatting dilakukan di
+# sini, bukan di dalam sweep.
+class FileTrace(NullTrace):
+    enabled = True
+
+    def __init__(self, f=None, sites=None):
+        if f is None:
+            f = sys.stdout
+        self.owned = isinstance(f, str)
+        self.f = open(f, "w") if self.owned else f
+        self.sites = sites
+
+    def record(self, kind, x, data):
+        self.f.write(self.format(kind, x, data))
+        self.f.write("\n")
+
+    def site(self, i):
+        if self.sites is None: return str(i)
+        return str(round(self.sites.xs[i])) + "," + str(round(self.sites.ys[i]))
+
+    def format(self, kind, x, data):
+        name = NAMES.get(kind, str(kind))
+        if kind == FINISH:
+            return "At x: " + str(round(x)) + " " + name + " " + " ".join(str(n) for n in data)
+        if kind == SITE or kind == DUPLICATE:
+            fields = [self.site(data[0])] + [str(n) for n in data[1:]]
+        elif kind == CIRCLE_ADDED:
+            fields = [str(data[0])] + [self.site(i) for i in data[1:4]] + [str(round(data[4]))]
+        else:
+            fields = [str(data[0])] + [self.site(i) for i in data[1:4]]
+        return "At x: " + str(round(x)) + " " + name + " " + " ".join(fields)
+
+    def close(self):
+        if self.owned:
+            self.f.close()
+        else:
+            self.f.flush()
@@ -0,0 +1,83 @@
+import math
+from array import array
+
+# Index untuk menggambar hanya yang terlihat (Demo). Setiap item (segment
+# atau site, nomor 0, 1, 2, ...) disimpan di satu level; level l memakai cell
+# berukuran cell * 2**l dan item masuk ke cell yang memuat titik tengahnya.
+# Query berjalan dari level kasar ke halus, jadi bisa berhenti di batas
+# jumlah item atau di ukuran minimum (level of detail):
+#  - segment: level = level terkecil yang cell-nya tidak lebih kecil dari
+#    segment, jadi segment pendek ada di level halus dan bisa dilewati
+#    begitu lebih kecil dari satu pixel;
+#  - site: level dari nomor site (setengah site di level 0, seperempat di
+#    level 1, ...), sehingga level kasar berisi sampel yang merata.
+class ViewIndex:
+    def __init__(self, cell):
+        self.cell = float(cell)
+        self.levels = [] # per level: dict (ix, iy) -> list nomor item
+        self.boxes = array('d') # per item: x0, y0, x1, y1
+
+    def add_segment(self, x0, y0, x1, y1):
+        size = max(abs(x1 - x0), abs(y1 - y0))
+        level = 0
+        if size > self.cell:
+            level = math.ceil(math.log2(size / self.cell))
+        return self.add(x0, y0, x1, y1, level)
+
+    def add_point(self, x, y):
+        # jumlah nol di belakang (nomor+1) dalam biner: 0, 1, 0, 2, 0, 1, ...
+        i = len(self.boxes) // 4 + 1
+        level = (i & -i).bit_length() - 1
+        return self.add(x, y, x, y, level)
+
+    def add(self, x0, y0, x1, y1, level):
+        i = len(self.boxes) // 4
+        self.boxes.extend((min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)))
+        while len(self.levels) <= level:
+            self.levels.append({})
+        s = self.cell * 2**level
+        key = (math.floor((x0 + x1) / 2 / s), math.floor((y0 + y1) / 2 / s))
+        cells = self.levels[level]
+        if key in cells:
+            cells[key].append(i)
+        else:
+            cells[key] = [i]
+        return i
+
+    def __len__(self):
+        return len(self.boxes) // 4
+
+    def query(self, x0, y0, x1, y1, min_size=0.0, limit=None):
+        # nomor item yang bbox-nya memotong (x0, y0, x1, y1), yang besar dulu.
+        # Item lebih kecil dari min_size dilewati, paling banyak limit item.
+        # Return (list nomor, True bila semua item di sana sudah masuk)
+        res = []
+        boxes = self.boxes
+        for level in range(len(self.levels) - 1, -1, -1):
+            s = self.cell * 2**level
+            if level > 0 and s < min_size:
+                break # semua item di level ini dan di bawahnya lebih kecil
+            cells = self.levels[level]
+            # titik tengah item paling jauh s/2 dari bbox-nya
+            ix0 = math.floor((x0 - s / 2) / s)
+            ix1 = math.floor((x1 + s / 2) / s)
+            iy0 = math.floor((y0 - s / 2) / s)
+            iy1 = math.floor((y1 + s / 2) / s)
+            if (ix1 - ix0 + 1) * (iy1 - iy0 + 1) <= len(cells):
+                found = (cells.get((ix, iy)) for ix in range(ix0, ix1 + 1) for iy in range(iy0, iy1 + 1))
+            else:
+                found = (ids for (ix, iy), ids in cells.items() if ix0 <= ix <= ix1 and iy0 <= iy <= iy1)
+            for ids in found:
+                if ids is None:
+                    continue
+                for i in ids:
+                    j = 4 * i
+                    bx0 = boxes[j]; by0 = boxes[j + 1]; bx1 = boxes[j + 2]; by1 = boxes[j + 3]
+                    if bx1 < x0 or bx0 > x1 or by1 < y0 or by0 > y1:
+                        continue
+                    if bx1 - bx0 < min_size and by1 - by0 < min_size:
+                        continue
+                    res.append(i)
+                if limit is not None and len(res) >= limit:
+                    return res[:limit], False
+        return res, True
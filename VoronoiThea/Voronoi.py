@@ -1,47 +1,75 @@
+import math, time
 
-import math, heapq
-
-from Components import Point, Event, Arc, Node, Segment
+from Components import Point, Event, Arc, Segment
+from DCEL import DCEL, NONE
 from AVLTree import AVLTree
+from BlockedArray import BlockedArray
+from Sites import SiteArray
+from SiteGrid import SiteGrid
+import EmptyCircle
+from EventQueue import EventQueue
+import Trace
+from Stats import Stats
 
 # Source: (C++) http://www.cs.hmc.edu/~mbrubeck/voronoi.html
 
+# Selain output (list Segment), sweep langsung membangun half-edge di self.dcel:
+# face i adalah cell dari site i, vertex dari circle event dipakai bersama oleh
+# ketiga edge yang bertemu di sana. Breakpoint antara arc a (bawah, aprev) dan
+# arc b (atas, anext) menelusuri half-edge dengan face b searah geraknya,
+# twin-nya milik face a. Saat breakpoint muncul di vertex, half-edge mendapat
+# origin itu; saat hilang, twin yang mendapatkannya. Cell di hull tetap
+# terbuka, face_edge menunjuk ke awal rantainya.
+
+# implementasi beachline (lihat Beachline.py), dipilih dengan nama
+BEACHLINES = {
+    "avl": AVLTree,
+    "blocked": BlockedArray,
+}
+
 class Voronoi:
-    def __init__(self, coords):
+    def __init__(self, coords, beachline="avl"):
         self.output = [] # list line segment
         self.arc = None  # parabola (busur) pertama (lowest)
 
-        self.points = []
-        self.rawpoints = []
-        self.event = [] # circle events
+        self.points = [] # stack index site, urutan sweep terbalik
+        self.event = EventQueue() # circle events
         
-        self.priorpt = None
-        self.node = None
         self.arcno = 0
-        self.curx = None
-        self.verbose = True
+        self.curx = None # posisi sweep line, milik diagram ini (lihat Batch)
+        self.set_trace(Trace.NullTrace())
+        self.stats = None # Stats, lihat set_stats
+        self.finished = None # Segment yang selesai sejak langkah terakhir, hanya di process_iter
         self.firstx = None
         
-        self.bt = AVLTree()
+        # coords: list tuple, atau array/buffer float64 (N,2)
+        self.sites = SiteArray(coords)
+        self.xs = self.sites.xs
+        self.ys = self.sites.ys
+
+        if beachline not in BEACHLINES:
+            raise ValueError(f"unknown beachline {beachline!r}, expected one of {', '.join(BEACHLINES)}")
+        self.bt = BEACHLINES[beachline](self.sites)
+        self.grid = None # SiteGrid, dibangun sekali saat dibutuhkan
+
+        # vertex Voronoi dari circle event: koordinat pusat dan radius lingkaran
+        self.vx = []
+        self.vy = []
+        self.vr = []
+
+        # half-edge structure, face i = cell dari site i (kosong untuk duplikat)
+        # dalam satu kali dari buffer site, bukan new_face per site
+        self.dcel = DCEL()
+        if self.sites.coords is not None:
+            self.dcel.new_faces(self.sites.coords[:, 0], self.sites.coords[:, 1])
+        else:
+            self.dcel.new_faces(self.xs, self.ys)
         
         # bounding box
-        self.x0 = -50.0
-        self.x1 = -50.0
-        self.y0 = 550.0
-        self.y1 = 550.0
-
-        # masukan points ke site event
-        for pts in coords:
-            point = Point(pts[0], pts[1])
-            
-            # hapus point duplikat
-            self.rawpoints.append(point)
-            
-            # keep track of bounding box size
-            if point.x < self.x0: self.x0 = point.x
-            if point.y < self.y0: self.y0 = point.y
-            if point.x > self.x1: self.x1 = point.x
-            if point.y > self.y1: self.y1 = point.y
+        self.x0 = self.sites.x0
+        self.x1 = self.sites.x1
+        self.y0 = self.sites.y0
+        self.y1 = self.sites.y1
 
         # tambah margins ke bounding box
         dx = (self.x1 - self.x0 + 1) / 5.0
@@ -51,77 +79,145 @@ class Voronoi:
         self.y0 = self.y0 - dy
         self.y1 = self.y1 + dy
 
-        self.points = sorted(self.rawpoints,key = lambda p:[p.x,p.y], reverse = True)
+        self.points = self.sites.order[::-1]
         
     def process(self):
-        root = None
         self.arcno = 0
-        while len(self.points) > 0:
-            
-            if len(self.event) > 0: _, e = self.event[0]
-            else: e = None
-            
-            if e is not None and (e.x <= self.points[len(self.points)-1].x):
-                root = self.process_event(root) # handle circle event
-            else:
-                if self.priorpt is None or self.points[len(self.points)-1].x != self.priorpt.x or self.points[len(self.points)-1].y != self.priorpt.y: 
-                    self.priorpt = self.points[len(self.points)-1]
-                    root = self.process_point(root) # handle site event
-                else:
-                    print("Removing duplicate")
-                    self.points.pop()
-                    
-
-        # setelah semua point diproses, proses sisa circle events
-        while len(self.event) > 0:
-            root = self.process_event(root)
-
+        self.advance(None, None)
         self.finish_edges()
 
-        if not self.verbose:
-            print("Convex hull at end:")
-            arc = self.arc
-            string = " "
-            while arc is not None:
-                string = string + str(arc.number) + " "
-                arc = arc.anext
-            print(string)
+        if self.tracing:
+            self.trace.record(Trace.FINISH, self.curx, tuple(self.snapshot()))
 
-        
+    def process_iter(self, events=None, seconds=None):
+        # sweep yang bisa dilanjutkan: setiap langkah memproses paling banyak
+        # events event dan/atau berhenti setelah seconds detik, lalu yield
+        # (x, segments), posisi sweep line dan list Segment yang selesai di
+        # langkah itu. Langkah terakhir juga menjalankan finish_edges, jadi
+        # setiap segment dilaporkan tepat satu kali.
+        self.arcno = 0
+        self.finished = []
+        clock = time.perf_counter
+        while True:
+            deadline = clock() + seconds if seconds is not None else None
+            done = self.advance(events, deadline)
+            if done:
+                self.finish_edges()
+                if self.tracing:
+                    self.trace.record(Trace.FINISH, self.curx, tuple(self.snapshot()))
+            finished = self.finished
+            self.finished = None if done else []
+            yield self.curx, finished
+            if done:
+                return
+
+    def advance(self, events, deadline):
+        # proses site dan circle event berurutan sampai habis, sampai events
+        # event (None: tanpa batas) atau sampai perf_counter melewati deadline.
+        # Return True bila tidak ada event tersisa.
+        xs = self.xs
+        duplicate = self.sites.duplicate
+        points = self.points
+        queue = self.event
+        clock = time.perf_counter
+        while True:
+            if points:
+                e = queue.peek()
+                if e is not None and (e.x <= xs[points[-1]]):
+                    self.process_event() # handle circle event
+                elif not duplicate[points[-1]]:
+                    self.process_point() # handle site event
+                else:
+                    if self.tracing: self.trace.record(Trace.DUPLICATE, self.curx, (points[-1],))
+                    points.pop()
+                    continue
+            elif len(queue) > 0:
+                # setelah semua point diproses, proses sisa circle events
+                self.process_event()
+            else:
+                return True
+            if events is not None:
+                events -= 1
+                if events <= 0:
+                    return not points and len(queue) == 0
+            if deadline is not None and clock() >= deadline:
+                return not points and len(queue) == 0
+
+    def set_trace(self, trace):
+        # trace: sink dari modul Trace (NullTrace, RingBufferTrace, FileTrace, CallbackTrace)
+        self.trace = trace
+        self.tracing = trace.enabled
+
+    def set_stats(self, stats=None):
+        # pasang counter dan timer (Stats) di instance ini, sebelum process();
+        # tanpa pemanggilan ini sweep tidak punya hook sama sekali
+        if stats is None:
+            stats = Stats()
+        stats.install(self)
+        self.stats = stats
+        return stats
+
+    def snapshot(self):
+        # nomor arc pada beachline dari bawah ke atas, hanya dipanggil bila diminta
+        res = []
+        arc = self.arc
+        while arc is not None:
+            res.append(arc.number)
+            arc = arc.anext
+        return res
 
-    def process_point(self, root):
+    def process_point(self):
         # dapatkan next event dari site pq
         p = self.points.pop()
-        self.curx = p.x
-        print("Adding p:",round(p.x),round(p.y))
+        self.curx = self.xs[p]
+        if self.tracing: self.trace.record(Trace.SITE, self.curx, (p,))
         
         # tambah arc baru (parabola)
-        root = self.arc_insert(root, p)
-        return root
+        self.arc_insert(p)
 
-    def process_event(self, root):
+    def process_event(self):
         # dapatkan next event dari circle pq
-        _, e = heapq.heappop(self.event)
+        e = self.event.pop()
         self.curx = e.x
         if e.valid:
-            self.handle_valid_event(e, root)
-            return root
+            self.handle_valid_event(e)
         else:
             a = e.a
-            if self.verbose: print("At x:",round(e.x),"Ignoring: ",round(a.p.y),int(e.pprev.y),int(e.pnext.y))
-        return root
+            if self.tracing: self.trace.record(Trace.CIRCLE_STALE, e.x, (a.number, a.p, e.pprev, e.pnext))
     
-    def handle_valid_event(self, e, root):
+    def handle_valid_event(self, e):
         a = e.a
-        if self.verbose: print("At x:",round(e.x),"Removing: ",e.a.number,round(a.p.y),int(e.pprev.y),int(e.pnext.y))
+        if self.tracing: self.trace.record(Trace.ARC_REMOVED, e.x, (a.number, a.p, e.pprev, e.pnext))
 
-        root = self.bt.delete_node(root, e)
+        self.bt.remove(a)
                     
         # buat edge baru
         s = Segment(e.p)
-        s.sites = [a.aprev.p, a.p, a.anext.p]  # simpan ketiga site
+        s.sites = (a.aprev.p, a.p, a.anext.p)  # simpan ketiga site
+        s.empty = True # vertex dari circle event valid, lingkarannya kosong
         self.output.append(s)
 
+        self.vx.append(e.p.x)
+        self.vy.append(e.p.y)
+        self.vr.append(math.hypot(e.p.x - self.xs[a.p], e.p.y - self.ys[a.p]))
+
+        # vertex bersama untuk ketiga edge: breakpoint (aprev, a) dan (a, anext)
+        # berakhir di sini, breakpoint baru (aprev, anext) mulai dari sini
+        D = self.dcel
+        e1 = a.s0.edge # face: a
+        e2 = a.s1.edge # face: anext
+        v = D.new_vertex(e.p.x, e.p.y)
+        e3 = D.new_edge(a.anext.p, a.aprev.p)
+        s.edge = e3
+        D.vertex_edge[v] = e3
+        twin = D.half_twin
+        D.half_origin[twin[e1]] = v
+        D.half_origin[twin[e2]] = v
+        D.half_origin[e3] = v
+        D.link(e1, twin[e2])
+        D.link(e2, e3)
+        D.link(twin[e3], twin[e1])
+
         # hapus associated arc (parabola)
         if a.aprev != None:
             a.aprev.anext = a.anext
@@ -133,39 +229,26 @@ class Voronoi:
         # selesaikan edges sebelum dan sesudah a
         if a.s0 != None: a.s0.finish(e.p)
         if a.s1 != None: a.s1.finish(e.p)
+        if self.finished is not None:
+            if a.s0 != None: self.finished.append(a.s0)
+            if a.s1 != None: self.finished.append(a.s1)
 
         # cek ulang circle events di setiap sisi p
         if a.aprev != None: self.check_circle_event(a.aprev)
         if a.anext != None: self.check_circle_event(a.anext)
 
-        if self.verbose:
-            arc = self.arc
-            string = "Del "
-            while arc is not None:
-                string = string + str(arc.number) + " "
-                arc = arc.anext
-            print(string)
-
-    def arc_insert(self, root, p):
+    def arc_insert(self, p):
         if self.arc == None:
             self.arc = Arc(p)
             self.arcno = self.arcno+1
             self.arc.number = self.arcno
-            root = Node(p)
-            root.arc = self.arc
-            self.firstx = p.x
+            self.bt.insert_first(self.arc)
+            self.firstx = self.xs[p]
         else:
             # cari arcs di p.y
-            self.bt.nodea = None            
-            root = self.bt.insert_node(root, p)
-
-            if self.verbose:
-                print("BT start:",self.bt.basen.arc.number, \
-                      round(self.bt.basen.arc.p.y))
-            
-            i = self.bt.basen.arc
+            i = self.bt.locate(p)
             
-            if p.x != self.firstx:
+            if self.xs[p] != self.firstx:
                 flag, z = self.intersect(p, i)
                 if flag:    # true bila parabola baru memotong arc i
 
@@ -193,24 +276,20 @@ class Voronoi:
                     self.arcno = self.arcno+1
                     i.anext.number = self.arcno
 
-                    i.node = self.bt.nodea
-                    self.bt.nodea.arc = i
-                    
-                    root = self.bt.insert_node(root, p)
-
-                    i.anext.node = self.bt.nodeb
-                    self.bt.nodeb.p = i.anext.p
-                    self.bt.nodeb.arc = i.anext
-                    
+                    self.bt.split(i.aprev, i, i.anext)
 
                     # tambah half-edges baru yang connected ke endpoint-endpoint i
+                    # kedua breakpoint menelusuri edge yang sama, berlawanan arah
+                    edge = self.dcel.new_edge(p, i.aprev.p)
                     seg = Segment(z)
-                    seg.sites = [i.aprev.p, i.p, p]  # simpan sites untuk left segment
+                    seg.sites = (i.aprev.p, i.p, p)  # simpan sites untuk left segment
+                    seg.edge = edge
                     self.output.append(seg)
                     i.aprev.s1 = i.s0 = seg
 
                     seg = Segment(z)
-                    seg.sites = [i.p, p, i.anext.p]
+                    seg.sites = (i.p, p, i.anext.p)
+                    seg.edge = self.dcel.half_twin[edge]
                     self.output.append(seg)
                     i.anext.s0 = i.s1 = seg
 
@@ -218,87 +297,81 @@ class Voronoi:
                     self.check_circle_event(i)
                     self.check_circle_event(i.aprev)
                     self.check_circle_event(i.anext)
-
-                    if self.verbose:
-                        arc = self.arc
-                        string = "Ins "
-                        while arc is not None:
-                            string = string + str(arc.number) + " "
-                            arc = arc.anext
-                        print(string)
                     
-                    return root
+                    return
 
             # bila p adalah titik berikutnya pada sweep line, mulai
             else:
                 i.anext = Arc(p, i)
                 self.arcno = self.arcno+1
                 i.anext.number = self.arcno
-                i.anext.node = self.bt.nodea
-                self.bt.nodea.arc = i.anext
+                self.bt.insert_after(i, i.anext)
             
                 # masukan segment baru di antara p and i
                 # point awal mulai pada x0
                 x = self.x0
-                y = (i.anext.p.y + i.p.y) / 2.0
+                y = (self.ys[i.anext.p] + self.ys[i.p]) / 2.0
                 start = Point(x, y)
 
                 seg = Segment(start)
+                seg.edge = self.dcel.new_edge(p, i.p)
+                self.dcel.half_origin[seg.edge] = self.dcel.new_vertex(x, y)
                 i.s1 = i.anext.s0 = seg
                 self.output.append(seg)
-
-
-                if self.verbose:
-                    arc = self.arc
-                    string = "Ins "
-                    while arc is not None:
-                        string = string + str(arc.number) + " "
-                        arc = arc.anext
-                    print(string)
-
-        return root
             
 
     def check_circle_event(self, i):
         # cari circle event baru untuk arc i
 
-        # invalidate event sebelumnya yang direference dalam arc
-        if (i.e != None): 
-            i.e.valid = False
-            
-            if self.verbose: print("At x:",round(self.curx),"Invalid: ", \
-                i.number,round(i.p.y),round(i.e.pprev.y),round(i.e.pnext.y))
-            
-        # reset reference pada event dalam arc
-        i.e = None
-
-        if (i.aprev == None) or (i.anext == None): return
+        # event sebelumnya yang direference dalam arc
+        old = i.e
+        if (old != None) and self.tracing:
+            self.trace.record(Trace.CIRCLE_INVALIDATED, self.curx, (i.number, i.p, old.pprev, old.pnext))
 
         # buat event baru bila memungkinkan dari arc dan selanjutnya dan sebelumnya
         # pastikan x terdefinisi
-        flag, x, o = self.circle(i.aprev.p, i.p, i.anext.p)
-        if flag:
+        flag = False
+        if (i.aprev != None) and (i.anext != None):
+            flag, x, o = self.circle(i.aprev.p, i.p, i.anext.p)
+
+        if not flag:
+            # hapus event lama dari queue
+            if (old != None):
+                old.valid = False
+                self.event.remove(old)
+            i.e = None
+            return
+
+        if self.tracing: self.trace.record(Trace.CIRCLE_ADDED, self.curx, (i.number, i.p, i.aprev.p, i.anext.p, x))
+        if (old != None):
+            # pakai ulang event lama, cukup update key di queue
+            old.p = o
+            old.pprev = i.aprev.p
+            old.pnext = i.anext.p
+            self.event.update(old, x)
+        else:
             i.e = Event(x, o, i)
             i.e.pprev = i.aprev.p
             i.e.pnext = i.anext.p
-            if self.verbose: print("At x:", round(self.curx),\
-                                   "Adding c:",round(x),";",round(i.p.y),\
-                                   round(i.aprev.p.y),round(i.anext.p.y))
-            entry = [i.e.x,i.e]
-            heapq.heappush(self.event,entry)
+            self.event.push(i.e)
 
     def circle(self, a, b, c):
+        # a, b, c adalah index site
+        ax = self.xs[a]; ay = self.ys[a]
+        bx = self.xs[b]; by = self.ys[b]
+        cx = self.xs[c]; cy = self.ys[c]
+
         # cek apakah bc sebuah "right turn" dari ab
-        if ((b.x - a.x)*(c.y - a.y) - (c.x - a.x)*(b.y - a.y)) > 0: return False, None, None
+        if ((bx - ax)*(cy - ay) - (cx - ax)*(by - ay)) > 0: return False, None, None
 
         # Joseph O'Rourke, Computational Geometry in C (2nd ed.) p.189
-        A = b.x - a.x
-        B = b.y - a.y
-        C = c.x - a.x
-        D = c.y - a.y
-        E = A*(a.x + b.x) + B*(a.y + b.y)
-        F = C*(a.x + c.x) + D*(a.y + c.y)
-        G = 2*(A*(c.y - b.y) - B*(c.x - b.x))
+        A = bx - ax
+        B = by - ay
+        C = cx - ax
+        D = cy - ay
+        E = A*(ax + bx) + B*(ay + by)
+        F = C*(ax + cx) + D*(ay + cy)
+        G = 2*(A*(cy - by) - B*(cx - bx))
 
         if (G == 0): return False, None, None # point-point adalah co-linear
 
@@ -307,7 +380,7 @@ class Voronoi:
         oy = 1.0 * (A*F - C*E) / G
 
         # o.x plus radius sama dengan max x coord
-        x = ox + math.sqrt((a.x-ox)**2 + (a.y-oy)**2)
+        x = ox + math.sqrt((ax-ox)**2 + (ay-oy)**2)
         o = Point(ox, oy)
            
         return True, x, o
@@ -319,11 +392,17 @@ class Voronoi:
                 # vextex ada pada intersection dari edges
                 circle = self.create_circle_from_segment(seg)
                 
-                # cek apakah lingkaran kosong 
-                if circle and self.is_circle_empty(circle, seg.sites):
+                # cek apakah lingkaran kosong, kecuali sudah dipastikan oleh sweep
+                if circle and (seg.empty or self.is_circle_empty(circle, seg.sites)):
                     circles.append(circle)
         return circles
 
+    def site_grid(self):
+        # spatial index untuk site (tanpa duplikat), dibangun sekali per diagram
+        if self.grid is None:
+            self.grid = SiteGrid(self.sites, self.sites.duplicate)
+        return self.grid
+
     def create_circle_from_segment(self, seg):
         sites = seg.sites
         if len(sites) >= 3:
@@ -331,31 +410,29 @@ class Voronoi:
         return None
 
     def circumcircle(self, a, b, c):
-        # compute circumcircle dari tiga point a, b, c
+        # compute circumcircle dari tiga site (index) a, b, c
         # return tuple (center_point, radius)
         # pakai formula untuk circumcircle
-        d = 2 * (a.x * (b.y - c.y) + b.x * (c.y - a.y) + c.x * (a.y - b.y))
+        ax = self.xs[a]; ay = self.ys[a]
+        bx = self.xs[b]; by = self.ys[b]
+        cx = self.xs[c]; cy = self.ys[c]
+        d = 2 * (ax * (by - cy) + bx * (cy - ay) + cx * (ay - by))
         if d == 0:
             return None  # point-point adalah colinear
-        ux = ((a.x**2 + a.y**2) * (b.y - c.y) +
-            (b.x**2 + b.y**2) * (c.y - a.y) +
-            (c.x**2 + c.y**2) * (a.y - b.y)) / d
-        uy = ((a.x**2 + a.y**2) * (c.x - b.x) +
-            (b.x**2 + b.y**2) * (a.x - c.x) +
-            (c.x**2 + c.y**2) * (b.x - a.x)) / d
+        ux = ((ax**2 + ay**2) * (by - cy) +
+            (bx**2 + by**2) * (cy - ay) +
+            (cx**2 + cy**2) * (ay - by)) / d
+        uy = ((ax**2 + ay**2) * (cx - bx) +
+            (bx**2 + by**2) * (ax - cx) +
+            (cx**2 + cy**2) * (bx - ax)) / d
         center = Point(ux, uy)
-        radius = math.hypot(center.x - a.x, center.y - a.y)
+        radius = math.hypot(center.x - ax, center.y - ay)
         return (center, radius)
 
     def is_circle_empty(self, circle, sites):
         center, radius = circle
-        for p in self.rawpoints:
-            if p in sites:
-                continue  # skip site-site yang mendefinisikan lingkaran
-            dist = math.hypot(center.x - p.x, center.y - p.y)
-            if dist < radius:
-                return False  # site ada di dalam lingkaran
-        return True
+        # skip site-site yang mendefinisikan lingkaran
+        return self.site_grid().is_empty(center.x, center.y, radius, sites)
 
     def get_largest_empty_circles(self):
         circles = self.compute_circles()
@@ -367,37 +444,116 @@ class Voronoi:
         largest_circles = [circle for circle in circles if circle[1] == max_radius]
         return largest_circles
 
+    def largest_empty_circles(self, k=1, polygon=None):
+        # top-k lingkaran kosong terbesar dengan pusat di dalam convex hull site,
+        # atau di dalam polygon (list (x, y)) bila diberikan
+        return EmptyCircle.largest_empty_circles(self, k, polygon)
 
 
     def intersect(self, p, i):
         # cek apakah parabola baru pada point p berpotongan dengan arc i
         if (i is None): return False, None
-        if (i.p.x == p.x): return False, None
+        px = self.xs[p]
+        py = self.ys[p]
+        ix = self.xs[i.p]
+        iy = self.ys[i.p]
+        if (ix == px): return False, None
 
         a = 0.0
         b = 0.0
 
         if i.aprev is not None:
-            a = (self.bt.intersection(i.aprev.p, i.p, 1.0*p.x)).y
+            a = self.bt.next_breakpoint(i.aprev, 1.0*px)
         if i.anext is not None:
-            b = (self.bt.intersection(i.p, i.anext.p, 1.0*p.x)).y
+            b = self.bt.next_breakpoint(i, 1.0*px)
 
-        if (((i.aprev is None) or (a <= p.y)) and ((i.anext is None) or (p.y <= b))):
-            py = p.y
-            px = 1.0 * ((i.p.x)**2 + (i.p.y-py)**2 - p.x**2) / (2*i.p.x - 2*p.x)
-            res = Point(px, py)
+        if (((i.aprev is None) or (a <= py)) and ((i.anext is None) or (py <= b))):
+            rx = 1.0 * (ix**2 + (iy-py)**2 - px**2) / (2*ix - 2*px)
+            res = Point(rx, py)
             return True, res
         return False, None
     
     def finish_edges(self):
-        l = self.x1 + (self.x1 - self.x0) + (self.y1 - self.y0)
+        # edge yang masih terbuka adalah ray dari start segment-nya sepanjang
+        # bisector kedua site; ujung jauhnya dipotong di bounding box site dan
+        # vertex, seperti bound_edges di VoronoiFortune. Breakpoint pada sweep
+        # yang jauh sekali (curx + lebar box) kehilangan presisi.
         i = self.arc
+        if i is None: # tanpa site tidak ada beachline
+            return
+        D = self.dcel
+        xs = self.xs
+        ys = self.ys
+        x0, y0, x1, y1 = self.clip_box(i)
         while i.anext is not None:
             if i.s1 is not None:
-                p = self.bt.intersection(i.p, i.anext.p, l*2.0)
+                # arah breakpoint arc i (bawah) dan i.anext (atas) saat sweep maju
+                dx = ys[i.anext.p] - ys[i.p]
+                dy = xs[i.p] - xs[i.anext.p]
+                x = i.s1.start.x
+                y = i.s1.start.y
+                t = math.inf
+                if dx > 0: t = min(t, (x1 - x) / dx)
+                elif dx < 0: t = min(t, (x0 - x) / dx)
+                if dy > 0: t = min(t, (y1 - y) / dy)
+                elif dy < 0: t = min(t, (y0 - y) / dy)
+                p = Point(x + t*dx, y + t*dy)
                 i.s1.finish(p)
+                if self.finished is not None: self.finished.append(i.s1)
+                # edge tak terbatas: ujung jauh jadi origin twin, yang juga
+                # awal rantai cell yang terbuka
+                h = D.half_twin[i.s1.edge]
+                D.half_origin[h] = D.new_vertex(p.x, p.y)
+                D.face_edge[D.half_face[h]] = h
             i = i.anext
 
+    def clip_box(self, arc):
+        # bounding box site, semua vertex dan start segment yang terbuka di
+        # beachline mulai dari arc, dengan margin yang sama seperti di
+        # __init__; setiap ray keluar lewat margin, tidak ada yang panjangnya 0
+        vx = self.dcel.vertex_x
+        vy = self.dcel.vertex_y
+        x0 = self.sites.x0
+        x1 = self.sites.x1
+        y0 = self.sites.y0
+        y1 = self.sites.y1
+        if len(vx):
+            x0 = min(x0, min(vx))
+            x1 = max(x1, max(vx))
+            y0 = min(y0, min(vy))
+            y1 = max(y1, max(vy))
+        while arc.anext is not None:
+            if arc.s1 is not None:
+                start = arc.s1.start
+                x0 = min(x0, start.x)
+                x1 = max(x1, start.x)
+                y0 = min(y0, start.y)
+                y1 = max(y1, start.y)
+            arc = arc.anext
+        dx = (x1 - x0 + 1) / 5.0
+        dy = (y1 - y0 + 1) / 5.0
+        return x0 - dx, y0 - dy, x1 + dx, y1 + dy
+
+    def cell(self, i):
+        # vertex (x, y) di sekeliling cell site i, counter-clockwise
+        # cell di hull terbuka, diakhiri ujung jauh dari edge terakhirnya
+        D = self.dcel
+        origin = D.half_origin
+        res = []
+        h = NONE
+        for h in D.face_boundary(i):
+            res.append((D.vertex_x[origin[h]], D.vertex_y[origin[h]]))
+        if h != NONE and D.half_next[h] == NONE:
+            v = origin[D.half_twin[h]]
+            res.append((D.vertex_x[v], D.vertex_y[v]))
+        return res
+
+    def neighbours(self, i):
+        # index site yang cell-nya berbatasan dengan cell site i
+        D = self.dcel
+        twin = D.half_twin
+        return [D.half_face[twin[h]] for h in D.face_boundary(i)]
+
     def print_output(self):
         it = 0
         for o in self.output:
@@ -0,0 +1,222 @@
+import random, sys, time
+
+from AVLTree import AVLTree
+from Components import Event, Node, Point
+from Voronoi import Voronoi
+
+# Biaya per event (site + circle event) dari sweep dengan AVLTree sekarang
+# (iteratif, parent pointer, delete O(1) lewat arc.node) dibanding versi
+# rekursif sebelumnya, yang disalin di LegacyAVLTree di bawah. Kedua tree
+# dipakai oleh Voronoi yang sama dan pada site acak di bawah (tanpa site tepat
+# di breakpoint) menghasilkan output yang sama.
+# Untuk membandingkan BlockedArray, lihat benchmarks (--beachline).
+# 10^6 site butuh beberapa menit per tree.
+#
+#     python bench_avl.py [n] [repeat]
+
+ORIGIN = Point(0, 0)
+
+class LegacyAVLTree(AVLTree):
+    # insert dan delete rekursif: subtree dikembalikan lewat call stack dan
+    # di-rebalance saat unwind, delete mencari arc dari root. Interface
+    # beachline dipetakan ke protokol lama: locate sudah menyisipkan node
+    # (nodea) yang nanti diisi oleh insert_after atau split.
+
+    def __init__(self, sites):
+        super().__init__(sites)
+        self.basen = None
+        self.nodea = None
+        self.nodeb = None
+        self.pp = None
+        self.pn = None
+
+    def bounds(self, arc, X):
+        # y breakpoint dengan arc sebelumnya dan berikutnya pada sweep X,
+        # None bila tidak ada
+        if arc.number != 1 and arc.aprev is None and arc.anext is None:
+            y = self.ys[arc.p]
+            return y, y
+        pn = self.next_breakpoint(arc, X) if arc.anext is not None else None
+        pp = self.next_breakpoint(arc.aprev, X) if arc.aprev is not None else None
+        return pp, pn
+
+    def chkpt(self, n, X):
+        if n.arc is None:
+            self.pp = self.pn = None
+        else:
+            self.pp, self.pn = self.bounds(n.arc, X)
+
+    def should_go_left(self, root, p):
+        pp = self.pp
+        return (pp is not None and self.ys[p] < pp) and (root.left is not None)
+
+    def should_go_right(self, root, p):
+        pp = self.pp
+        pn = self.pn
+        px = self.xs[p]
+        py = self.ys[p]
+        return (root.right is not None and (self.xs[root.arc.p] == px and self.ys[root.arc.p] != py or not ( (pp is None and pn is None) 
+                or (pp is not None and pn is not None and pn == pp)
+                or (pn is None and pp is not None and py > pp)
+                or (pp is None and pn is not None and py < pn) 
+                or (pn is not None and pp is not None and py < pn and pp < py))))
+
+    def locate(self, p):
+        self.nodea = None
+        self.root = self.insert_node(self.root, p)
+        return self.basen.arc
+
+    def insert_after(self, arc, new):
+        self.nodea.arc = new
+        new.node = self.nodea
+
+    def split(self, arc, mid, right):
+        self.insert_after(arc, mid)
+        self.root = self.insert_node(self.root, mid.p)
+        self.nodeb.p = right.p
+        self.nodeb.arc = right
+        right.node = self.nodeb
+
+    def remove(self, arc):
+        self.root = self.delete_node(self.root, arc.e)
+
+    def insert_node(self, root, p):
+        if not root:
+            return root
+
+        self.chkpt(root,self.xs[p])
+
+        if self.should_go_left(root, p):
+            root.left = self.insert_node(root.left, p)
+        elif self.should_go_right(root, p):
+            root.right = self.insert_node(root.right, p)
+        else:
+            self.insert_node_at_base(root, p)
+
+        root.height = 1 + max(self.get_height(root.left), self.get_height(root.right))
+        balance_factor = self.get_balance(root)
+
+        if balance_factor > 1:
+            if self.get_balance(root.left) >= 0:
+                return self.right_rotate(root)
+            else:
+                root.left = self.left_rotate(root.left)
+                return self.right_rotate(root)
+        if balance_factor < -1:
+            if self.get_balance(root.right) <= 0:
+                return self.left_rotate(root)
+            else:
+                root.right = self.right_rotate(root.right)
+                return self.left_rotate(root)
+
+        return root
+
+    def insert_node_at_base(self, root, p):
+        self.basen = root
+        n = Node(p)
+        if self.nodea is None:
+            self.nodea = n
+        else:
+            self.nodeb = n
+        if root.right is None:
+            root.right = n
+        else:
+            self.get_min_value_node(root.right).left = n
+        root.height = 1 + max(self.get_height(root.left), self.get_height(root.right))
+        return n
+
+    def delete_node(self, root, e):
+        if not root:
+            return None
+
+        py = e.p.y
+        self.chkpt(root,e.x)
+
+        if root.arc.aprev is not None and (root.arc.number != e.a.number) and (py <= self.pp) or root.arc.aprev.number == e.a.number:
+            root.left = self.delete_node(root.left, e)
+        elif root.arc.number != e.a.number:
+            root.right = self.delete_node(root.right, e)
+        else:
+            if root.left is None:
+                return root.right
+            elif root.right is None:
+                return root.left
+
+            temp = self.get_min_value_node(root.right)
+            root.p = temp.p
+            root.arc = temp.arc
+
+            self.chkpt(temp,e.x)
+            if self.pn is None:
+                self.pp = self.pn = 2*self.pp
+            et = Event(e.x, ORIGIN, temp.arc)
+
+            root.right = self.delete_node(root.right, et)
+            root.height = 1 + max(self.get_height(root.left), self.get_height(root.right))
+
+        return root
+
+    def left_rotate(self, z):
+        y = z.right
+        z.right = y.left
+        y.left = z
+        z.height = 1 + max(self.get_height(z.left), self.get_height(z.right))
+        y.height = 1 + max(self.get_height(y.left), self.get_height(y.right))
+        return y
+
+    def right_rotate(self, z):
+        y = z.left
+        z.left = y.right
+        y.right = z
+        z.height = 1 + max(self.get_height(z.left), self.get_height(z.right))
+        y.height = 1 + max(self.get_height(y.left), self.get_height(y.right))
+        return y
+
+    def get_min_value_node(self, root):
+        if root is None or root.left is None:
+            return root
+        return self.get_min_value_node(root.left)
+
+def sweep(points, tree):
+    v = Voronoi(points)
+    if tree is not AVLTree:
+        v.bt = tree(v.sites)
+    fired = 0
+    t = time.perf_counter()
+    handle = v.handle_valid_event
+    def counted(e):
+        nonlocal fired
+        fired += 1
+        handle(e)
+    v.handle_valid_event = counted
+    v.process()
+    return time.perf_counter() - t, len(points) + fired, v
+
+if __name__ == '__main__':
+    n = int(float(sys.argv[1])) if len(sys.argv) > 1 else 1000000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    random.seed(1)
+    points = [(random.uniform(0, 700), random.uniform(0, 600)) for _ in range(n)]
+
+    best = {}
+    failed = {}
+    for _ in range(repeat):
+        # bergantian, supaya noise mesin kena kedua tree
+        for name, tree in (("recursive", LegacyAVLTree), ("iterative", AVLTree)):
+            if name in failed: continue
+            try:
+                elapsed, events, v = sweep(points, tree)
+            except (ValueError, ZeroDivisionError, AttributeError) as e:
+                # delete rekursif mencari arc lewat breakpoint, yang bisa
+                # gagal pada breakpoint hampir degenerate
+                failed[name] = repr(e)
+                continue
+            if name not in best or elapsed < best[name][0]:
+                best[name] = (elapsed, events, len(v.output))
+    print(f"{n} sites")
+    for name, (elapsed, events, segments) in best.items():
+        print(f"  {name:9} {elapsed:8.2f} s  {events} events  {1e6 * elapsed / events:6.2f} us/event  {segments} segments")
+    for name, error in failed.items():
+        print(f"  {name:9} failed: {error}")
+    if len(best) == 2:
+        print(f"  speedup   {best['recursive'][0] / best['iterative'][0]:8.2f}x")
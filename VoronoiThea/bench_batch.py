@@ -0,0 +1,31 @@
+import os, random, sys, time
+
+from Batch import compute, compute_many, free_threaded
+
+# k diagram lepas dengan n site: satu per satu dibanding compute_many dengan
+# thread pool dan process pool. Thread pool hanya lebih cepat pada build
+# free-threaded; dengan GIL hasilnya mendekati serial.
+#
+#     python bench_batch.py [k] [n] [workers]
+
+def segments(v):
+    return len(v.output)
+
+if __name__ == '__main__':
+    k = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    n = int(float(sys.argv[2])) if len(sys.argv) > 2 else 20000
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    rng = random.Random(1)
+    sets = [[(rng.uniform(0, 700), rng.uniform(0, 600)) for _ in range(n)] for _ in range(k)]
+    print(f"{k} diagrams of {n} sites, {os.cpu_count()} cpus, free-threaded: {free_threaded()}")
+
+    t = time.perf_counter()
+    expected = [compute(coords, result=segments) for coords in sets]
+    serial = time.perf_counter() - t
+    print(f"  serial   {serial:8.2f} s")
+    for pool in ("thread", "process"):
+        t = time.perf_counter()
+        res = compute_many(sets, workers, pool=pool, result=segments)
+        elapsed = time.perf_counter() - t
+        assert res == expected
+        print(f"  {pool:8} {elapsed:8.2f} s  {serial / elapsed:5.2f}x")
@@ -0,0 +1,37 @@
+import random, sys, time, tracemalloc
+
+from Voronoi import Voronoi
+
+# Memori per site untuk satu run Voronoi (konstruksi + process), diukur dengan
+# tracemalloc: yang tersisa setelah selesai (output, dcel, event, beachline)
+# dan puncaknya selama sweep. Exit code 1 bila puncak melewati BUDGET, jadi
+# bisa dipakai sebagai cek regresi. tracemalloc memperlambat sweep beberapa
+# kali lipat; 10^5 site butuh beberapa menit.
+#
+#     python bench_memory.py [n]
+
+BUDGET = 1600 # byte per site, puncak
+
+def measure(points):
+    tracemalloc.start()
+    v = Voronoi(points)
+    v.process()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return v, current, peak
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    random.seed(1)
+    points = [(random.uniform(0, 700), random.uniform(0, 600)) for _ in range(n)]
+
+    t = time.perf_counter()
+    v, current, peak = measure(points)
+    elapsed = time.perf_counter() - t
+
+    print(f"{n} sites, {len(v.output)} segments, {len(v.vx)} vertices ({elapsed:.1f} s with tracemalloc)")
+    print(f"  retained {current / n:8.1f} bytes/site")
+    print(f"  peak     {peak / n:8.1f} bytes/site (budget {BUDGET})")
+    if peak > BUDGET * n:
+        print("  OVER BUDGET")
+        sys.exit(1)
@@ -0,0 +1,61 @@
+import random, sys, time
+import tkinter as tk
+
+from Demo import MainWindow
+from Voronoi import Voronoi
+
+# Waktu menggambar n site dan diagramnya di canvas Demo: display_points
+# (oval + label yang terlihat), drawLinesOnCanvas (segment digabung jadi
+# polyline, seperti selama sweep), lalu index segment dan redraw seperti
+# setelah sweep dan setiap zoom. Termasuk waktu Tk untuk benar-benar
+# menggambar (update). Butuh display.
+#
+#     python bench_render.py [n]
+
+def timed(fn, *args):
+    t = time.perf_counter()
+    res = fn(*args)
+    return time.perf_counter() - t, res
+
+if __name__ == '__main__':
+    n = int(float(sys.argv[1])) if len(sys.argv) > 1 else 100000
+    random.seed(1)
+    points = [(random.uniform(0, 700), random.uniform(0, 600)) for _ in range(n)]
+    v = Voronoi(points)
+    v.process()
+    lines = v.get_output()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print("no display:", e)
+        sys.exit(1)
+    app = MainWindow(root)
+    root.update()
+
+    def draw_points():
+        app.display_points(points)
+        root.update()
+
+    def draw_lines():
+        app.drawLinesOnCanvas(lines)
+        root.update()
+
+    def redraw():
+        app.redraw()
+        root.update()
+
+    t_points, _ = timed(draw_points)
+    t_lines, _ = timed(draw_lines)
+    t_find, items = timed(app.w.find_withtag, "line")
+    app.lines = lines
+    t_index, app.lineIndex = timed(app.build_line_index, lines)
+    t_redraw, _ = timed(redraw)
+    print(f"{n} sites, {len(lines)} segments")
+    print(f"  display_points    {t_points:7.3f} s")
+    print(f"  drawLinesOnCanvas {t_lines:7.3f} s  ({len(items)} line items)")
+    print(f"  find_withtag      {t_find:7.3f} s")
+    print(f"  build_line_index  {t_index:7.3f} s")
+    print(f"  redraw            {t_redraw:7.3f} s  ({len(app.w.find_withtag('line'))} line items)")
+    print(f"  total             {t_points + t_lines:7.3f} s")
+    root.destroy()
@@ -0,0 +1,105 @@
+import random, sys, time
+import tkinter as tk
+
+from Demo import MainWindow
+from Voronoi import Voronoi
+
+# Zoom yang di-script di canvas Demo: sejumlah putaran wheel di tengah canvas,
+# diukur per event (termasuk update Tk), lalu satu redraw (level of detail,
+# ukuran marker dan label) seperti setelah wheel berhenti. Sebagai pembanding,
+# legacy_zoom adalah zoom yang lama: scale dan gettags per item, lalu koordinat
+# setiap oval dan font setiap label, pada canvas yang berisi semua item.
+# Butuh display.
+#
+#     python bench_zoom.py [n] [ticks]
+
+class WheelEvent:
+    def __init__(self, x, y, delta):
+        self.x = x
+        self.y = y
+        self.delta = delta
+        self.num = 0
+
+def legacy_zoom(app, event):
+    scale_factor = 1.1 if event.delta > 0 else 0.9
+    x = app.w.canvasx(event.x)
+    y = app.w.canvasy(event.y)
+    app.scale *= scale_factor
+    for item in app.w.find_all():
+        if "no_scale" not in app.w.gettags(item):
+            app.w.scale(item, x, y, scale_factor, scale_factor)
+    for point in app.w.find_withtag("point"):
+        x0, y0, x1, y1 = app.w.coords(point)
+        x = (x0 + x1) / 2
+        y = (y0 + y1) / 2
+        r = app.INITIAL_RADIUS / app.scale
+        app.w.coords(point, x - r, y - r, x + r, y + r)
+    size = max(int(7 / app.scale), 1)
+    for label in app.w.find_withtag("label"):
+        app.w.itemconfig(label, font=("Ariel", size))
+    app.w.configure(scrollregion=app.w.bbox("all"))
+
+def wheel(root, app, zoom, ticks):
+    # detik per event, zoom in lalu kembali keluar
+    times = []
+    for k in range(ticks):
+        delta = 120 if k < ticks // 2 else -120
+        t = time.perf_counter()
+        zoom(WheelEvent(350, 300, delta))
+        root.update()
+        times.append(time.perf_counter() - t)
+    return times
+
+def report(name, times):
+    times = sorted(times)
+    print(f"  {name:8} mean {1000 * sum(times) / len(times):8.2f} ms  max {1000 * times[-1]:8.2f} ms per event")
+
+if __name__ == '__main__':
+    n = int(float(sys.argv[1])) if len(sys.argv) > 1 else 20000
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    random.seed(1)
+    points = [(random.uniform(0, 700), random.uniform(0, 600)) for _ in range(n)]
+    v = Voronoi(points)
+    v.process()
+    lines = v.get_output()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print("no display:", e)
+        sys.exit(1)
+    print(f"{n} sites, {len(lines)} segments, {ticks} wheel events")
+
+    app = MainWindow(root)
+    root.update()
+    app.display_points(points)
+    app.lines = lines
+    app.lineIndex = app.build_line_index(lines)
+    app.redraw()
+    root.update()
+    times = wheel(root, app, app.zoom, ticks)
+    if app.redrawJob is not None:
+        root.after_cancel(app.redrawJob)
+    t = time.perf_counter()
+    app.onRedraw()
+    root.update()
+    t_redraw = time.perf_counter() - t
+    report("zoom", times)
+    print(f"  redraw   {1000 * t_redraw:8.2f} ms  ({len(app.w.find_all())} items)")
+    app.onClickClose()
+
+    # yang lama: semua item di canvas
+    root = tk.Tk()
+    app = MainWindow(root)
+    root.update()
+    app.label = True
+    script = []
+    app.script_points(script, points, True)
+    for i in range(0, len(script), 10000):
+        app.w.tk.eval("\n".join(script[i:i + 10000]))
+    app.drawLinesOnCanvas(lines)
+    root.update()
+    times = wheel(root, app, lambda e: legacy_zoom(app, e), ticks)
+    report("legacy", times)
+    print(f"           ({len(app.w.find_all())} items)")
+    app.onClickClose()
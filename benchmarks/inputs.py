@@ -0,0 +1,56 @@
+"""
+Site distributions for the benchmarks. Every generator takes the number of
+sites and a random.Random and returns a list of (x, y) tuples inside the
+700 x 600 canvas of the demos, in random order.
+"""
+import math
+
+WIDTH = 700.0
+HEIGHT = 600.0
+
+def uniform(n, rng):
+    return [(rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)) for _ in range(n)]
+
+def clustered(n, rng, clusters=20, sigma=10.0):
+    """Gaussian clusters around random centers."""
+    centers = [(rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)) for _ in range(clusters)]
+    points = []
+    for _ in range(n):
+        cx, cy = rng.choice(centers)
+        points.append((rng.gauss(cx, sigma), rng.gauss(cy, sigma)))
+    return points
+
+def lattice(n, rng):
+    """Square grid, many cocircular quadruples and equal sweep keys."""
+    k = max(int(math.ceil(math.sqrt(n))), 1)
+    step = min(WIDTH, HEIGHT) / k
+    points = [(i * step, j * step) for i in range(k) for j in range(k)][:n]
+    rng.shuffle(points)
+    return points
+
+def collinear(n, rng):
+    """Sites on the diagonal y = x, exactly collinear in floating point."""
+    step = min(WIDTH, HEIGHT) / max(n, 1)
+    points = [(i * step, i * step) for i in range(n)]
+    rng.shuffle(points)
+    return points
+
+def cocircular(n, rng):
+    """Sites evenly spaced on one circle, every vertex is degenerate."""
+    r = min(WIDTH, HEIGHT) / 2.5
+    points = [(WIDTH / 2 + r * math.cos(2 * math.pi * i / n), HEIGHT / 2 + r * math.sin(2 * math.pi * i / n)) for i in range(n)]
+    rng.shuffle(points)
+    return points
+
+DISTRIBUTIONS = {
+    "uniform": uniform,
+    "clustered": clustered,
+    "lattice": lattice,
+    "collinear": collinear,
+    "cocircular": cocircular,
+}
+
+def generate(name, n, rng):
+    if name not in DISTRIBUTIONS:
+        raise ValueError(f"unknown input {name!r}, expected one of {tuple(DISTRIBUTIONS)}")
+    return DISTRIBUTIONS[name](n, rng)
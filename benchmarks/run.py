@@ -0,0 +1,164 @@
+"""
+Cross-engine benchmark: every engine of the repository (see
+voronoi_engines.py at the root) over every input distribution (see
+inputs.py) at growing sizes. Each measurement runs in its own process
+(worker.py), so peak memory and imports never leak between engines. Reports wall time, peak memory and
+events per second, fits the exponent k of time ~ n^k for every engine
+and input, and writes everything as JSON. Run from the repository root:
+
+    python -m benchmarks.run [--engines thea,fortune] [--sizes 100,1000]
+                             [--beachline avl,blocked]
+                             [--output results.json] [--baseline old.json]
+
+--beachline runs thea once per beachline implementation, reported as
+thea/avl, thea/blocked. A size is skipped once the previous one, scaled by
+the exponent measured so far, is predicted to take longer than
+--time-limit seconds.
+"""
+import argparse, datetime, json, math, os, platform, subprocess, sys
+
+from voronoi_engines import ENGINES, OPTIONS, ROOT
+from benchmarks.inputs import DISTRIBUTIONS
+
+SIZES = (100, 1000, 10000, 100000, 1000000)
+GUESS = 1.3 # exponent assumed before two sizes are measured
+REGRESSION = 1.25 # slowdown against the baseline that gets flagged
+
+def run_worker(engine, name, n, seed, timeout, option=None):
+    command = [sys.executable, "-m", "benchmarks.worker", engine, name, str(n), str(seed)]
+    if option is not None:
+        command.append(option)
+    try:
+        done = subprocess.run(command, cwd=ROOT, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return entry(engine, name, n, option, error=f"timeout after {timeout} s")
+    if done.returncode != 0:
+        lines = done.stderr.strip().splitlines()
+        return entry(engine, name, n, option, error=lines[-1] if lines else f"exit {done.returncode}")
+    return json.loads(done.stdout.strip().splitlines()[-1])
+
+def entry(engine, name, n, option, **fields):
+    # a result that the worker did not write, shaped like its output
+    result = {"engine": engine, "input": name, "n": n}
+    if option is not None:
+        result["option"] = option
+    result.update(fields)
+    return result
+
+def label(r):
+    return r["engine"] if r.get("option") is None else f"{r['engine']}/{r['option']}"
+
+def fit_exponent(results):
+    """Least-squares slope of log(seconds) against log(n), None below two sizes."""
+    points = [(math.log(r["n"]), math.log(r["seconds"])) for r in results if r.get("seconds")]
+    if len(points) < 2:
+        return None
+    mx = sum(x for x, _ in points) / len(points)
+    my = sum(y for _, y in points) / len(points)
+    sxx = sum((x - mx)**2 for x, _ in points)
+    if sxx == 0:
+        return None
+    return sum((x - mx) * (y - my) for x, y in points) / sxx
+
+def measure_series(engine, name, sizes, repeat, time_limit, option=None):
+    # best of repeat runs per size, as timeit does
+    series = []
+    for n in sizes:
+        done = [r for r in series if "seconds" in r]
+        if done:
+            k = fit_exponent(done) or GUESS
+            last = done[-1]
+            predicted = last["seconds"] * (n / last["n"])**max(k, 1.0)
+            if predicted > time_limit:
+                series.append(entry(engine, name, n, option, skipped=f"predicted {predicted:.0f} s"))
+                continue
+        best = None
+        for seed in range(repeat):
+            result = run_worker(engine, name, n, seed, 10 * time_limit, option)
+            if "error" in result:
+                best = result
+                break
+            if best is None or result["seconds"] < best["seconds"]:
+                best = result
+        series.append(best)
+        report(best)
+    return series
+
+def report(r):
+    head = f"{label(r):13} {r['input']:11} {r['n']:>8}"
+    if "error" in r:
+        print(f"{head}  error: {r['error']}")
+    elif "skipped" in r:
+        print(f"{head}  skipped, {r['skipped']}")
+    else:
+        print(f"{head}  {r['seconds']:9.3f} s  {r['peak_bytes'] / 2**20:8.1f} MiB  {r['events_per_second']:10.0f} events/s")
+    sys.stdout.flush()
+
+def compare(results, baseline):
+    """Time ratio against an earlier run for every measurement in both."""
+    old = {(label(r), r["input"], r["n"]): r for r in baseline["results"] if "seconds" in r}
+    slower = 0
+    print("\nagainst baseline (new / old time):")
+    for r in results:
+        before = old.get((label(r), r["input"], r["n"]))
+        if before is None or "seconds" not in r:
+            continue
+        ratio = r["seconds"] / before["seconds"]
+        flag = "  SLOWER" if ratio > REGRESSION else ""
+        slower += bool(flag)
+        print(f"  {label(r):13} {r['input']:11} {r['n']:>8}  {ratio:6.2f}{flag}")
+    return slower
+
+def choices(value, known):
+    names = [v for v in value.split(",") if v]
+    for name in names:
+        if name not in known:
+            raise argparse.ArgumentTypeError(f"unknown {name!r}, expected one of {', '.join(known)}")
+    return names
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--engines", type=lambda v: choices(v, ENGINES), default=list(ENGINES))
+    parser.add_argument("--inputs", type=lambda v: choices(v, DISTRIBUTIONS), default=list(DISTRIBUTIONS))
+    parser.add_argument("--beachline", type=lambda v: choices(v, OPTIONS["thea"]), default=["avl"],
+                        help="beachline implementations of thea")
+    parser.add_argument("--sizes", type=lambda v: [int(float(s)) for s in v.split(",")], default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=1, help="runs per size, the fastest is kept")
+    parser.add_argument("--time-limit", type=float, default=60.0, help="seconds one run may be predicted to take")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="JSON of an earlier run to compare against")
+    args = parser.parse_args(argv)
+
+    results = []
+    exponents = {}
+    for engine in args.engines:
+        for option in (args.beachline if engine == "thea" else [None]):
+            for name in args.inputs:
+                series = measure_series(engine, name, sorted(args.sizes), args.repeat, args.time_limit, option)
+                results.extend(series)
+                key = engine if option is None else f"{engine}/{option}"
+                exponents[f"{key}/{name}"] = fit_exponent([r for r in series if "seconds" in r])
+
+    print("\nexponent k of time ~ n^k:")
+    for key, k in exponents.items():
+        print(f"  {key:26} {'-' if k is None else f'{k:.2f}'}")
+
+    document = {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+        "exponents": exponents,
+    }
+    with open(args.output, "w") as f:
+        json.dump(document, f, indent=1)
+    print(f"\nwritten to {os.path.abspath(args.output)}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            slower = compare(results, json.load(f))
+        return 1 if slower else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
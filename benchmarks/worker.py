@@ -0,0 +1,49 @@
+"""
+One measurement in a fresh interpreter, started by benchmarks.run:
+
+    python -m benchmarks.worker ENGINE INPUT N SEED [OPTION]
+
+Prints one JSON object: wall time of the build, growth of the peak
+resident set size while building (the input is generated before), and
+the number of events, counted as sites plus vertices of the DCEL. An
+exception of the engine is reported in "error" instead. OPTION is passed to
+the loader of the engine, see voronoi_engines.OPTIONS.
+"""
+import json, random, resource, sys, time
+
+from voronoi_engines import ENGINES
+from benchmarks.inputs import generate
+
+def peak_rss():
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def measure(engine, name, n, seed, option=None):
+    result = {"engine": engine, "input": name, "n": n}
+    points = generate(name, n, random.Random(seed))
+    if option is None:
+        build = ENGINES[engine]()
+    else:
+        result["option"] = option
+        build = ENGINES[engine](option)
+    build(generate("uniform", 16, random.Random(seed))) # load what the engine imports lazily
+    before = peak_rss()
+    start = time.perf_counter()
+    try:
+        dcel = build(points)
+    except Exception as e:
+        result["error"] = repr(e)
+        return result
+    seconds = time.perf_counter() - start
+    events = n + len(dcel.vertex_x)
+    result["seconds"] = seconds
+    result["peak_bytes"] = peak_rss() - before
+    result["events"] = events
+    result["events_per_second"] = events / seconds if seconds > 0 else None
+    return result
+
+if __name__ == "__main__":
+    engine, name, n, seed = sys.argv[1], sys.argv[2], int(sys.argv[3]), int(sys.argv[4])
+    option = sys.argv[5] if len(sys.argv) > 5 else None
+    print(json.dumps(measure(engine, name, n, seed, option)))
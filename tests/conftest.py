@@ -0,0 +1,6 @@
+import os, sys
+
+# The tests import the engines through voronoi_engines, at the repository root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,17 @@
+import voronoi_cli
+
+def test_segments_to_csv(tmp_path, capsys):
+    sites = tmp_path / "sites.csv"
+    sites.write_text("x,y\n1,2\n3,5\n6,1\n2,8\n")
+    assert voronoi_cli.main([str(sites)]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == voronoi_cli.HEADERS["segments"]
+    assert len(lines) > 1
+
+def test_no_sites(tmp_path, capsys):
+    for text in ("", "x,y\n"):
+        sites = tmp_path / "sites.csv"
+        sites.write_text(text)
+        for engine in sorted(voronoi_cli.ENGINES):
+            assert voronoi_cli.main([str(sites), "--engine", engine]) == 1
+            assert capsys.readouterr().err == "voronoi_cli: no sites\n"
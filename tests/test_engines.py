@@ -0,0 +1,110 @@
+"""
+Every engine of voronoi_engines builds the same diagram. The engines bound
+the unbounded edges differently (a box around the sites, or rays clipped to
+the sites and vertices), so they are compared on what they share: one cell
+per distinct site, and the Voronoi vertices inside the bounding box of the
+sites (more than the tolerance away from its sides, where rounding decides).
+"""
+import math, random
+
+import pytest
+
+from voronoi_engines import ENGINES
+from VoronoiFortune.DCEL import NONE, DEAD
+
+BUILDS = {
+    "thea/avl": ("thea", "avl"),
+    "thea/blocked": ("thea", "blocked"),
+    "fortune": ("fortune",),
+    "split": ("split",),
+    "delaunay": ("delaunay",),
+}
+TOLERANCE = 1e-6 # relative to the size of the sites' bounding box
+
+def build(name, points):
+    engine, *option = BUILDS[name]
+    return ENGINES[engine](*option)(list(points))
+
+def cells(dcel):
+    """Number of faces with a site and at least one edge."""
+    return sum(1 for f in range(len(dcel.face_edge)) if dcel.face_edge[f] != NONE and dcel.site(f) is not None)
+
+def vertices(dcel, points, tol=0.0):
+    """Live vertices inside the bounding box of points, shrunk by tol."""
+    x0 = min(x for x, _ in points) + tol
+    x1 = max(x for x, _ in points) - tol
+    y0 = min(y for _, y in points) + tol
+    y1 = max(y for _, y in points) - tol
+    res = []
+    for v in range(len(dcel.vertex_x)):
+        x = dcel.vertex_x[v]
+        y = dcel.vertex_y[v]
+        if dcel.vertex_edge[v] != DEAD and x0 < x < x1 and y0 < y < y1:
+            res.append((x, y))
+    return res
+
+def missing(a, b, tol):
+    """Points of a with no point of b within tol (coincident points count once)."""
+    cells = {}
+    for x, y in b:
+        cells.setdefault((math.floor(x / tol), math.floor(y / tol)), []).append((x, y))
+    res = []
+    for x, y in a:
+        i = math.floor(x / tol)
+        j = math.floor(y / tol)
+        near = (q for di in (-1, 0, 1) for dj in (-1, 0, 1) for q in cells.get((i + di, j + dj), ()))
+        if not any(abs(x - qx) <= tol and abs(y - qy) <= tol for qx, qy in near):
+            res.append((x, y))
+    return res
+
+def check_agreement(points):
+    distinct = len(set(points))
+    size = max(max(x for x, _ in points) - min(x for x, _ in points), max(y for _, y in points) - min(y for _, y in points), 1.0)
+    tol = TOLERANCE * size
+    reference = None
+    for name in BUILDS:
+        dcel = build(name, points)
+        assert cells(dcel) == distinct, name
+        found = vertices(dcel, points, tol)
+        if reference is None:
+            reference = found
+            continue
+        assert missing(found, reference, tol) == [], name
+        assert missing(reference, found, tol) == [], name
+
+@pytest.mark.parametrize("seed", range(3))
+def test_uniform(seed):
+    rng = random.Random(seed)
+    check_agreement([(rng.uniform(0, 700), rng.uniform(0, 600)) for _ in range(300)])
+
+@pytest.mark.parametrize("seed", range(20))
+def test_integer_grid(seed):
+    # sites on breakpoints and cocircular quadruples everywhere
+    rng = random.Random(seed)
+    n = rng.randint(5, 60)
+    check_agreement([(float(rng.randint(0, 20)), float(rng.randint(0, 20))) for _ in range(n)])
+
+DEGENERATE = {
+    "two": [(1.0, 2.0), (4.0, 3.0)],
+    "diagonal": [(float(i), 2.0 * i) for i in range(10)],
+    "horizontal": [(float(i), 0.0) for i in range(10)],
+    "vertical": [(0.0, float(i)) for i in range(10)],
+    "cocircular": [(50 + 40 * math.cos(2 * math.pi * k / 12), 50 + 40 * math.sin(2 * math.pi * k / 12)) for k in range(12)],
+    "duplicates": [(1.0, 1.0), (5.0, 2.0), (1.0, 1.0), (3.0, 7.0), (5.0, 2.0)],
+    "square": [(0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (1.0, 1.0)],
+}
+
+@pytest.mark.parametrize("case", sorted(DEGENERATE))
+def test_degenerate(case):
+    check_agreement(DEGENERATE[case])
+
+@pytest.mark.parametrize("name", sorted(BUILDS))
+def test_single_site(name):
+    # no edges at all; the incremental engines keep the box as its cell
+    dcel = build(name, [(3.0, 4.0)])
+    assert cells(dcel) <= 1
+    assert vertices(dcel, [(3.0, 4.0)]) == []
+
+def test_thea_without_sites():
+    dcel = build("thea/avl", [])
+    assert len(dcel.edge_ids()) == 0
@@ -0,0 +1,17 @@
+import random
+
+from voronoi_engines import use_directory
+
+use_directory("VoronoiThea")
+import bench_memory
+
+N = 20000 # smaller runs swing with the moment the gc collects; tracemalloc makes this ~10 s
+
+def test_peak_within_budget():
+    # the run of bench_memory, at a size that fits a test run; a small run
+    # first, so the imports and caches of the first run are not counted
+    bench_memory.measure([(1.0, 2.0), (4.0, 3.0), (2.0, 6.0)])
+    random.seed(1)
+    points = [(random.uniform(0, 700), random.uniform(0, 600)) for _ in range(N)]
+    _, _, peak = bench_memory.measure(points)
+    assert peak <= bench_memory.BUDGET * N, f"{peak / N:.1f} bytes/site, budget {bench_memory.BUDGET}"
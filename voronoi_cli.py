@@ -0,0 +1,248 @@
+"""
+Headless command line for computing diagrams from site files, for batch
+jobs and pipelines; it never imports tkinter. Run from the repository root:
+
+    python -m voronoi_cli SITES [--engine thea] [--beachline avl]
+                          [--segments OUT] [--vertices OUT]
+                          [--circles OUT] [-k 1] [--stats] [--profile [FILE]]
+
+SITES is a CSV file (x,y per line, '#' comments and a header are skipped),
+an NPY file of shape (N, 2), or a binary file of float64 pairs in native
+byte order; '-' reads CSV from stdin. The format follows the extension
+unless --format is given. The engines are those of voronoi_engines;
+--beachline picks the beachline of thea.
+
+Outputs are written the same way, by extension: CSV with a header line,
+NPY, or raw float64 (.bin). Segments are x0,y0,x1,y1, vertices x,y and
+circles x,y,r, the largest first. Without any output option the segments
+go to stdout as CSV.
+
+--stats prints a JSON object to stderr: wall time per phase, sizes of the
+diagram and, for thea, the counters of Stats. --profile runs the build
+and the circles under cProfile and prints the top functions to stderr, or
+dumps the profile to FILE for pstats/snakeviz.
+"""
+import argparse, cProfile, io, json, math, os, pstats, sys, time
+from array import array
+
+from voronoi_engines import ENGINES, OPTIONS, use_directory
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FORMATS = ("csv", "npy", "bin")
+EXTENSIONS = {".csv": "csv", ".txt": "csv", ".npy": "npy", ".bin": "bin", ".f64": "bin"}
+HEADERS = {"segments": "x0,y0,x1,y1", "vertices": "x,y", "circles": "x,y,r"}
+PROFILE_LINES = 30
+
+def file_format(path, given=None):
+    if given is not None:
+        return given
+    if path == "-":
+        return "csv"
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower(), "csv")
+
+def read_csv(stream):
+    points = []
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        fields = line.replace(",", " ").replace(";", " ").split()
+        try:
+            x, y = float(fields[0]), float(fields[1])
+        except (ValueError, IndexError):
+            if points:
+                raise ValueError(f"line {number}: expected x,y, got {line!r}")
+            continue # header
+        points.append((x, y))
+    return points
+
+def read_sites(path, fmt=None):
+    """Sites as a list of (x, y) tuples, or an (N, 2) array for NPY."""
+    fmt = file_format(path, fmt)
+    if fmt == "csv":
+        if path == "-":
+            return read_csv(sys.stdin)
+        with open(path, newline="") as f:
+            return read_csv(f)
+    if fmt == "npy":
+        if np is None:
+            raise ValueError("reading NPY needs numpy")
+        arr = np.load(path)
+        if arr.ndim != 2 or arr.shape[1] != 2:
+            raise ValueError(f"expected an array of shape (N, 2), got {arr.shape}")
+        return np.ascontiguousarray(arr, dtype=np.float64)
+    flat = array("d")
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) % 16:
+        raise ValueError(f"{path}: size {len(data)} is not a multiple of 16 bytes (x, y as float64)")
+    flat.frombytes(data)
+    return [(flat[k], flat[k + 1]) for k in range(0, len(flat), 2)]
+
+def write_rows(path, kind, columns, fmt=None):
+    # columns: equally long sequences, one per field
+    fmt = file_format(path, fmt)
+    rows = len(columns[0]) if columns else 0
+    if fmt == "npy":
+        if np is None:
+            raise ValueError("writing NPY needs numpy")
+        np.save(path, np.column_stack([np.asarray(c, dtype=np.float64) for c in columns]).reshape(rows, len(columns)))
+        return
+    if fmt == "bin":
+        flat = array("d", (float(c[i]) for i in range(rows) for c in columns))
+        with open(path, "wb") as f:
+            flat.tofile(f)
+        return
+    lines = [HEADERS[kind]]
+    lines.extend(",".join(repr(float(c[i])) for c in columns) for i in range(rows))
+    text = "\n".join(lines) + "\n"
+    if path == "-":
+        sys.stdout.write(text)
+    else:
+        with open(path, "w") as f:
+            f.write(text)
+
+def vertices(dcel):
+    """Coordinates x, y of the live vertices of a DCEL."""
+    from VoronoiFortune.DCEL import DEAD
+    live = [v for v in range(len(dcel.vertex_x)) if dcel.vertex_edge[v] != DEAD]
+    return [dcel.vertex_x[v] for v in live], [dcel.vertex_y[v] for v in live]
+
+class DiagramSites:
+    """
+    What EmptyCircle needs of a processed Voronoi (the sites, their grid and
+    the vertices with their radius), taken from the DCEL of any engine. The
+    radius of a vertex is the distance to the site of vertex_site when the
+    engine filled it in, else to the nearest site.
+    """
+    def __init__(self, points, dcel):
+        use_directory("VoronoiThea")
+        from Sites import SiteArray
+        from SiteGrid import SiteGrid
+        from VoronoiFortune.DCEL import DEAD
+        self.sites = SiteArray(points)
+        self.grid = SiteGrid(self.sites, self.sites.duplicate)
+        self.vx = []
+        self.vy = []
+        self.vr = []
+        for v in range(len(dcel.vertex_x)):
+            if dcel.vertex_edge[v] == DEAD:
+                continue
+            x = dcel.vertex_x[v]
+            y = dcel.vertex_y[v]
+            f = dcel.vertex_site[v]
+            if f >= 0 and dcel.site(f) is not None:
+                sx, sy = dcel.site(f)
+                r = math.hypot(x - sx, y - sy)
+            else:
+                _, r = self.grid.nearest(x, y)
+            self.vx.append(x)
+            self.vy.append(y)
+            self.vr.append(r)
+
+    def site_grid(self):
+        return self.grid
+
+def build(engine, option, points, stats):
+    """
+    The diagram of points with one engine: (DCEL, the Voronoi for thea or
+    None, counters of Stats or None).
+    """
+    if engine == "thea":
+        # the Voronoi itself, so it brings its own vertex radii and Stats
+        use_directory("VoronoiThea")
+        from Voronoi import Voronoi
+        v = Voronoi(points, beachline=option or "avl")
+        counters = v.set_stats() if stats else None
+        v.process()
+        return v.dcel, v, counters
+    return ENGINES[engine]()(points), None, None
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="voronoi_cli", description="Compute a Voronoi diagram from a file of sites.")
+    parser.add_argument("sites", help="CSV, NPY or binary float64 file of sites, - for CSV on stdin")
+    parser.add_argument("--format", choices=FORMATS, help="format of SITES, by default from its extension")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="thea")
+    parser.add_argument("--beachline", help="option of the engine, " + "; ".join(f"{e}: {', '.join(o)}" for e, o in OPTIONS.items()))
+    parser.add_argument("--segments", metavar="OUT", help="write the edges, - for stdout")
+    parser.add_argument("--vertices", metavar="OUT", help="write the vertices, - for stdout")
+    parser.add_argument("--circles", metavar="OUT", help="write the largest empty circles, - for stdout")
+    parser.add_argument("-k", type=int, default=1, help="number of largest empty circles (default 1)")
+    parser.add_argument("--stats", action="store_true", help="print timings and counters as JSON to stderr")
+    parser.add_argument("--profile", nargs="?", const="-", metavar="FILE", help="profile the computation; print to stderr or dump to FILE")
+    args = parser.parse_args(argv)
+    if args.beachline is not None and args.beachline not in OPTIONS.get(args.engine, ()):
+        parser.error(f"--beachline {args.beachline} is not an option of engine {args.engine}")
+    if args.segments is None and args.vertices is None and args.circles is None:
+        args.segments = "-"
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    seconds = {}
+
+    start = time.perf_counter()
+    try:
+        points = read_sites(args.sites, args.format)
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"voronoi_cli: {e}\n")
+        return 1
+    if len(points) == 0:
+        sys.stderr.write("voronoi_cli: no sites\n")
+        return 1
+    if args.engine != "thea" and not isinstance(points, list):
+        points = [tuple(p) for p in points.tolist()] # the other engines take tuples
+    seconds["read"] = time.perf_counter() - start
+
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler is not None:
+        profiler.enable()
+    start = time.perf_counter()
+    dcel, vor, counters = build(args.engine, args.beachline, points, args.stats)
+    seconds["build"] = time.perf_counter() - start
+    circles = None
+    if args.circles is not None:
+        start = time.perf_counter()
+        use_directory("VoronoiThea")
+        import EmptyCircle
+        diagram = vor if vor is not None else DiagramSites(points, dcel)
+        circles = EmptyCircle.largest_empty_circles(diagram, args.k)
+        seconds["circles"] = time.perf_counter() - start
+    if profiler is not None:
+        profiler.disable()
+
+    start = time.perf_counter()
+    edges = dcel.segments()
+    corners = vertices(dcel)
+    if args.segments is not None:
+        write_rows(args.segments, "segments", edges)
+    if args.vertices is not None:
+        write_rows(args.vertices, "vertices", corners)
+    if circles is not None:
+        write_rows(args.circles, "circles", ([c.x for c, _ in circles], [c.y for c, _ in circles], [r for _, r in circles]))
+    seconds["write"] = time.perf_counter() - start
+
+    if profiler is not None:
+        if args.profile == "-":
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_LINES)
+            sys.stderr.write(out.getvalue())
+        else:
+            profiler.dump_stats(args.profile)
+    if args.stats:
+        result = {"engine": args.engine, "sites": len(points), "edges": len(edges[0]), "vertices": len(corners[0])}
+        if args.beachline is not None:
+            result["option"] = args.beachline
+        for key, value in seconds.items():
+            result[key + "_seconds"] = value
+        if counters is not None:
+            result["counters"] = counters.as_dict()
+        sys.stderr.write(json.dumps(result) + "\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+The Voronoi engines of this repository behind one signature. Every entry
+of ENGINES imports its engine and returns a build function, which turns a
+list of sites into the diagram and returns its DCEL; importing first keeps
+module loading out of the measurements. VoronoiThea and VoronoiIncremental
+use flat imports from their own directory, so each loader puts that
+directory on sys.path; load one engine per process. Loaders that take
+options (the beachline of thea) are listed in OPTIONS. Used by
+voronoi_cli and the benchmarks.
+"""
+import contextlib, io, os, sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+def use_directory(name):
+    path = os.path.join(ROOT, name)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+def thea(beachline="avl"):
+    """VoronoiThea.Voronoi, x-sweep over an AVL (or another) beachline."""
+    use_directory("VoronoiThea")
+    from Voronoi import Voronoi
+    def build(points):
+        v = Voronoi(points, beachline=beachline)
+        v.process()
+        return v.dcel
+    return build
+
+def fortune():
+    """VoronoiFortune.VoronoiDiagram, y-sweep with a PointHeap."""
+    from VoronoiFortune.voronoi import VoronoiDiagram
+    def build(points):
+        return VoronoiDiagram(points).compute_diagram()
+    return build
+
+def incremental(engine):
+    use_directory("VoronoiIncremental")
+    from DCEL import DCEL
+    from Order import brio_order
+    from voronoi import create_bounding_box, build_voronoi
+    def build(points):
+        dcel = DCEL()
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_bounding_box(dcel, points)
+        build_voronoi(dcel, points, order=brio_order(points, seed=0), engine=engine)
+        return dcel
+    return build
+
+def split():
+    """VoronoiIncremental, split_region engine in BRIO order."""
+    return incremental("split")
+
+def delaunay():
+    """VoronoiIncremental, Bowyer-Watson dual in BRIO order."""
+    return incremental("delaunay")
+
+OPTIONS = {
+    "thea": ("avl", "blocked"), # Voronoi.BEACHLINES
+}
+
+ENGINES = {
+    "thea": thea,
+    "fortune": fortune,
+    "split": split,
+    "delaunay": delaunay,
+}